@@ -0,0 +1,147 @@
+# --- travian_bot_project/bot/account_manager.py ---
+import asyncio
+import time
+import random
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Any
+from playwright.async_api import async_playwright, Browser, Playwright
+
+from .async_client import AsyncTravianClient
+from .async_engine import AsyncBotEngine
+from .game_state import PlayerAccount
+from .throttle import RequestThrottle
+from config.accounts_config import AccountConfig
+from config.network_profile import get_network_profile
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AccountRuntime:
+    """Bir hesabın çalışma zamanı nesneleri ve durumu."""
+    config: AccountConfig
+    client: AsyncTravianClient
+    engine: AsyncBotEngine
+    throttle: RequestThrottle
+    task: Optional[asyncio.Task] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    last_error: Optional[str] = None
+
+
+class AccountManager:
+    """
+    Birden çok hesabı tek süreçte, tek bir Chromium ile çalıştırır. Her hesap kendi BrowserContext'ini
+    (çerezler, storage_state) ve AsyncBotEngine'ini alır; tüm hesapların sayfa işlemleri `max_workers`
+    yerlik ortak bir işçi havuzundan geçer ve her hesabın kendi istek hızı sınırı vardır (bkz. RequestThrottle).
+    """
+    def __init__(self, configs: List[AccountConfig], max_workers: int = 8, start_stagger: float = 5.0,
+                 restart_delay: float = 60.0, gui_logger_callback=None):
+        self.configs = configs
+        self.max_workers = max(1, max_workers)
+        self.start_stagger = start_stagger # Hesap girişleri aynı anda yapılmasın diye aralarındaki bekleme (sn)
+        self.restart_delay = restart_delay # Beklenmedik şekilde biten bir hesap motoru bu kadar sonra yeniden başlatılır
+        self.gui_logger_callback = gui_logger_callback
+        self.accounts: Dict[str, AccountRuntime] = {}
+        self.playwright_instance: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.is_running = False
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    def _build_runtime(self, config: AccountConfig) -> AccountRuntime:
+        throttle = RequestThrottle(self._worker_slots, config.min_request_interval, config.request_burst)
+        profile = get_network_profile(config.server_url, config.network_profile) # Bilinmeyen ad uyarıyla yalın profile düşer
+        client = AsyncTravianClient(config.server_url, config.username, config.resolve_password(), network_profile=profile,
+                                    max_parallel_pages=config.max_parallel_pages, browser=self.browser, throttle=throttle)
+        engine = AsyncBotEngine(client, PlayerAccount(username=config.username), self.gui_logger_callback)
+        engine.apply_account_config(config)
+        return AccountRuntime(config=config, client=client, engine=engine, throttle=throttle)
+
+    async def _run_account(self, runtime: AccountRuntime, initial_delay: float):
+        """Hesap motorunu çalıştırır; motor durdurulmadan biterse (giriş hatası, çökme) bir süre sonra yeniden başlatır."""
+        if await self._wait_or_stop(initial_delay):
+            return
+        while self.is_running:
+            runtime.started_at = time.time()
+            try:
+                await runtime.engine.run()
+            except Exception as e:
+                runtime.last_error = str(e)
+                logger.error(f"Hesap {runtime.config.key} motoru çöktü: {e}", exc_info=True)
+            if not self.is_running:
+                break
+            runtime.restarts += 1
+            logger.warning(f"Hesap {runtime.config.key} motoru durdu, {self.restart_delay:.0f} sn sonra yeniden başlatılacak (#{runtime.restarts}).")
+            if await self._wait_or_stop(self.restart_delay):
+                break
+            runtime.engine = AsyncBotEngine(runtime.client, runtime.engine.account_data, self.gui_logger_callback)
+            runtime.engine.apply_account_config(runtime.config)
+
+    async def _wait_or_stop(self, seconds: float) -> bool:
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def run(self):
+        """Paylaşılan tarayıcıyı açar, tüm hesapları aralıklı başlatır ve hepsi bitene kadar bekler."""
+        if not self.configs:
+            logger.error("Çalıştırılacak hesap yok.")
+            return
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        self._worker_slots = asyncio.Semaphore(self.max_workers)
+        self.playwright_instance = await async_playwright().start()
+        self.browser = await self.playwright_instance.chromium.launch(headless=True)
+        self.is_running = True
+        logger.info(f"{len(self.configs)} hesap tek tarayıcıda başlatılıyor (işçi havuzu: {self.max_workers}).")
+        try:
+            for index, config in enumerate(self.configs):
+                if config.key in self.accounts:
+                    logger.warning(f"Hesap {config.key} listede birden fazla kez var, tekrarı atlanıyor.")
+                    continue
+                runtime = self._build_runtime(config)
+                self.accounts[config.key] = runtime
+                delay = index * self.start_stagger + random.uniform(0, self.start_stagger)
+                runtime.task = asyncio.create_task(self._run_account(runtime, delay), name=f"account:{config.key}")
+            await asyncio.gather(*(runtime.task for runtime in self.accounts.values()), return_exceptions=True)
+        finally:
+            self.is_running = False
+            for runtime in self.accounts.values():
+                await runtime.client.reset_context()
+            await self.browser.close()
+            await self.playwright_instance.stop()
+            self.browser, self.playwright_instance = None, None
+            logger.info("Hesap yöneticisi durduruldu.")
+
+    def stop(self):
+        """Tüm hesap motorlarını durdurur; başka bir thread'den (GUI, sinyal işleyici) çağrılabilir."""
+        self.is_running = False
+        for runtime in self.accounts.values():
+            runtime.engine.stop()
+        if self._loop and self._stop_event and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Hesap başına özet durum (GUI/izleme için)."""
+        now = time.time()
+        report = []
+        for key, runtime in self.accounts.items():
+            engine = runtime.engine
+            next_job = engine.scheduler.describe()[0] if len(engine.scheduler) else None
+            report.append({
+                "account": key,
+                "active": runtime.client._is_active,
+                "villages": len(engine.account_data.villages),
+                "uptime": int(now - runtime.started_at) if runtime.started_at else 0,
+                "restarts": runtime.restarts,
+                "requests": runtime.throttle.request_count,
+                "throttled_seconds": round(runtime.throttle.waited_seconds, 1),
+                "next_job": next_job[0] if next_job else None,
+                "next_job_in": next_job[1] if next_job else None,
+                "last_error": runtime.last_error,
+            })
+        return report
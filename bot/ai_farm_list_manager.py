@@ -1,5 +1,4 @@
 # --- travian_bot_project/bot/ai_farm_list_manager.py ---
-import google.generativeai as genai
 import logging
 import json
 import re
@@ -10,6 +9,21 @@ from .game_state import Village, Troop # Village doğrudan kullanılmıyor ama T
 
 logger = logging.getLogger(__name__)
 
+# google.generativeai (grpc, protobuf) içe aktarılması ~1 sn sürer; yalnızca ilk YZ çağrısında yüklenir ve süreç başına bir kez yapılandırılır
+_genai = None
+_configured_api_key: Optional[str] = None
+
+def _load_genai(api_key: str):
+    global _genai, _configured_api_key
+    if _genai is None:
+        import google.generativeai as genai
+        _genai = genai
+    if _configured_api_key != api_key:
+        _genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+    return _genai
+
+
 class AIFarmListManager:
     """
     Gemini API'sini kullanarak potansiyel yağma hedeflerini belirler. [cite: 255]
@@ -25,14 +39,22 @@ class AIFarmListManager:
             # API anahtarı olmadan bu sınıf işlevsiz olacağından, bir istisna fırlatmak daha uygun olabilir.
             # Ya da model'i None olarak ayarlayıp, her çağrıda kontrol edebiliriz.
             # raise ValueError("Gemini API anahtarı yüklenemedi.") # Bu programı durdurur
-            self.model = None # API anahtarı yoksa model None olacak
-        else:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-pro')  # Model adını güncel tutun
+        self._model = None # Gemini modeli ilk öneri isteğinde oluşturulur (bkz. model)
         self.gui_logger_callback = gui_logger_callback
         self.last_ai_check_time = 0
         self.ai_cooldown_seconds = 15 * 60  # YZ'yi sorgulama arası 15 dakika bekleme [cite: 259]
 
+    @property
+    def model(self):
+        """Gemini modeli; API anahtarı yoksa None. İlk erişimde google.generativeai yüklenir."""
+        if self._model is None and self.api_key:
+            try:
+                self._model = _load_genai(self.api_key).GenerativeModel('gemini-pro')  # Model adını güncel tutun
+            except ImportError as e:
+                logger.error(f"google-generativeai yüklenemedi, YZ yağma önerileri devre dışı: {e}")
+                self.api_key = None
+        return self._model
+
     def log_message(self, message: str, level: str = "info"):
         """Hem konsola hem de GUI'ye (varsa) log mesajı gönderir.""" 
         if level == "error":
@@ -115,7 +137,7 @@ class AIFarmListManager:
                 {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_NONE"},
                 {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_NONE"},
             ]
-            generation_config = genai.types.GenerationConfig(
+            generation_config = _genai.types.GenerationConfig(
                 # candidate_count=1, # Tek bir yanıt yeterli
                 # stop_sequences=['\n\n'], # Yanıtı nerede durduracağını belirtebilir
                 max_output_tokens=2048, # Çıktı token limitini ayarla (JSON uzun olabilir)
@@ -0,0 +1,510 @@
+# --- travian_bot_project/bot/async_client.py ---
+import asyncio
+import os
+import re
+import time
+import logging
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterable, Tuple
+from playwright.async_api import async_playwright, Page, BrowserContext, Browser, Playwright, Error as PlaywrightError
+from .game_state import Village, HeroStatus
+from .page_state import PageStateTracker
+from .throttle import RequestThrottle
+from .page_scripts import DORF1_EXTRACT_JS, DORF2_EXTRACT_JS, UPGRADE_COST_JS, HERO_EXTRACT_JS, GAME_API_JS
+from .dirty_state import VILLAGE_ASPECTS, DORF1_ASPECTS, DORF2_ASPECTS
+from .farm_lists import (
+    NativeFarmList, FARM_LISTS_API_PATH, FARM_LIST_SLOT_API_PATH, FARM_LIST_SEND_API_PATH, GRAPHQL_API_PATH, FARM_LISTS_QUERY,
+    parse_farm_lists_response, send_request_body, parse_send_response,
+)
+from .travian_client import SESSIONS_DIR, send_raid_over_http, simulate_nearby_villages
+from .units import unit_field
+from config.network_profile import NetworkProfile, get_network_profile
+from .parsers import (
+    extract_dorf1_payload, extract_dorf2_payload, extract_hero_payload, extract_village_list_payload,
+    safe_int, apply_village_payloads, parse_hero_payload, parse_village_list_payload,
+)
+
+if TYPE_CHECKING:
+    from .http_session import TravianHttpSession
+
+logger = logging.getLogger(__name__)
+
+class AsyncTravianClient:
+    """
+    TravianClient'ın playwright.async_api üzerindeki karşılığı. Sayfa işlemleri coroutine'dir; bir sayfa yüklenirken
+    olay döngüsü başka işleri (yağma beklemeleri, YZ çağrıları, diğer hesaplar) yürütür.
+    Okuma işleri `max_parallel_pages` sayfalık bir havuzda eşzamanlı, eylemler (yükseltme, yağma, macera) ana
+    sayfada sırayla yapılır. `browser` verilirse paylaşılan Chromium kullanılır; hesap yalnızca kendi context'ini yönetir.
+    """
+
+    def __init__(self, server_url: str, username: str, password: str, network_profile: Optional[NetworkProfile] = None,
+                 max_parallel_pages: int = 4, browser: Optional[Browser] = None, throttle: Optional[RequestThrottle] = None):
+        self.server_url = server_url.strip('/')
+        self.username = username
+        self.password = password
+        self.playwright_instance: Optional[Playwright] = None
+        self.browser: Optional[Browser] = browser
+        self._owns_browser: bool = browser is None # Paylaşılan tarayıcı bu istemci tarafından kapatılmaz
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.current_village_id: Optional[str] = None
+        self._is_active: bool = False
+        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
+        self.use_http_fast_path: bool = True
+        self.http: Optional["TravianHttpSession"] = None
+        self.network_profile: NetworkProfile = network_profile or get_network_profile(self.server_url)
+        self.blocked_request_count: int = 0
+        self.storage_state_path: str = self._default_storage_state_path()
+        self.page_state = PageStateTracker()
+        self.tribe: Optional[str] = None
+        self.farm_list_villages: Dict[int, str] = {}
+        self.last_upgrade_cost: Optional[Dict[str, int]] = None
+        self.max_parallel_pages: int = max(1, max_parallel_pages)
+        self._pool_pages: List[Page] = []
+        self._pool_reserved: int = 0 # Açık ve açılmakta olan havuz sayfaları
+        self._free_pages: Optional[asyncio.Queue] = None
+        self._fetch_slots: Optional[asyncio.Semaphore] = None
+        self._action_lock: Optional[asyncio.Lock] = None # Ana sayfadaki eylemler birbirinin navigasyonunu bozmasın
+        # Her sunucu isteği (sayfa yükleme, HTTP çekimi, eylem) bu sınırlayıcıdan geçer; varsayılanı sınırsızdır
+        self.throttle: RequestThrottle = throttle or RequestThrottle(min_interval=0)
+
+    def _default_storage_state_path(self) -> str:
+        host = re.sub(r'^https?://', '', self.server_url).replace('/', '_').replace(':', '_')
+        user = re.sub(r'[^\w.-]', '_', self.username)
+        return os.path.join(SESSIONS_DIR, f"{host}__{user}.json")
+
+    # --- Tarayıcı ve oturum yaşam döngüsü ---
+
+    async def _ensure_browser(self):
+        if self.browser and self.browser.is_connected():
+            return
+        if not self._owns_browser:
+            raise PlaywrightError("Paylaşılan tarayıcı bağlantısı kopmuş.")
+        if not self.playwright_instance:
+            logger.info("Playwright (async) başlatılıyor...")
+            self.playwright_instance = await async_playwright().start()
+        self.browser = await self.playwright_instance.chromium.launch(headless=True, slow_mo=self.network_profile.slow_mo)
+
+    async def _open_context(self) -> bool:
+        restored = os.path.exists(self.storage_state_path)
+        try:
+            self.context = await self.browser.new_context(user_agent=self.user_agent, storage_state=self.storage_state_path if restored else None)
+        except PlaywrightError as e:
+            logger.warning(f"Kayıtlı oturum dosyası yüklenemedi ({e}), boş context açılıyor.")
+            restored = False
+            self.context = await self.browser.new_context(user_agent=self.user_agent)
+        self.context.set_default_timeout(40000)
+        await self._apply_network_profile(self.context)
+        self.page = await self.context.new_page()
+        self._pool_pages, self._pool_reserved = [], 0
+        self._free_pages = asyncio.Queue()
+        self._fetch_slots = asyncio.Semaphore(self.max_parallel_pages)
+        self._action_lock = asyncio.Lock()
+        if restored:
+            logger.info(f"Kayıtlı oturum yüklendi: {self.storage_state_path}")
+        return restored
+
+    async def _apply_network_profile(self, context: BrowserContext):
+        if not self.network_profile.blocks_anything:
+            return
+        profile = self.network_profile
+
+        async def handle_route(route):
+            request = route.request
+            if profile.should_block(request.resource_type, request.url):
+                self.blocked_request_count += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", handle_route)
+        logger.info(f"'{profile.name}' ağ profili uygulandı (async).")
+
+    async def save_storage_state(self):
+        if not self.context:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.storage_state_path), exist_ok=True)
+            tmp_path = self.storage_state_path + ".tmp"
+            await self.context.storage_state(path=tmp_path)
+            os.replace(tmp_path, self.storage_state_path)
+        except Exception as e:
+            logger.warning(f"Oturum durumu kaydedilemedi: {e}")
+
+    def discard_storage_state(self):
+        if os.path.exists(self.storage_state_path):
+            try: os.remove(self.storage_state_path)
+            except OSError as e: logger.warning(f"Kayıtlı oturum dosyası silinemedi: {e}")
+
+    async def _mark_logged_in(self):
+        self._is_active = True
+        if self.use_http_fast_path:
+            try:
+                if not self.http:
+                    from .http_session import TravianHttpSession # requests ilk oturum açılışında yüklenir
+                    self.http = TravianHttpSession(self.server_url, self.user_agent, pool_size=self.max_parallel_pages)
+                self.http.load_cookies(await self.context.cookies())
+            except Exception as e:
+                logger.warning(f"HTTP hızlı yolu başlatılamadı, tarayıcı kullanılacak: {e}")
+                self.http = None
+        await self.save_storage_state()
+
+    async def login(self) -> bool:
+        if self._is_active or self.context:
+            await self.reset_context()
+        try:
+            await self._ensure_browser()
+            restored = await self._open_context()
+            async with self.throttle:
+                await self.page.goto(f"{self.server_url}/dorf1.php" if restored else f"{self.server_url}/", wait_until="domcontentloaded")
+
+            if "dorf1.php" in self.page.url and not await self.page.locator("input[name='password']").count():
+                await self._update_current_village_id()
+                if self.current_village_id:
+                    await self._mark_logged_in()
+                    logger.info("Giriş başarılı (kayıtlı oturum geçerli)." if restored else "Giriş başarılı (zaten giriş yapılmış).")
+                    return True
+            elif restored:
+                logger.info("Kayıtlı oturum geçersiz, form ile giriş yapılacak.")
+                self.discard_storage_state()
+
+            user_input = self.page.locator("input[name='name'], input[name='user'], input#user").first
+            if not await user_input.is_visible(timeout=5000):
+                logger.error("Kullanıcı adı veya şifre giriş alanı bulunamadı.")
+                await self.reset_context()
+                return False
+            await user_input.fill(self.username)
+            await self.page.locator("input[name='password'], input[name='pass'], input#pass").first.fill(self.password)
+            async with self.throttle:
+                await self.page.locator("button#s1, button.green[type='submit'], button[type='submit'], input[type='submit']").first.click()
+            await self.page.wait_for_url(f"**{self.server_url}**/dorf1.php**", timeout=45000)
+            await self._update_current_village_id()
+            await self._mark_logged_in()
+            logger.info("Giriş başarılı.")
+            return True
+        except PlaywrightError as e:
+            logger.error(f"Async giriş sırasında Playwright hatası: {e}", exc_info=True)
+            await self.reset_context()
+            return False
+
+    async def _update_current_village_id(self):
+        """Kenar çubuğundaki aktif köyü (yoksa URL'deki newdid/did değerini) geçerli köy yapar."""
+        villages = parse_village_list_payload(extract_village_list_payload(await self.page.content()))
+        active = next((v for v in villages if v["active"]), None)
+        match = re.search(r'[?&](newdid|did)=(\d+)', self.page.url)
+        self.current_village_id = active["id"] if active else (match.group(2) if match else None)
+        if not self.current_village_id:
+            logger.warning("Aktif köy ID'si alınamadı.")
+
+    async def reset_context(self):
+        """Context'i kapatır; tarayıcı (paylaşılan veya kendi) açık kalır."""
+        if self._is_active:
+            await self.save_storage_state()
+        self._is_active = False
+        if self.http:
+            self.http.close()
+            self.http = None
+        if self.context:
+            try: await self.context.close() # Ana sayfa ve havuz sayfaları da kapanır
+            except Exception as e: logger.warning(f"Tarayıcı context'i kapatılırken hata: {e}")
+        self.page, self.context = None, None
+        self._pool_pages, self._pool_reserved = [], 0
+        self.page_state.reset()
+
+    async def close(self):
+        await self.reset_context()
+        if self._owns_browser and self.browser:
+            try: await self.browser.close()
+            except Exception as e: logger.warning(f"Tarayıcı kapatılırken hata: {e}")
+            self.browser = None
+        if self.playwright_instance:
+            try: await self.playwright_instance.stop()
+            except Exception as e: logger.warning(f"Playwright durdurulurken hata: {e}")
+            self.playwright_instance = None
+        logger.info("Async Playwright kaynakları temizlendi.")
+
+    # --- Sayfa havuzu ve okuma işleri ---
+
+    async def _acquire_pool_page(self) -> Page:
+        """Çağıran `_fetch_slots`u tutmalıdır. Yeni sayfanın yeri await'ten önce ayrılır; havuz `max_parallel_pages`ı aşmaz."""
+        if self._free_pages.empty() and self._pool_reserved < self.max_parallel_pages:
+            self._pool_reserved += 1
+            try:
+                page = await self.context.new_page()
+            except BaseException:
+                self._pool_reserved -= 1
+                raise
+            self._pool_pages.append(page)
+            return page
+        return await self._free_pages.get()
+
+    def _release_pool_page(self, page: Page):
+        if page not in self._pool_pages:
+            return # reset_context sırasında ödünç alınmıştı; eski context'in sayfası yeni havuza girmez
+        if not page.is_closed():
+            self._free_pages.put_nowait(page)
+        else:
+            self._pool_pages.remove(page)
+            self._pool_reserved -= 1
+
+    async def _fetch_html_http(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """HTTP hızlı yolu (requests) bloklayan bir çağrıdır; olay döngüsünü tutmamak için iş parçacığında çalışır."""
+        if not (self.http and self.use_http_fast_path):
+            return None
+        async with self.throttle:
+            return await asyncio.to_thread(self.http.fetch_html, path, params)
+
+    async def _load_village_payload(self, village_id: str, page_name: str) -> Optional[Dict[str, Any]]:
+        async with self._fetch_slots:
+            page_html = await self._fetch_html_http(page_name, {"newdid": village_id})
+            if page_html is not None:
+                extract = extract_dorf1_payload if page_name == "dorf1.php" else extract_dorf2_payload
+                return await asyncio.to_thread(extract, page_html)
+
+            page = await self._acquire_pool_page()
+            try:
+                # Her istek açık newdid taşır; sunucudaki "aktif köy" sırasına güvenilmez
+                async with self.throttle:
+                    await page.goto(f"{self.server_url}/{page_name}?newdid={village_id}", wait_until="domcontentloaded")
+                if not page.url.split('?')[0].endswith(page_name):
+                    return None
+                payload = await page.evaluate(DORF1_EXTRACT_JS if page_name == "dorf1.php" else DORF2_EXTRACT_JS)
+                return payload if isinstance(payload, dict) else None
+            except PlaywrightError as e:
+                logger.warning(f"Köy {village_id} {page_name} yüklenemedi: {e}")
+                return None
+            finally:
+                self._release_pool_page(page)
+
+    async def _get_village_payload(self, village_id: str, page_name: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        cached = self.page_state.get_fresh(page_name, village_id, max_age)
+        if cached is not None:
+            return cached
+        payload = await self._load_village_payload(village_id, page_name)
+        if payload is not None:
+            self.page_state.store(page_name, village_id, payload)
+        return payload
+
+    async def refresh_villages(self, targets: List[Tuple[Village, Iterable[str]]], max_age: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Köylerin istenen durum parçalarını eşzamanlı yeniler ve Village nesnelerine (PlayerAccount.villages) yerinde işler.
+        {köy_id: başarılı_mı} döndürür.
+        """
+        if not self._is_active:
+            logger.error("Aktif oturum yok. Köy durumu çekilemiyor."); return {village.id: False for village, _ in targets}
+        start_time = time.time()
+
+        async def refresh_one(village: Village, aspects: set) -> bool:
+            dorf1_task = self._get_village_payload(village.id, "dorf1.php", max_age) if aspects & DORF1_ASPECTS else asyncio.sleep(0)
+            dorf2_task = self._get_village_payload(village.id, "dorf2.php", max_age) if aspects & DORF2_ASPECTS else asyncio.sleep(0)
+            dorf1_payload, dorf2_payload = await asyncio.gather(dorf1_task, dorf2_task)
+            if aspects & DORF1_ASPECTS and dorf1_payload is None:
+                logger.error(f"Köy {village.id} dorf1.php sayfası okunamadı.")
+                return False
+            if aspects & DORF2_ASPECTS and dorf2_payload is None:
+                logger.warning(f"Köy {village.id} dorf2.php sayfası okunamadı. Önceki köy merkezi verisi korunuyor.")
+            apply_village_payloads(village, aspects, dorf1_payload, dorf2_payload)
+            return True
+
+        results = await asyncio.gather(*(refresh_one(village, set(aspects)) for village, aspects in targets), return_exceptions=True)
+        outcome = {}
+        for (village, _), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.error(f"Köy {village.id} durumu yenilenirken hata: {result}")
+            outcome[village.id] = result is True
+        logger.info(f"{len(targets)} köy {time.time() - start_time:.1f} sn'de yenilendi (eşzamanlılık: {self.max_parallel_pages}).")
+        return outcome
+
+    async def refresh_village(self, village_id: str, village: Optional[Village] = None, aspects: Iterable[str] = VILLAGE_ASPECTS,
+                              max_age: Optional[float] = None) -> Optional[Village]:
+        village = village or Village(name=f"Köy {village_id}", id=village_id)
+        results = await self.refresh_villages([(village, aspects)], max_age)
+        return village if results.get(village_id) else None
+
+    async def get_initial_village_data(self) -> Optional[Village]:
+        """Kenar çubuğundaki aktif köyden (ad, koordinat) bir Village oluşturur ve tam durumunu çeker."""
+        if not self._is_active or not self.current_village_id:
+            logger.error("Aktif oturum veya köy ID'si yok. İlk köy verileri çekilemiyor."); return None
+        village_id = self.current_village_id
+        page_html = await self._fetch_html_http("dorf1.php", {"newdid": village_id})
+        if page_html is None:
+            async with self._action_lock, self.throttle:
+                await self.page.goto(f"{self.server_url}/dorf1.php?newdid={village_id}", wait_until="domcontentloaded")
+                page_html = await self.page.content()
+        list_payload = extract_village_list_payload(page_html)
+        entry = next((v for v in parse_village_list_payload(list_payload) if v["id"] == village_id), None)
+        village = Village(name=list_payload.get("active_name") or (entry["name"] if entry else "Bilinmeyen Köy"), id=village_id,
+                          coordinates=entry["coordinates"] if entry else None)
+        self.page_state.store("dorf1.php", village_id, await asyncio.to_thread(extract_dorf1_payload, page_html))
+        if not await self.refresh_village(village_id, village):
+            logger.warning(f"Köy {village_id} için anlık durum çekilemedi. Varsayılan boş değerler kullanılacak.")
+        return village
+
+    async def get_hero_status(self) -> Optional[HeroStatus]:
+        if not self._is_active:
+            logger.error("Aktif oturum yok. Kahraman durumu çekilemiyor."); return None
+        try:
+            hero_html = await self._fetch_html_http("hero")
+            if hero_html is not None:
+                payload = extract_hero_payload(hero_html)
+            else:
+                async with self._fetch_slots:
+                    page = await self._acquire_pool_page()
+                    try:
+                        async with self.throttle:
+                            await page.goto(f"{self.server_url}/hero", wait_until="domcontentloaded", timeout=20000)
+                        payload = await page.evaluate(HERO_EXTRACT_JS)
+                    finally:
+                        self._release_pool_page(page)
+            hero = parse_hero_payload(payload or {})
+            logger.info(f"Kahraman durumu: Sağlık={hero.health}%, Durum='{hero.status}', Macera Mevcut={hero.adventure_available}")
+            return hero
+        except Exception as e:
+            logger.error(f"Kahraman durumunu çekerken hata: {e}", exc_info=True)
+            return None
+
+    async def get_nearby_village_info(self, center_village_id: str, radius: int = 7) -> List[Dict[str, Any]]:
+        logger.warning(f"`get_nearby_village_info` köy {center_village_id} (yarıçap: {radius}) için SİMÜLE EDİLMİŞ veri döndürüyor.")
+        return simulate_nearby_villages(radius) if self._is_active else []
+
+    # --- Eylemler (ana sayfada, sırayla) ---
+
+    async def start_building_upgrade(self, building_name: str, location_id: str, village_id: Optional[str] = None) -> bool:
+        if not self._is_active: logger.error("Aktif oturum yok. Yükseltme başlatılamıyor."); return False
+        target_village_id = village_id or self.current_village_id
+        self.last_upgrade_cost = None
+        async with self._action_lock, self.throttle:
+            try:
+                await self.page.goto(f"{self.server_url}/build.php?newdid={target_village_id}&id={location_id}", wait_until="domcontentloaded")
+                upgrade_button = self.page.locator("button.green.build:not([disabled]), div.build_button button:not([disabled]), input.green.button-upgrade:not([disabled])").first
+                if not await upgrade_button.is_visible():
+                    logger.warning(f"'{building_name}' için yükseltme butonu bulunamadı veya pasif. Kaynak/önkoşul eksik olabilir.")
+                    cost_texts = await self.page.evaluate(UPGRADE_COST_JS)
+                    if cost_texts and len(cost_texts) >= 4:
+                        self.last_upgrade_cost = {res: safe_int(text, f"Yükseltme Maliyeti ({res})") for res, text in zip(["wood", "clay", "iron", "crop"], cost_texts)}
+                    return False
+                await upgrade_button.click()
+                await self.page.wait_for_load_state("domcontentloaded")
+                self.page_state.invalidate(target_village_id)
+                build_error = self.page.locator("div.error, span.error, div.errorMessage")
+                if await build_error.count() > 0 and await build_error.first.is_visible():
+                    logger.warning(f"'{building_name}' yükseltilemedi. Hata mesajı: {await build_error.first.inner_text()}")
+                    return False
+                logger.info(f"'{building_name}' (Konum: {location_id}) yükseltme talebi gönderildi.")
+                return True
+            except PlaywrightError as e:
+                logger.error(f"'{building_name}' yükseltilirken hata: {e}", exc_info=True)
+                return False
+
+    async def train_troops(self, village_id: str, troop_type: str, amount: int) -> bool:
+        logger.error("train_troops fonksiyonu tam olarak implemente edilmedi.")
+        return False
+
+    async def send_hero_to_adventure(self) -> bool:
+        if not self._is_active: logger.error("Aktif oturum yok."); return False
+        async with self._action_lock, self.throttle:
+            try:
+                await self.page.goto(f"{self.server_url}/hero/adventures", wait_until="domcontentloaded", timeout=20000)
+                start_button = self.page.locator("td.goTo div a, .adventure.enabled .goToAdventureLink, .list-entry.adventure a[href*='startAdventure']").first
+                if not await start_button.is_visible(timeout=3000):
+                    logger.info("Gönderilecek uygun macera butonu bulunamadı.")
+                    return False
+                await start_button.click()
+                self.page_state.invalidate(path="dorf1.php")
+                confirm_button = self.page.locator("button.green:has-text('Onayla'), button:has-text('Maceraya başla'), #startAdventureForm button[type='submit']").first
+                if await confirm_button.is_visible(timeout=2000):
+                    await confirm_button.click()
+                    await self.page.wait_for_load_state("domcontentloaded")
+                logger.info("Kahraman maceraya gönderildi.")
+                return True
+            except PlaywrightError as e:
+                logger.error(f"Kahramanı maceraya gönderirken hata: {e}", exc_info=True)
+                return False
+
+    async def send_raid(self, source_village_id: str, target_coords: Dict[str, int], troops_to_send: Dict[str, int]) -> bool:
+        if not self._is_active: logger.error("Aktif oturum yok."); return False
+        if self.use_http_fast_path and self.http and self.http.is_valid:
+            async with self.throttle: # Form okuma ve iki POST tarayıcı sayfasını kullanmaz; ana sayfa kilidi gerekmez
+                result, self.tribe = await asyncio.to_thread(send_raid_over_http, self.http, source_village_id, target_coords, troops_to_send, self.tribe)
+            if result is not None:
+                self.page_state.invalidate(source_village_id, "dorf1.php")
+                return result
+            logger.info("Askeri üs HTTP hızlı yolu kullanılamadı, yağma tarayıcı ile gönderiliyor.")
+        async with self._action_lock, self.throttle:
+            try:
+                await self.page.goto(f"{self.server_url}/build.php?newdid={source_village_id}&gid=16", wait_until="domcontentloaded", timeout=20000)
+                await self.page.fill("input#xCoordInput, input.coordinates.x", str(target_coords["x"]))
+                await self.page.fill("input#yCoordInput, input.coordinates.y", str(target_coords["y"]))
+                for troop_name, count in troops_to_send.items():
+                    input_field_name = unit_field(troop_name, self.tribe)
+                    if not input_field_name:
+                        logger.warning(f"Asker tipi '{troop_name}' için giriş alanı adı bilinmiyor. Atlanıyor.")
+                        continue
+                    await self.page.fill(f"input[name='{input_field_name}']", str(count))
+                await self.page.click("label[for='raidTypeAttack'], input#raidTypeAttack")
+                send_button = self.page.locator("button#btn_ok, button.green.sendTroops").first
+                if not await send_button.is_visible():
+                    logger.error("Askeri Üs'te 'Gönder' butonu bulunamadı.")
+                    return False
+                await send_button.click()
+                self.page_state.invalidate(source_village_id, "dorf1.php")
+                await self.page.wait_for_load_state("domcontentloaded")
+                confirm_button = self.page.locator("button#troopSendConfirm button, button.green.troopSendConfirm").first
+                if await confirm_button.is_visible():
+                    await confirm_button.click()
+                    await self.page.wait_for_load_state("domcontentloaded")
+                    logger.info(f"Yağma {target_coords} hedefine başarıyla gönderildi (onay sonrası).")
+                    return True
+                if "build.php?gid=16" in self.page.url or "dorf1.php" in self.page.url:
+                    logger.info(f"Yağma {target_coords} hedefine gönderildi (onay sayfası atlandı).")
+                    return True
+                logger.warning("Yağma gönderme onay butonu bulunamadı. Gönderme durumu belirsiz.")
+                return False
+            except PlaywrightError as e:
+                logger.error(f"Yağma gönderirken hata ({source_village_id} -> {target_coords}): {e}", exc_info=True)
+                return False
+
+    # --- Yerleşik yağma listeleri (oyun API'si; navigasyon yok) ---
+
+    async def _game_api(self, method: str, path: str, body: Any = None) -> Optional[Any]:
+        if not self._is_active:
+            logger.error("Oyun API isteği atılamıyor: aktif oturum yok."); return None
+        async with self._action_lock, self.throttle: # Ana sayfa başka bir eylemde sayfa değiştirirken evaluate bozulmasın
+            try:
+                response = await self.page.evaluate(GAME_API_JS, {"method": method, "path": path, "body": body})
+            except PlaywrightError as e:
+                logger.warning(f"Oyun API isteği başarısız ({method} {path}): {e}")
+                return None
+        if not 200 <= response.get("status", 0) < 300:
+            logger.warning(f"Oyun API isteği {response.get('status')} döndü ({method} {path}): {str(response.get('body'))[:200]}")
+            return None
+        return response.get("body") if response.get("body") is not None else {}
+
+    async def get_farm_lists(self) -> Optional[List[NativeFarmList]]:
+        body = await self._game_api("POST", GRAPHQL_API_PATH, {"query": FARM_LISTS_QUERY, "variables": {}})
+        farm_lists = parse_farm_lists_response(body) if body is not None else None
+        if farm_lists is not None:
+            self.farm_list_villages = {farm_list.id: farm_list.village_id for farm_list in farm_lists}
+        return farm_lists
+
+    async def create_farm_list(self, village_id: str, name: str) -> bool:
+        return await self._game_api("POST", FARM_LISTS_API_PATH, {"villageId": int(village_id), "name": name, "defaultUnits": {}}) is not None
+
+    async def add_farm_list_slots(self, slots: List[Dict[str, Any]]) -> bool:
+        return await self._game_api("POST", FARM_LIST_SLOT_API_PATH, {"slots": slots}) is not None
+
+    async def update_farm_list_slots(self, slots: List[Dict[str, Any]]) -> bool:
+        return await self._game_api("PUT", FARM_LIST_SLOT_API_PATH, {"slots": slots}) is not None
+
+    async def delete_farm_list_slots(self, slot_ids: List[int]) -> bool:
+        return await self._game_api("DELETE", FARM_LIST_SLOT_API_PATH, {"slotIds": slot_ids}) is not None
+
+    async def send_farm_lists(self, slots_by_list: Dict[int, List[int]]) -> Optional[Dict[int, bool]]:
+        body = await self._game_api("POST", FARM_LIST_SEND_API_PATH, send_request_body(slots_by_list))
+        if body is None:
+            return None
+        for list_id in slots_by_list:
+            if list_id in self.farm_list_villages:
+                self.page_state.invalidate(self.farm_list_villages[list_id], "dorf1.php")
+        results = parse_send_response(body, slots_by_list)
+        logger.info(f"{len(slots_by_list)} yağma listesinden {sum(results.values())}/{len(results)} hedef tek istekte gönderildi.")
+        return results
@@ -0,0 +1,160 @@
+# --- travian_bot_project/bot/async_engine.py ---
+import asyncio
+import time
+import random
+import logging
+from typing import List, Optional
+
+from .async_client import AsyncTravianClient
+from .bot_engine import BotEngine
+from .client_steps import run_steps_async
+from .game_state import PlayerAccount
+from playwright.async_api import Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBotEngine(BotEngine):
+    """
+    BotEngine'in olay döngüsünde çalışan sürümü. Karar mantığı (inşaat planı, yağma seçimi, zamanlayıcı,
+    bayat durum takibi) BotEngine'in adım üreteçlerinden gelir; sayfa işlemleri ve beklemeler `await` edilir.
+    Böylece bir hesabın yağma aralığı beklenirken veya YZ yanıtı beklenirken aynı döngüdeki diğer işler/hesaplar ilerler.
+    Kullanım: `asyncio.run(AsyncBotEngine(client, account).run())`.
+    """
+    def __init__(self, client: AsyncTravianClient, account_data: PlayerAccount, gui_logger_callback=None):
+        super().__init__(client, account_data, gui_logger_callback)
+        self._stop_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Karar mantığı BotEngine/FarmingManager'daki adım üreteçlerinde; burada yalnızca istemci çağrıları await edilir
+    async def update_game_state(self):
+        await run_steps_async(self.game_state_steps(), self.client)
+
+    async def refresh_dirty_state(self):
+        await run_steps_async(self.refresh_steps(), self.client)
+
+    async def manage_building_queues(self, village_ids: Optional[List[str]] = None):
+        await run_steps_async(self.building_steps(village_ids), self.client)
+
+    async def manage_troop_training(self):
+        await run_steps_async(self.troop_training_steps(), self.client)
+
+    async def manage_hero_adventures(self):
+        await run_steps_async(self.hero_adventure_steps(), self.client)
+
+    async def update_farm_list_with_ai(self):
+        await run_steps_async(self.farm_list_ai_steps(), self.client)
+
+    async def farming_cycle(self):
+        await run_steps_async(self.farming_manager.farming_cycle_steps(), self.client)
+
+    async def dispatch_due_raid(self):
+        await run_steps_async(self.farming_manager.dispatch_steps(), self.client)
+
+    async def _sleep(self, seconds: float) -> bool:
+        """`seconds` kadar bekler; bu sırada stop() çağrılırsa hemen True döner."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def run_due_jobs(self, due_jobs: List[str]):
+        if "state_refresh" in due_jobs:
+            await self.update_game_state()
+            self.scheduler.schedule("state_refresh", time.time() + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max), "periyodik durum yenileme")
+            due_jobs = due_jobs + ["troop_training"]
+            due_jobs += [f"build:{v.id}" for v in self.account_data.villages if f"build:{v.id}" not in self.scheduler and f"build:{v.id}" not in due_jobs]
+
+        build_village_ids = [job.split(":", 1)[1] for job in due_jobs if job.startswith("build:")]
+        if build_village_ids:
+            for village in self.account_data.villages:
+                if village.id in build_village_ids and village.building_queue:
+                    self.dirty.mark(village.id, "queue", "resources", *self._aspects_for_finished_construction(village))
+            await self.refresh_dirty_state()
+
+        jobs = []
+        if "ai_farm_list" in due_jobs:
+            jobs.append(self.update_farm_list_with_ai())
+        if build_village_ids:
+            jobs.append(self.manage_building_queues(build_village_ids))
+        if "troop_training" in due_jobs:
+            self.scheduler.cancel("troop_training")
+            jobs.append(self.manage_troop_training())
+        if "hero_adventure" in due_jobs:
+            jobs.append(self.manage_hero_adventures())
+        if "farm" in due_jobs:
+            jobs.append(self.farming_cycle())
+        if "raid_dispatch" in due_jobs:
+            jobs.append(self.dispatch_due_raid())
+        # YZ çağrısı, yağma beklemeleri ve sayfa yüklemeleri birbirini beklemez; ana sayfa eylemleri istemcide sıralanır
+        browser_error: Optional[PlaywrightError] = None
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, PlaywrightError):
+                browser_error = browser_error or result
+            elif isinstance(result, Exception):
+                self.log_message(f"Zamanlanmış işte hata: {result}", level="error")
+
+        if "ai_farm_list" in due_jobs:
+            self.scheduler.schedule("ai_farm_list", self.next_farm_list_ai_update_time, "YZ yağma listesi")
+        if "hero_adventure" in due_jobs:
+            self.scheduler.schedule("hero_adventure", self.next_adventure_check_time, "macera kontrolü")
+        if "farm" in due_jobs:
+            next_eligible = self.farming_manager.next_eligible_time()
+            if next_eligible is None:
+                next_eligible = time.time() + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max)
+            self.scheduler.schedule("farm", max(next_eligible, time.time()) + self._jitter(), "yağma hedefi uygun")
+        if "farm" in due_jobs or "raid_dispatch" in due_jobs:
+            self._schedule_raid_dispatch()
+        if browser_error:
+            raise browser_error # İşler yeniden zamanlandı; context'i run() sıfırlar
+        if self.dirty:
+            await self.refresh_dirty_state()
+
+    async def run(self):
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self.log_message("Async bot motoru çalıştırılıyor...")
+        if not await self.client.login():
+            self.log_message("Async bot motoru: oturum açılamadı. Bot durduruluyor.", level="error")
+            return
+        self.is_running = True
+        if self.restore_checkpoint():
+            await self.refresh_dirty_state()
+        else:
+            await self.update_game_state()
+            self.next_adventure_check_time = time.time() + self.adventure_cooldown_initial
+        self._schedule_initial_jobs()
+
+        while self.is_running:
+            try:
+                if not self.client._is_active and not await self.client.login():
+                    self.log_message("Yeniden bağlanma başarısız. Bot durduruluyor.", level="error")
+                    break
+                self._ensure_periodic_jobs()
+                due_jobs = self.scheduler.pop_due()
+                if due_jobs:
+                    await self.run_due_jobs(due_jobs)
+                    self.save_checkpoint()
+                next_wake = self.scheduler.next_wake_time()
+                sleep_for = self.main_loop_interval_max if next_wake is None else max(0.0, min(self.main_loop_interval_max, next_wake - time.time()))
+                if await self._sleep(sleep_for):
+                    break
+            except PlaywrightError as pe:
+                self.log_message(f"Async bot motorunda Playwright hatası: {pe}", level="error", exc_info=True)
+                await self.client.reset_context()
+                if await self._sleep(30): break
+            except Exception as e:
+                self.log_message(f"Async bot motorunda beklenmedik hata: {e}", level="error", exc_info=True)
+                if await self._sleep(60): break
+
+        self.save_checkpoint()
+        await self.client.close()
+        self.log_message("Async bot motoru durduruldu.")
+
+    def stop(self):
+        """Başka bir thread'den çağrılabilir; döngü bir sonraki beklemede sonlanır."""
+        self.log_message("Async bot motoru durdurulma isteği alındı...")
+        self.is_running = False
+        if self._loop and self._stop_event and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stop_event.set)
@@ -1,15 +1,22 @@
 # --- travian_bot_project/bot/bot_engine.py ---
+import os
 import time
 import random
 import logging
-from typing import List, Dict, Optional, Any
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Tuple
 
 # Corrected import: Ensure TravianClient is imported before BotEngine class definition
-from .travian_client import TravianClient
+from .travian_client import TravianClient, PlaywrightError # For catching Playwright specific errors
 from .game_state import PlayerAccount, Village, Building, Troop, HeroStatus # PlayerAccount kullanılacak
 from .farming_manager import FarmingManager
 from .ai_farm_list_manager import AIFarmListManager
-from playwright.sync_api import Error as PlaywrightError # For catching Playwright specific errors
+from .scheduler import TimerScheduler
+from .dirty_state import DirtyTracker, DORF1_ASPECTS
+from .checkpoint import CHECKPOINTS_DIR, account_to_dict, account_from_dict, save_checkpoint, load_checkpoint
+from .client_steps import Steps, call, gather, offload, run_steps
+
+if TYPE_CHECKING:
+    from config.accounts_config import AccountConfig
 
 logger = logging.getLogger(__name__)
 
@@ -46,17 +53,54 @@ class BotEngine:
         self.adventure_cooldown_success = random.uniform(60*60, 120*60)
         self.adventure_cooldown_fail = random.uniform(10*60, 20*60)
 
+        # Bir eylemden sonra yalnızca değişen köy/durum parçaları yeniden okunur
+        self.dirty = DirtyTracker()
         self.farming_manager = FarmingManager(client, account_data, self.log_message_wrapper)
         self.ai_farm_list_manager = AIFarmListManager(self.log_message_wrapper)
         self.next_farm_list_ai_update_time = time.time() # İlk YZ güncellemesi hemen denenebilir
         self.ai_farm_update_interval = 4 * 60 * 60 # YZ'den yağma listesini 4 saatte bir güncelle
 
+        # Tam durum yenilemesi ve asker eğitimi bu aralıkta; inşaat, yağma ve macera işleri kendi zamanlarında uyanır
         self.main_loop_interval_min = 5 * 60
         self.main_loop_interval_max = 10 * 60
+        self.build_retry_interval = (5 * 60, 10 * 60) # Yükseltme başarısızsa (kaynak/önkoşul) tekrar deneme aralığı
+        self.wake_jitter = (2, 8) # Zamanlayıcı uyanmalarına eklenen insansı gecikme (sn)
+        self.scheduler = TimerScheduler()
+        # (köy ID, konum ID, hedef seviye) -> build.php'de görülen maliyet; kaynak yetmeden sayfa yüklenmez
+        self.known_build_costs: Dict[tuple, Dict[str, int]] = {}
 
         self.village_build_queues: Dict[str, List[Dict]] = {}
         self.village_troop_prefs: Dict[str, Dict] = {}
 
+        # Yeniden başlatmada boş hesapla değil son anlık görüntüden devam edilir (bkz. bot/checkpoint.py)
+        storage_state_path = getattr(client, "storage_state_path", None)
+        self.checkpoint_path: Optional[str] = os.path.join(CHECKPOINTS_DIR, os.path.basename(storage_state_path)) if storage_state_path else None
+        self.checkpoint_stale_after = 15 * 60 # Bundan eski anlık görüntüde köylerin tüm sayfaları ve kahraman yeniden okunur
+        self.farming_manager.on_raid_sent = self.save_checkpoint
+
+    def set_village_plans(self, village_plans: Dict[str, Dict[str, Any]]):
+        """Yapılandırmadaki köy planlarını (köy ID'si/adı veya "*" -> build_queue, troop_training) yükler."""
+        self.village_build_queues = {key: plan["build_queue"] for key, plan in village_plans.items() if "build_queue" in plan}
+        self.village_troop_prefs = {key: plan["troop_training"] for key, plan in village_plans.items() if "troop_training" in plan}
+
+    def apply_account_config(self, config: "AccountConfig"):
+        """Hesap yapılandırmasındaki köy planlarını, yağma temposunu ve sunucu hızını uygular."""
+        self.set_village_plans(config.village_plans)
+        self.farming_manager.raid_dispatcher.configure(config.raid_interval, config.raid_backlog)
+        self.farming_manager.server_speed = config.server_speed
+
+    @staticmethod
+    def _plan_for(plans: Dict[str, Any], village: Village, default):
+        for key in (village.id, village.name, "*"):
+            if key in plans:
+                return plans[key]
+        return default
+
+    def build_queue_for(self, village: Village) -> List[Dict]:
+        return self._plan_for(self.village_build_queues, village, DEFAULT_BUILD_QUEUE_VILLAGE1)
+
+    def troop_prefs_for(self, village: Village) -> Dict[str, Dict]:
+        return self._plan_for(self.village_troop_prefs, village, DEFAULT_TROOP_TRAINING_PREFS)
 
     def log_message_wrapper(self, message: str):
         if self.gui_logger_callback:
@@ -77,7 +121,15 @@ class BotEngine:
                  self.gui_logger_callback(message)
 
 
+    # Karar mantığı `*_steps` üreteçlerindedir; AsyncBotEngine aynı üreteçleri run_steps_async ile yürütür (bkz. client_steps)
+
     def update_game_state(self):
+        run_steps(self.game_state_steps(), self.client)
+
+    def refresh_dirty_state(self):
+        run_steps(self.refresh_steps(), self.client)
+
+    def game_state_steps(self) -> Steps[None]:
         self.log_message("Oyun durumu güncelleniyor...")
         if not self.account_data or not self.client._is_active: # Check if client session is active
             self.log_message("Hesap verisi bulunamadı veya Travian istemcisi aktif değil. Durum güncellenemiyor.", level="warning")
@@ -85,7 +137,7 @@ class BotEngine:
 
         if not self.account_data.villages:
             self.log_message("Hesapta köy verisi bulunamadı. İlk köy verisi çekilmeye çalışılıyor...", level="warning")
-            initial_village = self.client.get_initial_village_data()
+            initial_village = yield call("get_initial_village_data")
             if initial_village:
                 self.account_data.villages.append(initial_village)
                 self.log_message(f"İlk köy '{initial_village.name}' verileri çekildi.")
@@ -95,105 +147,184 @@ class BotEngine:
                 self.log_message("İlk köy verileri çekilemedi. Bot düzgün çalışmayabilir.", level="error")
                 return
 
-        for village in self.account_data.villages:
-            self.log_message(f"Köy '{village.name}' (ID: {village.id}) için durum çekiliyor.")
-            resources_data = self.client.get_village_resources(village.id)
-            if resources_data:
-                village.resources = {res: resources_data.get(res, 0) for res in ["wood", "clay", "iron", "crop"]}
-                village.storage_capacity["warehouse"] = resources_data.get("warehouse_capacity", village.storage_capacity["warehouse"])
-                village.storage_capacity["granary"] = resources_data.get("granary_capacity", village.storage_capacity["granary"])
-                village.population = resources_data.get("population", village.population)
-                # Assuming "free_crop" from client is what game_state.crop_consumption expects (Serbest Tahıl)
-                village.crop_consumption = resources_data.get("free_crop", village.crop_consumption)
-                village.production_rates["wood"] = resources_data.get("wood_prod", village.production_rates["wood"])
-                village.production_rates["clay"] = resources_data.get("clay_prod", village.production_rates["clay"])
-                village.production_rates["iron"] = resources_data.get("iron_prod", village.production_rates["iron"])
-                village.production_rates["crop"] = resources_data.get("crop_prod", village.production_rates["crop"]) # Net crop prod
+        self.dirty.mark_all(village.id for village in self.account_data.villages)
+        yield from self.refresh_steps()
+        self.log_message("Oyun durumu güncelleme tamamlandı.")
+
+    def refresh_steps(self) -> Steps[None]:
+        """Sadece bayat olarak işaretlenmiş köy parçalarını ve (gerekirse) kahramanı yeniden okur; ikisi birlikte istenir."""
+        if not self.client._is_active:
+            return
+        targets = [(village, self.dirty.dirty_aspects(village.id)) for village in self.account_data.villages if self.dirty.dirty_aspects(village.id)]
+        hero_dirty = self.dirty.hero_dirty
+        requests = []
+        if targets:
+            self.log_message(f"{len(targets)} köy için durum çekiliyor (eşzamanlılık: {self.client.max_parallel_pages}).")
+            # Sayfalar köy başına açık newdid ile paralel çekilir, sonra her köy önbellekten birleştirilir
+            requests.append(call("refresh_villages", targets))
+        if hero_dirty:
+            requests.append(call("get_hero_status"))
+        scraped_at = time.time()
+        responses = (yield gather(*requests)) if requests else []
+        results = responses[0] if targets else {}
+        for village, aspects in targets:
+            if not results.get(village.id):
+                self.log_message(f"Köy '{village.name}' için durum güncellenemedi.", level="warning")
+                continue
+            self.dirty.clear(village.id, aspects)
+            if "troops" in aspects:
+                self.farming_manager.troop_ledger.reconcile(village.id, scraped_at)
+            self.log_message(f"Köy '{village.name}' durumu güncellendi ({', '.join(sorted(aspects))}): {len(village.buildings)} bina, {len(village.building_queue)} kuyrukta, {sum(t.count for t in village.troops_home)} asker.")
+
+        if hero_dirty:
+            hero_status = responses[-1]
+            if hero_status:
+                self.account_data.hero = hero_status
+                self.dirty.clear_hero()
+                self.log_message(f"Kahraman durumu güncellendi: Sağlık={hero_status.health}%, Macera={hero_status.adventure_available}")
             else:
-                self.log_message(f"Köy '{village.name}' için kaynaklar güncellenemedi.", level="warning")
+                self.log_message("Kahraman durumu güncellenemedi.", level="warning")
 
-            village.buildings = self.client.get_village_buildings(village.id)
-            village.building_queue = self.client.get_building_queue(village.id)
-            village.troops_home = self.client.get_troops_in_village(village.id) # Askerleri güncelle
-            self.log_message(f"Köy '{village.name}' durumu güncellendi: {len(village.buildings)} bina, {len(village.building_queue)} kuyrukta, {sum(t.count for t in village.troops_home)} asker.")
+        if self.gui_logger_callback and hasattr(self.gui_logger_callback.__self__, 'update_all_gui_displays'):
+            self.gui_logger_callback.__self__.update_all_gui_displays()
 
-        hero_status = self.client.get_hero_status()
-        if hero_status:
-            self.account_data.hero = hero_status
-            self.log_message(f"Kahraman durumu güncellendi: Sağlık={hero_status.health}%, Macera={hero_status.adventure_available}")
+
+    def _jitter(self) -> float:
+        return random.uniform(*self.wake_jitter)
+
+    def _schedule_next_build(self, village: Village, pending_tasks: bool, affordable_in: Optional[float] = None):
+        """
+        Köyün bir sonraki inşaat kontrolünü kurar: kuyruk doluysa slotun boşalacağı ana, maliyeti bilinen bir
+        yükseltme bekliyorsa kaynakların yeteceği ana, değilse tekrar deneme aralığına.
+        """
+        key = f"build:{village.id}"
+        remaining_times = [b.build_time_remaining for b in village.building_queue if b.build_time_remaining]
+        if remaining_times:
+            self.scheduler.schedule(key, time.time() + min(remaining_times) + self._jitter(), "inşaat slotu boşalıyor")
+        elif affordable_in is not None:
+            self.scheduler.schedule(key, time.time() + affordable_in + self._jitter(), "kaynaklar yetiyor")
+        elif pending_tasks:
+            self.scheduler.schedule(key, time.time() + random.uniform(*self.build_retry_interval), "yükseltme tekrar denenecek")
         else:
-            self.log_message("Kahraman durumu güncellenemedi.", level="warning")
+            self.scheduler.cancel(key)
+            self.log_message(f"Köy '{village.name}': inşaat listesi tamamlandı.")
+
+    def _plan_builds(self, village: Village) -> Tuple[List[Tuple[str, str, int, int]], bool, Optional[float]]:
+        """
+        İnşaat listesinden şu an denenebilecek yükseltmeleri (ad, konum, mevcut seviye, hedef seviye) sırasıyla döndürür.
+        Ayrıca listede bekleyen iş olup olmadığını ve maliyeti bilinen işler için kaynakların en erken ne zaman yeteceğini verir.
+        """
+        target_build_order = self.build_queue_for(village)
+        candidates: List[Tuple[str, str, int, int]] = []
+        pending_tasks = False
+        affordable_in: Optional[float] = None # Maliyeti bilinen bekleyen yükseltmeler için en kısa bekleme
+
+        for build_task in target_build_order:
+            building_name = build_task["name"]
+            target_level = build_task["target_level"]
+            location_id = build_task.get("location_id")
+
+            if not location_id:
+                self.log_message(f"'{building_name}' için konum ID'si eksik, atlanıyor.", level="warning")
+                continue
 
-        self.log_message("Oyun durumu güncelleme tamamlandı.")
-        if self.gui_logger_callback and hasattr(self.gui_logger_callback.__self__, 'update_all_gui_displays'):
-            self.gui_logger_callback.__self__.update_all_gui_displays()
+            current_building = village.get_building_by_location_id(location_id)
+            current_level = 0
+            if current_building:
+                current_level = current_building.level
+                if current_building.name != "Boş İnşaat Alanı" and current_building.name.lower() != building_name.lower() and current_level > 0 :
+                    self.log_message(f"Konum {location_id}'de beklenen bina '{building_name}' yerine '{current_building.name}' var. Atlanıyor.", level="warning")
+                    continue
+            elif location_id and int(location_id) > 18 and building_name != "Boş İnşaat Alanı":
+                 pass
+
+            if current_level >= target_level:
+                continue
+            pending_tasks = True
+
+            known_cost = self.known_build_costs.get((village.id, location_id, current_level + 1))
+            if known_cost:
+                wait_seconds = village.time_until_affordable(known_cost)
+                if wait_seconds is None:
+                    self.log_message(f"Köy '{village.name}': '{building_name}' maliyeti {known_cost} mevcut üretim/kapasite ile karşılanamıyor. Atlanıyor.", level="warning")
+                    continue
+                if wait_seconds > 0:
+                    self.log_message(f"Köy '{village.name}': '{building_name}' için kaynaklar ~{int(wait_seconds / 60)} dakika sonra yetecek. Sayfa yüklenmeden atlanıyor.")
+                    affordable_in = wait_seconds if affordable_in is None else min(affordable_in, wait_seconds)
+                    continue
+            candidates.append((building_name, location_id, current_level, target_level))
+        return candidates, pending_tasks, affordable_in
+
+    def _build_slots_full(self, village: Village) -> bool:
+        active_constructions = len(village.building_queue)
+        max_active_slots = 1 # TODO: Kabileye göre ayarla (örn: Romalı ise 2)
+        if active_constructions >= max_active_slots:
+            self.log_message(f"Köy '{village.name}': İnşaat kuyruğu dolu ({active_constructions}/{max_active_slots}).")
+            return True
+        return False
+
+    def _record_failed_upgrade(self, village: Village, location_id: str, next_level: int) -> Optional[float]:
+        """Başarısız denemede görülen maliyeti saklar; kaynakların yeteceği ana kadar kalan süreyi (biliniyorsa) döndürür."""
+        if not self.client.last_upgrade_cost:
+            return None
+        self.known_build_costs[(village.id, location_id, next_level)] = self.client.last_upgrade_cost
+        return village.time_until_affordable(self.client.last_upgrade_cost) or None
+
+    def manage_building_queues(self, village_ids: Optional[List[str]] = None):
+        run_steps(self.building_steps(village_ids), self.client)
+
+    def manage_troop_training(self):
+        run_steps(self.troop_training_steps(), self.client)
+
+    def manage_hero_adventures(self):
+        run_steps(self.hero_adventure_steps(), self.client)
 
+    def update_farm_list_with_ai(self):
+        run_steps(self.farm_list_ai_steps(), self.client)
 
-    def manage_building_queues(self):
+    def building_steps(self, village_ids: Optional[List[str]] = None) -> Steps[None]:
         self.log_message("Bina kuyrukları yönetiliyor...")
         if not self.client._is_active: return
 
         for village in self.account_data.villages:
+            if village_ids is not None and village.id not in village_ids:
+                continue
             self.log_message(f"Köy '{village.name}' için inşaat kontrol ediliyor.")
-            target_build_order = DEFAULT_BUILD_QUEUE_VILLAGE1 #
-
-            active_constructions = len(village.building_queue)
-            max_active_slots = 1 # TODO: Kabileye göre ayarla (örn: Romalı ise 2)
-
-            if active_constructions >= max_active_slots:
-                self.log_message(f"Köy '{village.name}': İnşaat kuyruğu dolu ({active_constructions}/{max_active_slots}).")
+            if self._build_slots_full(village):
+                self._schedule_next_build(village, pending_tasks=True)
                 continue
 
-            for build_task in target_build_order:
-                building_name = build_task["name"]
-                target_level = build_task["target_level"]
-                location_id = build_task.get("location_id")
-
-                if not location_id:
-                    self.log_message(f"'{building_name}' için konum ID'si eksik, atlanıyor.", level="warning")
-                    continue
-
-                current_building = village.get_building_by_location_id(location_id)
-                current_level = 0
-                if current_building:
-                    current_level = current_building.level
-                    if current_building.name != "Boş İnşaat Alanı" and current_building.name.lower() != building_name.lower() and current_level > 0 :
-                        self.log_message(f"Konum {location_id}'de beklenen bina '{building_name}' yerine '{current_building.name}' var. Atlanıyor.", level="warning")
-                        continue
-                elif location_id and int(location_id) > 18 and building_name != "Boş İnşaat Alanı":
-                     pass
-
-                if current_level >= target_level:
-                    continue
-
+            candidates, pending_tasks, affordable_in = self._plan_builds(village)
+            for building_name, location_id, current_level, target_level in candidates:
                 self.log_message(f"Köy '{village.name}': '{building_name}' (Konum: {location_id}) seviye {current_level + 1}'e (hedef: {target_level}) yükseltiliyor.")
-                if self.client.start_building_upgrade(building_name, location_id, village.id):
+                if (yield call("start_building_upgrade", building_name, location_id, village.id)):
                     self.log_message(f"'{building_name}' (Konum: {location_id}) yükseltme talebi gönderildi.")
-                    self.update_game_state()
+                    self.dirty.mark(village.id, "queue", "resources") # Seviye inşaat bitince değişir
+                    yield from self.refresh_steps()
                     break
                 else:
                     self.log_message(f"'{building_name}' (Konum: {location_id}) yükseltilemedi.", level="warning")
+                    wait_seconds = self._record_failed_upgrade(village, location_id, current_level + 1)
+                    if wait_seconds:
+                        affordable_in = wait_seconds if affordable_in is None else min(affordable_in, wait_seconds)
+            self._schedule_next_build(village, pending_tasks, affordable_in)
         self.log_message("Bina kuyrukları yönetimi tamamlandı.")
 
 
-    def manage_troop_training(self):
+    def troop_training_steps(self) -> Steps[None]:
         self.log_message("Asker eğitimi yönetiliyor...")
         if not self.client._is_active: return
 
         for village in self.account_data.villages:
             self.log_message(f"Köy '{village.name}' için asker eğitimi kontrol ediliyor.")
-            training_prefs_for_village = DEFAULT_TROOP_TRAINING_PREFS
+            training_prefs_for_village = self.troop_prefs_for(village)
 
             for troop_type, prefs in training_prefs_for_village.items():
                 min_count = prefs["min_count"]
                 train_amount = prefs["train_amount"]
                 # building_gid = prefs["building_gid"] # This needs to be handled by client.train_troops
 
-                current_troop_count = 0
-                for troop_in_village in village.troops_home:
-                    if troop_in_village.type_name.lower() == troop_type.lower():
-                        current_troop_count = troop_in_village.count
-                        break
+                current_troop_count = village.troop_count(troop_type)
 
                 if current_troop_count < min_count:
                     amount_to_train = min(train_amount, min_count - current_troop_count)
@@ -201,16 +332,17 @@ class BotEngine:
 
                     self.log_message(f"Köy '{village.name}': '{troop_type}' için yeterli asker yok ({current_troop_count}/{min_count}). {amount_to_train} adet eğitiliyor.")
                     # Pass troop_type and amount to a simplified train_troops
-                    if self.client.train_troops(village.id, troop_type, amount_to_train):
+                    if (yield call("train_troops", village.id, troop_type, amount_to_train)):
                         self.log_message(f"{amount_to_train} adet '{troop_type}' eğitimi köy '{village.name}' için başlatıldı.")
-                        self.update_game_state()
+                        self.dirty.mark(village.id, "resources")
+                        yield from self.refresh_steps()
                         break
                     else:
                         self.log_message(f"'{troop_type}' eğitimi köy '{village.name}' için başlatılamadı.", level="warning")
         self.log_message("Asker eğitimi yönetimi tamamlandı.")
 
 
-    def manage_hero_adventures(self):
+    def hero_adventure_steps(self) -> Steps[None]:
         if not self.client._is_active: return
         if time.time() < self.next_adventure_check_time:
             return
@@ -224,8 +356,9 @@ class BotEngine:
         hero = self.account_data.hero
         if hero.adventure_available:
             self.log_message("Kahraman için macera mevcut. Maceraya gönderiliyor...")
-            if self.client.send_hero_to_adventure():
+            if (yield call("send_hero_to_adventure")):
                 self.log_message("Kahraman başarıyla maceraya gönderildi.")
+                self.dirty.mark_hero()
                 self.next_adventure_check_time = time.time() + self.adventure_cooldown_success
                 self.account_data.hero.adventure_available = False # Update locally
             else:
@@ -237,7 +370,7 @@ class BotEngine:
         self.log_message("Kahraman maceraları kontrolü tamamlandı.")
 
 
-    def update_farm_list_with_ai(self):
+    def farm_list_ai_steps(self) -> Steps[None]:
         if not self.client._is_active: return
         if time.time() < self.next_farm_list_ai_update_time:
             return
@@ -251,12 +384,13 @@ class BotEngine:
         current_village = self.account_data.villages[0]
         self.log_message(f"YZ için '{current_village.name}' köyü etrafındaki bilgiler çekilecek.")
 
-        nearby_villages_info = self.client.get_nearby_village_info(current_village.id, radius=7) #
+        nearby_villages_info = yield call("get_nearby_village_info", current_village.id, 7) #
 
         if nearby_villages_info:
             current_village_troops = current_village.troops_home
             self.log_message(f"YZ'ye sunulacak {len(nearby_villages_info)} köy/vaha bilgisi ve {len(current_village_troops)} tip asker bilgisi mevcut.")
-            suggested_targets = self.ai_farm_list_manager.suggest_farm_targets(nearby_villages_info, current_village_troops)
+            # Gemini istemcisi senkrondur; async motorda yanıt beklenirken olay döngüsü serbest kalır
+            suggested_targets = yield offload(self.ai_farm_list_manager.suggest_farm_targets, nearby_villages_info, current_village_troops)
 
             if suggested_targets:
                 self.log_message(f"YZ'den {len(suggested_targets)} adet yağma hedefi önerisi alındı. FarmingManager'a iletiliyor.")
@@ -270,6 +404,162 @@ class BotEngine:
         self.log_message("YZ yağma listesi güncelleme işlemi tamamlandı.")
 
 
+    def _schedule_initial_jobs(self):
+        now = time.time()
+        initial_jobs = [
+            ("state_refresh", now + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max), "periyodik durum yenileme"),
+            ("ai_farm_list", max(now, self.next_farm_list_ai_update_time), "YZ yağma listesi"),
+            ("troop_training", now, "asker eğitimi"),
+            *((f"build:{village.id}", now, "ilk inşaat kontrolü") for village in self.account_data.villages),
+            ("hero_adventure", self.next_adventure_check_time, "macera kontrolü"),
+            ("farm", now, "ilk yağma döngüsü"),
+        ]
+        for key, when, reason in initial_jobs:
+            if key not in self.scheduler: # Anlık görüntüden geri yüklenen zamanlamalar korunur
+                self.scheduler.schedule(key, when, reason)
+
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Yeniden başlatmada kaybolmaması gereken durum: hesap, yağma listesi (son yağma zamanları), zamanlayıcılar, yoldaki askerler."""
+        return {
+            "server_url": self.client.server_url,
+            "account": account_to_dict(self.account_data),
+            "farm_list": self.farming_manager.farm_list,
+            "known_build_costs": [[*key, cost] for key, cost in self.known_build_costs.items()],
+            "timers": {
+                "next_adventure_check_time": self.next_adventure_check_time,
+                "next_farm_list_ai_update_time": self.next_farm_list_ai_update_time,
+                "ai_last_check_time": self.ai_farm_list_manager.last_ai_check_time,
+            },
+            "scheduler": self.scheduler.entries(),
+            "troop_ledger": self.farming_manager.troop_ledger.entries(),
+        }
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path or not self.account_data.villages:
+            return
+        try:
+            save_checkpoint(self.checkpoint_path, self.checkpoint_state())
+        except (OSError, TypeError, ValueError) as e:
+            self.log_message(f"Durum anlık görüntüsü yazılamadı: {e}", level="warning")
+
+    def restore_checkpoint(self) -> bool:
+        """
+        Aynı hesabın son anlık görüntüsünü yükler. Taze bir görüntüde yalnızca dorf1 parçaları (ve kuyruktaki binanın
+        sayfası) bayat sayılır; `checkpoint_stale_after`'dan eskiyse her şey yeniden okunur. Yüklenemezse False.
+        """
+        state = load_checkpoint(self.checkpoint_path) if self.checkpoint_path else None
+        if not state or state.get("server_url") != self.client.server_url:
+            return False
+        try:
+            account = account_from_dict(state["account"])
+            known_build_costs = {(village_id, location_id, level): cost for village_id, location_id, level, cost in state.get("known_build_costs", [])}
+        except (KeyError, TypeError, ValueError) as e:
+            self.log_message(f"Durum anlık görüntüsü geçersiz, yok sayılıyor: {e}", level="warning")
+            return False
+        if account.username != self.account_data.username or not account.villages:
+            return False
+
+        # Nesne yerinde güncellenir; FarmingManager ve GUI aynı PlayerAccount'u tutuyor
+        self.account_data.villages, self.account_data.hero, self.account_data.culture_points = account.villages, account.hero, account.culture_points
+        self.farming_manager.farm_list = state.get("farm_list", [])
+        self.farming_manager.rebuild_target_queue()
+        self.farming_manager.troop_ledger.load(state.get("troop_ledger", []))
+        self.known_build_costs = known_build_costs
+        timers = state.get("timers", {})
+        self.next_adventure_check_time = timers.get("next_adventure_check_time", self.next_adventure_check_time)
+        self.next_farm_list_ai_update_time = timers.get("next_farm_list_ai_update_time", self.next_farm_list_ai_update_time)
+        self.ai_farm_list_manager.last_ai_check_time = timers.get("ai_last_check_time", 0)
+        for key, when, reason in state.get("scheduler", []):
+            self.scheduler.schedule(key, when, reason)
+
+        age = time.time() - state["saved_at"]
+        if age > self.checkpoint_stale_after:
+            self.dirty.mark_all(village.id for village in self.account_data.villages)
+        else:
+            for village in self.account_data.villages:
+                self.dirty.mark(village.id, *DORF1_ASPECTS, *self._aspects_for_finished_construction(village))
+        self.log_message(f"Durum anlık görüntüsünden devam ediliyor ({int(age)} sn önce kaydedilmiş): {len(self.account_data.villages)} köy, "
+                         f"{len(self.farming_manager.farm_list)} yağma hedefi, {len(self.scheduler)} zamanlanmış iş.")
+        return True
+
+    def _ensure_periodic_jobs(self):
+        """Bir hata işi zamanlanmadan kuyruktan düşürdüyse periyodik işleri geri kurar."""
+        now = time.time()
+        if "state_refresh" not in self.scheduler:
+            self.scheduler.schedule("state_refresh", now + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max), "periyodik durum yenileme")
+        if "ai_farm_list" not in self.scheduler:
+            self.scheduler.schedule("ai_farm_list", max(now, self.next_farm_list_ai_update_time), "YZ yağma listesi")
+        if "hero_adventure" not in self.scheduler:
+            self.scheduler.schedule("hero_adventure", max(now, self.next_adventure_check_time), "macera kontrolü")
+        if "farm" not in self.scheduler:
+            self.scheduler.schedule("farm", now + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max), "yağma döngüsü")
+
+    def run_due_jobs(self, due_jobs: List[str]):
+        """Zamanı gelen işleri çalıştırır; her yönetici bir sonraki uyanma zamanını kendisi kurar."""
+        if "state_refresh" in due_jobs:
+            self.update_game_state()
+            self.scheduler.schedule("state_refresh", time.time() + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max), "periyodik durum yenileme")
+            due_jobs = due_jobs + ["troop_training"]
+            # Zamanlanmış inşaat işi olmayan köyler (yeni köy, hata sonrası kaybolan iş) bu turda kontrol edilir
+            due_jobs += [f"build:{v.id}" for v in self.account_data.villages if f"build:{v.id}" not in self.scheduler and f"build:{v.id}" not in due_jobs]
+        if not self.is_running: return
+
+        if "ai_farm_list" in due_jobs:
+            self.update_farm_list_with_ai()
+            self.scheduler.schedule("ai_farm_list", self.next_farm_list_ai_update_time, "YZ yağma listesi")
+            if not self.is_running: return
+
+        build_village_ids = [job.split(":", 1)[1] for job in due_jobs if job.startswith("build:")]
+        if build_village_ids:
+            # Slotu boşalan köylerde yalnızca kuyruk, kaynaklar ve biten binanın bulunduğu sayfa yeniden okunur
+            for village in self.account_data.villages:
+                if village.id in build_village_ids and village.building_queue:
+                    self.dirty.mark(village.id, "queue", "resources", *self._aspects_for_finished_construction(village))
+            self.refresh_dirty_state()
+            self.manage_building_queues(build_village_ids)
+            time.sleep(random.uniform(1,3))
+            if not self.is_running: return
+
+        if "troop_training" in due_jobs:
+            self.scheduler.cancel("troop_training")
+            self.manage_troop_training()
+            time.sleep(random.uniform(1,3))
+            if not self.is_running: return
+
+        if "hero_adventure" in due_jobs:
+            self.manage_hero_adventures()
+            self.scheduler.schedule("hero_adventure", self.next_adventure_check_time, "macera kontrolü")
+            if not self.is_running: return
+
+        if "farm" in due_jobs:
+            self.farming_manager.automated_farming_cycle()
+            next_eligible = self.farming_manager.next_eligible_time()
+            if next_eligible is None: # Liste boş; YZ güncellemesi veya periyodik kontrol bekleniyor
+                next_eligible = time.time() + random.uniform(self.main_loop_interval_min, self.main_loop_interval_max)
+            self.scheduler.schedule("farm", max(next_eligible, time.time()) + self._jitter(), "yağma hedefi uygun")
+
+        if "raid_dispatch" in due_jobs:
+            self.farming_manager.dispatch_due_raid()
+        if "farm" in due_jobs or "raid_dispatch" in due_jobs:
+            self._schedule_raid_dispatch()
+
+        if self.dirty: # Eylemlerin bıraktığı bayat parçalar (örn. macera sonrası kahraman)
+            self.refresh_dirty_state()
+
+    def _schedule_raid_dispatch(self):
+        """Gönderim kuyruğunda yağma varsa sıradakinin zamanında uyanılır; aradaki süre diğer işlere kalır."""
+        next_send = self.farming_manager.raid_dispatcher.next_send_time()
+        if next_send is not None:
+            self.scheduler.schedule("raid_dispatch", max(next_send, time.time()), f"sıradaki yağma ({len(self.farming_manager.raid_dispatcher)} kuyrukta)")
+
+    def _aspects_for_finished_construction(self, village: Village) -> List[str]:
+        """Kuyruktaki binalar kaynak alanıysa dorf1 ("fields"), değilse dorf2 ("center") bayat sayılır."""
+        field_names = {b.name.lower() for b in village.buildings if b.location_id and b.location_id.isdigit() and int(b.location_id) <= 18}
+        aspects = set()
+        for queued in village.building_queue:
+            aspects.add("fields" if queued.name.lower() in field_names else "center")
+        return sorted(aspects)
+
     def run(self):
         self.log_message("Bot motoru çalıştırılıyor...") # Changed message slightly
 
@@ -283,13 +573,15 @@ class BotEngine:
         self.is_running = True # Set to true only after successful login
         self.log_message("TravianClient başarıyla oturum açtı. İlk durum güncellemesi yapılıyor...")
 
-        self.update_game_state()
-        self.next_adventure_check_time = time.time() + self.adventure_cooldown_initial
+        if self.restore_checkpoint():
+            self.refresh_dirty_state() # Yalnızca bayat parçalar okunur
+        else:
+            self.update_game_state()
+            self.next_adventure_check_time = time.time() + self.adventure_cooldown_initial
+        self._schedule_initial_jobs()
 
         while self.is_running:
-            loop_start_time = time.time()
             try:
-                self.log_message("Ana bot döngüsü başlıyor...")
                 if not self.client._is_active: # Check if client session is still active
                     self.log_message("Travian istemci oturumu aktif değil. Yeniden bağlanmaya çalışılıyor...", level="warning")
                     if not self.client.login(): # Attempt to re-login
@@ -298,44 +590,27 @@ class BotEngine:
                         break # Exit while loop
                     self.log_message("Yeniden bağlanma başarılı.")
 
-                self.update_game_state()
-                if not self.is_running: break # Check after potentially long update
-
-                self.update_farm_list_with_ai()
-                if not self.is_running: break
-
-                self.manage_building_queues()
-                time.sleep(random.uniform(1,3))
-                if not self.is_running: break
-
-                self.manage_troop_training()
-                time.sleep(random.uniform(1,3))
-                if not self.is_running: break
-
-                self.manage_hero_adventures()
-                time.sleep(random.uniform(1,3))
-                if not self.is_running: break
-
-                self.farming_manager.automated_farming_cycle() #
-
-                loop_end_time = time.time()
-                processing_time = loop_end_time - loop_start_time
-                sleep_duration = random.uniform(self.main_loop_interval_min, self.main_loop_interval_max)
-                actual_sleep = max(0, sleep_duration - processing_time)
-
-                self.log_message(f"Ana döngü tamamlandı ({processing_time:.2f} s). Sonraki kontrol ~{int(actual_sleep / 60)} dakika sonra.")
-
-                for _ in range(int(actual_sleep)):
-                    if not self.is_running:
-                        break
-                    time.sleep(1)
+                self._ensure_periodic_jobs()
+                due_jobs = self.scheduler.pop_due()
+                if due_jobs:
+                    job_start_time = time.time()
+                    self.run_due_jobs(due_jobs)
+                    self.save_checkpoint()
+                    if not self.is_running: break
+                    self.log_message(f"Zamanlanmış işler tamamlandı ({', '.join(due_jobs)}; {time.time() - job_start_time:.2f} s).")
+
+                next_wake = self.scheduler.next_wake_time()
+                if next_wake is not None:
+                    next_key, next_in, next_reason = self.scheduler.describe()[0]
+                    self.log_message(f"Sonraki iş: '{next_key}' ~{max(0, next_in)} sn sonra ({next_reason}).")
+                self.scheduler.wait_until_next(lambda: self.is_running, max_sleep=self.main_loop_interval_max)
                 if not self.is_running: break
 
             except PlaywrightError as pe: # Catch Playwright specific errors
                 self.log_message(f"Bot motorunda bir Playwright hatası oluştu: {pe}", level="error", exc_info=True)
-                self.log_message("Playwright hatası nedeniyle Travian istemcisi kapatılıyor.", level="warning")
-                self.client.close() # Close the client as its Playwright instance is likely broken
-                                     # The next loop iteration will attempt to re-login if self.is_running is still true
+                self.log_message("Playwright hatası nedeniyle tarayıcı context'i yenileniyor (tarayıcı açık tutulur).", level="warning")
+                self.client.reset_context() # Only the page/context is recycled; the warm browser and the saved session are kept.
+                                             # The next loop iteration re-logs in, usually from the saved storage_state.
                 if not self.is_running: break
                 time.sleep(30) # Wait a bit before trying to recover in next loop
 
@@ -345,6 +620,7 @@ class BotEngine:
                 time.sleep(60) #
 
         self.log_message("Bot motoru döngüsü tamamlandı. Kaynaklar serbest bırakılıyor...")
+        self.save_checkpoint()
         self.client.close() # Ensure client is closed when run loop exits
         self.log_message("Bot motoru durduruldu.")
 
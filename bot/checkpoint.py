@@ -0,0 +1,76 @@
+# --- travian_bot_project/bot/checkpoint.py ---
+import os
+import json
+import time
+import logging
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Optional
+
+from .game_state import PlayerAccount, Village, Building, Troop, HeroStatus
+
+logger = logging.getLogger(__name__)
+
+# Hesap başına durum anlık görüntüleri; oyun durumu ve yağma geçmişi içerdiği için git'e eklenmez
+CHECKPOINTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "checkpoints")
+CHECKPOINT_VERSION = 1
+
+# Eski sürüm -> bir sonraki sürüme dönüştüren işlevler; biçim değiştiğinde buraya eklenir
+MIGRATIONS: Dict[int, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+
+def account_to_dict(account: PlayerAccount) -> Dict[str, Any]:
+    # `_` ile başlayan alanlar (köy/asker indeksleri) türetilmiş durumdur, yüklemede yeniden kurulur
+    return asdict(account, dict_factory=lambda items: {key: value for key, value in items if not key.startswith("_")})
+
+
+def _village_from_dict(data: Dict[str, Any]) -> Village:
+    data = dict(data)
+    data["buildings"] = [Building(**b) for b in data.get("buildings", [])]
+    data["building_queue"] = [Building(**b) for b in data.get("building_queue", [])]
+    data["troops_home"] = [Troop(**t) for t in data.get("troops_home", [])]
+    return Village(**data)
+
+
+def account_from_dict(data: Dict[str, Any]) -> PlayerAccount:
+    return PlayerAccount(
+        username=data["username"],
+        villages=[_village_from_dict(v) for v in data.get("villages", [])],
+        hero=HeroStatus(**data.get("hero", {})),
+        culture_points=data.get("culture_points", 0),
+    )
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]):
+    """
+    Durumu atomik olarak yazar: geçici dosyaya yazılıp diske aktarılır, sonra os.replace ile yerine konur.
+    Yazma sırasında süreç ölse bile önceki anlık görüntü bozulmaz.
+    """
+    payload = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), **state}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as checkpoint_file:
+        json.dump(payload, checkpoint_file, ensure_ascii=False)
+        checkpoint_file.flush()
+        os.fsync(checkpoint_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Anlık görüntüyü okur ve güncel sürüme taşır. Dosya yoksa, bozuksa veya taşınamıyorsa None."""
+    try:
+        with open(path, encoding="utf-8") as checkpoint_file:
+            payload = json.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Durum anlık görüntüsü okunamadı ({path}): {e}")
+        return None
+
+    version = payload.get("version")
+    while isinstance(version, int) and version < CHECKPOINT_VERSION and version in MIGRATIONS:
+        payload = MIGRATIONS[version](payload)
+        version = payload["version"] = version + 1
+    if version != CHECKPOINT_VERSION:
+        logger.warning(f"Durum anlık görüntüsü sürümü desteklenmiyor ({version} != {CHECKPOINT_VERSION}), yok sayılıyor: {path}")
+        return None
+    return payload
@@ -0,0 +1,97 @@
+# --- travian_bot_project/bot/client_steps.py ---
+# Senkron ve asenkron motorların ortak karar mantığı. Yöneticiler istemciyi doğrudan çağırmak yerine istekleri
+# `yield` eden adım üreteçleri yazar ve yanıtı `yield` ifadesinin değeri olarak alır. `run_steps` bu üreteçleri
+# TravianClient ile, `run_steps_async` AsyncTravianClient ile yürütür; karar kodu tek yerde kalır.
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Generator, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class ClientCall:
+    method: str # İstemci metodunun adı; iki istemcide de aynı imzayla bulunur
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Offload:
+    """İstemciden bağımsız bloklayan iş (örn. Gemini isteği); async motorda olay döngüsünü tutmamak için thread'de çalışır."""
+    func: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Gather:
+    """Birbirinden bağımsız istekler: async motorda eşzamanlı, senkron motorda sırayla. Yanıt, sonuç listesidir."""
+    requests: Tuple[Union[ClientCall, Offload], ...]
+
+
+Request = Union[ClientCall, Offload, Gather]
+Steps = Generator[Request, Any, T]
+
+
+def call(method: str, *args: Any) -> ClientCall:
+    return ClientCall(method, args)
+
+
+def offload(func: Callable[..., Any], *args: Any) -> Offload:
+    return Offload(func, args)
+
+
+def gather(*requests: Union[ClientCall, Offload]) -> Gather:
+    return Gather(requests)
+
+
+def _run_one(request: Union[ClientCall, Offload], client: Any) -> Any:
+    if isinstance(request, Offload):
+        return request.func(*request.args)
+    return getattr(client, request.method)(*request.args)
+
+
+def run_steps(steps: Steps[T], client: Any) -> T:
+    """Adımları sırayla yürütür; istemci hatası üretece iletilir (try/finally blokları çalışsın)."""
+    response: Any = None
+    error: Union[BaseException, None] = None
+    try:
+        while True:
+            request = steps.throw(error) if error is not None else steps.send(response)
+            response, error = None, None
+            try:
+                if isinstance(request, Gather):
+                    response = [_run_one(r, client) for r in request.requests]
+                else:
+                    response = _run_one(request, client)
+            except Exception as e:
+                error = e
+    except StopIteration as stop:
+        return stop.value
+
+
+async def _run_one_async(request: Union[ClientCall, Offload], client: Any) -> Any:
+    if isinstance(request, Offload):
+        return await asyncio.to_thread(request.func, *request.args)
+    return await getattr(client, request.method)(*request.args)
+
+
+async def run_steps_async(steps: Steps[T], client: Any) -> T:
+    """`run_steps`in olay döngüsü sürümü; istemci metotları await edilir, Gather istekleri birlikte beklenir."""
+    response: Any = None
+    error: Union[BaseException, None] = None
+    try:
+        while True:
+            request = steps.throw(error) if error is not None else steps.send(response)
+            response, error = None, None
+            try:
+                if isinstance(request, Gather):
+                    response = list(await asyncio.gather(*(_run_one_async(r, client) for r in request.requests)))
+                else:
+                    response = await _run_one_async(request, client)
+            except Exception as e:
+                error = e
+    except StopIteration as stop:
+        return stop.value
@@ -0,0 +1,52 @@
+# --- travian_bot_project/bot/dirty_state.py ---
+import logging
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Köy durumunun ayrı ayrı yenilenebilen parçaları ve hangi sayfadan okundukları
+VILLAGE_ASPECTS = ("resources", "fields", "queue", "troops", "center")
+DORF1_ASPECTS = frozenset({"resources", "fields", "queue", "troops"})
+DORF2_ASPECTS = frozenset({"center"})
+
+class DirtyTracker:
+    """
+    Köy başına hangi durum parçalarının bayat olduğunu tutar (örn. "köy 123: queue, resources").
+    Bir eylemden sonra sadece o eylemin değiştirdiği parçalar işaretlenir; yenileme de yalnızca onları okur.
+    """
+    def __init__(self):
+        self._dirty: Dict[str, Set[str]] = {}
+        self.hero_dirty: bool = False
+
+    def mark(self, village_id: str, *aspects: str):
+        unknown = set(aspects) - set(VILLAGE_ASPECTS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen köy durumu parçası: {sorted(unknown)}")
+        self._dirty.setdefault(village_id, set()).update(aspects or VILLAGE_ASPECTS)
+        logger.debug(f"Köy {village_id} bayat olarak işaretlendi: {sorted(self._dirty[village_id])}")
+
+    def mark_all(self, village_ids: Iterable[str]):
+        for village_id in village_ids:
+            self.mark(village_id)
+        self.hero_dirty = True
+
+    def mark_hero(self):
+        self.hero_dirty = True
+
+    def dirty_aspects(self, village_id: str) -> Set[str]:
+        return set(self._dirty.get(village_id, ()))
+
+    def dirty_villages(self) -> Set[str]:
+        return {village_id for village_id, aspects in self._dirty.items() if aspects}
+
+    def clear(self, village_id: str, aspects: Optional[Iterable[str]] = None):
+        if aspects is None:
+            self._dirty.pop(village_id, None)
+        elif village_id in self._dirty:
+            self._dirty[village_id].difference_update(aspects)
+
+    def clear_hero(self):
+        self.hero_dirty = False
+
+    def __bool__(self) -> bool:
+        return self.hero_dirty or bool(self.dirty_villages())
@@ -0,0 +1,146 @@
+# --- travian_bot_project/bot/farm_lists.py ---
+# Oyunun yerleşik yağma listeleri (askeri üs -> yağma listesi). FarmingManager.farm_list, kaynak köy başına botun
+# yönettiği listelere eşitlenir; bir turdaki tüm hedefler tek bir gönderim isteğiyle yollanır.
+# Buradaki fonksiyonlar tarayıcıya dokunmaz; istekleri TravianClient / AsyncTravianClient atar.
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FARM_LIST_NAME = "Bot" # Bot yalnızca bu adla başlayan listelere dokunur; oyuncunun kendi listeleri korunur
+FARM_LIST_MAX_SLOTS = 100 # Oyunun liste başına hedef sınırı
+
+FARM_LISTS_API_PATH = "/api/v1/farm-list"
+FARM_LIST_SLOT_API_PATH = "/api/v1/farm-list/slot"
+FARM_LIST_SEND_API_PATH = "/api/v1/farm-list/send"
+GRAPHQL_API_PATH = "/api/v1/graphql"
+FARM_LISTS_QUERY = (
+    "query { ownPlayer { farmLists { id name ownerVillage { id } "
+    "slots { id isActive target { x y } troop { t1 t2 t3 t4 t5 t6 t7 t8 t9 t10 } } } } }"
+)
+
+
+@dataclass(slots=True)
+class FarmSlot:
+    id: int
+    list_id: int
+    x: int
+    y: int
+    units: Dict[str, int] # {"t1": 5}
+    active: bool = True
+
+
+@dataclass(slots=True)
+class NativeFarmList:
+    id: int
+    name: str
+    village_id: str
+    slots: List[FarmSlot] = field(default_factory=list)
+
+    @property
+    def is_bot_list(self) -> bool:
+        return self.name == FARM_LIST_NAME or self.name.startswith(FARM_LIST_NAME + " ")
+
+
+@dataclass
+class FarmListSyncPlan:
+    """Botun listelerini istenen hedeflere getirmek için gereken değişiklikler."""
+    lists_to_create: List[Tuple[str, str]] = field(default_factory=list) # (köy ID, liste adı)
+    add: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict) # liste ID -> yeni hedefler
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    delete: List[int] = field(default_factory=list)
+
+
+def troops_to_units(troops: Dict[str, int], field_for: Callable[[str], Optional[str]]) -> Dict[str, int]:
+    """{'Lejyoner': 10} -> {'t1': 10}; `field_for` asker adını alana çevirir (bkz. units.unit_field), bilinmeyenler atlanır."""
+    units = {}
+    for troop_name, count in troops.items():
+        field_name = field_for(troop_name)
+        try:
+            if field_name and int(count) > 0:
+                units[field_name] = int(count)
+        except (TypeError, ValueError):
+            continue # Geçersiz miktar; select_raid bu hedefi zaten atlar
+    return units
+
+
+def parse_farm_lists_response(body: Any) -> Optional[List[NativeFarmList]]:
+    """GraphQL yanıtındaki listeleri okur; yanıt beklenen biçimde değilse None."""
+    try:
+        raw_lists = body["data"]["ownPlayer"]["farmLists"] or []
+    except (KeyError, TypeError):
+        logger.warning(f"Yağma listesi yanıtı beklenen biçimde değil: {str(body)[:200]}")
+        return None
+    farm_lists = []
+    for raw in raw_lists:
+        try:
+            list_id = int(raw["id"])
+            slots = [FarmSlot(id=int(s["id"]), list_id=list_id, x=int(s["target"]["x"]), y=int(s["target"]["y"]),
+                              units={k: int(v) for k, v in (s.get("troop") or {}).items() if v},
+                              active=bool(s.get("isActive", True)))
+                     for s in raw.get("slots") or []]
+            farm_lists.append(NativeFarmList(list_id, raw.get("name") or "", str((raw.get("ownerVillage") or {}).get("id")), slots))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Yağma listesi atlanıyor ({raw.get('id') if isinstance(raw, dict) else raw}): {e}")
+    return farm_lists
+
+
+def plan_farm_list_sync(desired: Dict[str, Dict[Tuple[int, int], Dict[str, int]]], farm_lists: List[NativeFarmList]) -> FarmListSyncPlan:
+    """
+    `desired`: köy ID -> {(x, y): birimler}. Botun listelerinde olmayan hedefler boş yeri olan listeye eklenir,
+    birimleri değişenler güncellenir, artık istenmeyenler silinir. Yer kalmazsa yeni liste açılması planlanır;
+    listeler oluşturulduktan sonra plan yeniden hesaplanmalıdır (yeni listelerin ID'si gerekir).
+    """
+    plan = FarmListSyncPlan()
+    bot_lists: Dict[str, List[NativeFarmList]] = {}
+    for farm_list in sorted(farm_lists, key=lambda l: l.id):
+        if farm_list.is_bot_list:
+            bot_lists.setdefault(farm_list.village_id, []).append(farm_list)
+
+    for village_id, village_lists in bot_lists.items():
+        wanted = desired.get(village_id, {})
+        for slot in (s for l in village_lists for s in l.slots):
+            units = wanted.get((slot.x, slot.y))
+            if units is None:
+                plan.delete.append(slot.id)
+            elif units != slot.units or not slot.active:
+                plan.update.append({"id": slot.id, "listId": slot.list_id, "x": slot.x, "y": slot.y, "units": units, "active": True})
+
+    deleted = set(plan.delete)
+    for village_id, wanted in desired.items():
+        village_lists = bot_lists.get(village_id, [])
+        existing = {(s.x, s.y) for l in village_lists for s in l.slots}
+        missing = [coords for coords in wanted if coords not in existing]
+        for farm_list in village_lists:
+            room = FARM_LIST_MAX_SLOTS - sum(1 for s in farm_list.slots if s.id not in deleted)
+            batch, missing = missing[:max(0, room)], missing[max(0, room):]
+            if batch:
+                plan.add[farm_list.id] = [{"listId": farm_list.id, "x": x, "y": y, "units": wanted[(x, y)], "active": True} for x, y in batch]
+        for index in range(-(-len(missing) // FARM_LIST_MAX_SLOTS)):
+            number = len(village_lists) + index + 1
+            plan.lists_to_create.append((village_id, FARM_LIST_NAME if number == 1 else f"{FARM_LIST_NAME} {number}"))
+    return plan
+
+
+def slot_index(farm_lists: List[NativeFarmList]) -> Dict[Tuple[str, int, int], FarmSlot]:
+    """Botun listelerindeki hedefler: (köy ID, x, y) -> FarmSlot."""
+    return {(l.village_id, s.x, s.y): s for l in farm_lists if l.is_bot_list for s in l.slots}
+
+
+def send_request_body(slots_by_list: Dict[int, List[int]]) -> Dict[str, Any]:
+    return {"action": "farmList", "lists": [{"id": list_id, "targets": slot_ids} for list_id, slot_ids in slots_by_list.items()]}
+
+
+def parse_send_response(body: Any, slots_by_list: Dict[int, List[int]]) -> Dict[int, bool]:
+    """Gönderim yanıtından hedef (slot ID) başına sonucu çıkarır; oyun yalnızca hatalı hedefleri bildirir."""
+    results = {slot_id: True for slot_ids in slots_by_list.values() for slot_id in slot_ids}
+    if isinstance(body, dict) and body.get("error"):
+        logger.warning(f"Yağma listesi gönderimi reddedildi: {body.get('error')}")
+        return {slot_id: False for slot_id in results}
+    for list_result in (body.get("lists") or []) if isinstance(body, dict) else []:
+        for target in list_result.get("targets") or []:
+            if isinstance(target, dict) and target.get("error") and target.get("id") in results:
+                logger.info(f"Yağma listesi hedefi {target['id']} gönderilemedi: {target['error']}")
+                results[target["id"]] = False
+    return results
@@ -0,0 +1,61 @@
+# --- travian_bot_project/bot/farm_queue.py ---
+import heapq
+import random
+import time
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .raid_dispatcher import raid_key
+
+logger = logging.getLogger(__name__)
+
+
+class FarmTargetQueue:
+    """
+    Yağma hedeflerinin bir sonraki uygun olma zamanına göre min-heap'i. Yağma döngüsü yalnızca zamanı gelmiş
+    hedefleri `pop_due` ile alır; bekleme süresindeki hedeflere hiç bakılmaz. Aynı zamandaki hedeflerin sırası
+    rastgele belirlenir. Bir hedef yeniden `push` edilirse eski kaydı geçersiz sayılır (tembel silme, bkz. TimerScheduler).
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, float, Tuple[int, int]]] = []
+        self._entries: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {} # koordinat -> (geçerli zaman, hedef)
+
+    def rebuild(self, farm_targets: Iterable[Dict[str, Any]], eligible_at: Callable[[Dict[str, Any]], float]):
+        """Kuyruğu listeden baştan kurar (yeni yağma listesi, anlık görüntüden geri yükleme)."""
+        self._entries = {raid_key(target): (eligible_at(target), target) for target in farm_targets}
+        self._heap = [(when, random.random(), key) for key, (when, _) in self._entries.items()]
+        heapq.heapify(self._heap)
+
+    def push(self, farm_target: Dict[str, Any], eligible_at: float):
+        key = raid_key(farm_target)
+        self._entries[key] = (eligible_at, farm_target)
+        heapq.heappush(self._heap, (eligible_at, random.random(), key))
+        if len(self._heap) > 2 * len(self._entries) + 64: # Geçersiz kayıtlar birikmesin
+            self._heap = [(when, random.random(), k) for k, (when, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _drop_stale_head(self):
+        while self._heap and self._entries.get(self._heap[0][2], (None,))[0] != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_time(self) -> Optional[float]:
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Zamanı gelmiş hedefleri (en fazla `limit`) en erkenden başlayarak çıkarır; geri konana kadar kuyrukta olmazlar."""
+        now = time.time() if now is None else now
+        due = []
+        while limit is None or len(due) < limit:
+            self._drop_stale_head()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            due.append(self._entries.pop(key)[1])
+        return due
+
+    def __contains__(self, farm_target: Dict[str, Any]) -> bool:
+        return raid_key(farm_target) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,9 +2,17 @@
 import time
 import random
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple, Callable
 from .travian_client import TravianClient
-from .game_state import PlayerAccount, Village, Troop # PlayerAccount eklendi
+from .game_state import PlayerAccount, Village, Troop, unit_key # PlayerAccount eklendi
+from .troop_ledger import TroopLedger, Reservation
+from .units import unit_field, unit_carry
+from .raid_dispatcher import RaidDispatcher, PendingRaid, raid_key
+from .farm_queue import FarmTargetQueue
+from .travel import raid_round_trip_seconds, village_modifiers, army_speed, map_distance, travel_seconds
+from .source_assignment import SourceAssigner
+from .farm_lists import NativeFarmList, FarmListSyncPlan, plan_farm_list_sync, slot_index, troops_to_units
+from .client_steps import Steps, call, run_steps
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +23,25 @@ class FarmingManager:
     """
     def __init__(self, client: TravianClient, account_data: PlayerAccount, gui_logger_callback=None):
         self.client = client
+        # Gönderilen askerler sayfa yeniden okunmadan düşülür, dönüş zamanında geri eklenir
+        self.troop_ledger = TroopLedger()
         self.account_data = account_data
         self.gui_logger_callback = gui_logger_callback
         self.farm_list: List[Dict[str, Any]] = [] # Başlangıçta boş, YZ veya kullanıcı dolduracak [cite: 249]
-        self.raid_interval_seconds = 10 # Her bir yağma saldırısı arası minimum bekleme
-        self.target_cooldown_seconds = 30 * 60 # Aynı hedefe tekrar saldırmadan önce 30 dk bekleme [cite: 252]
+        # Tek tek gönderilen yağmalar motoru bekletmez: kuyruğa alınır, motor tempoya göre birer birer gönderir
+        self.raid_dispatcher = RaidDispatcher()
+        self.raid_dispatcher.on_drop = self._on_raid_dropped
+        self.target_cooldown_seconds = 30 * 60 # Mesafe hesaplanamayan hedefe tekrar saldırmadan önce 30 dk bekleme [cite: 252]
+        self.min_target_cooldown_seconds = 10 * 60 # Yakın hedefler askerler döner dönmez ama en erken bu kadar sonra yeniden yağmalanır
+        self.server_speed = 1.0 # Sunucunun asker hızı çarpanı (yürüyüş süreleri için)
+        self.hero_speed_bonus = 0.0 # Kahraman eşyalarından gelen hız bonusu (oran)
+        self.target_retry_seconds = (5 * 60, 10 * 60) # Asker yetmediği veya gönderim başarısız olduğu için kalan hedef bu aralıkta yeniden denenir
+        self.target_queue = FarmTargetQueue() # Döngü yalnızca zamanı gelen hedefleri alır
+        self.on_raid_sent: Optional[Callable[[], None]] = None # Her başarılı gönderimden sonra (örn. durum anlık görüntüsü)
+        # Hedefler oyunun yerleşik yağma listelerine eşitlenip tek istekte gönderilir; API kullanılamazsa tek tek gönderilir
+        self.use_native_farm_lists = True
+        self.native_lists_synced = False
+        self.source_assigner = SourceAssigner() # Yalnızca stoğu veya hedefleri değişen birim grupları yeniden çözülür
 
     def log_message(self, message: str):
         """Hem konsola hem de GUI'ye (varsa) log mesajı gönderir."""
@@ -56,89 +78,364 @@ class FarmingManager:
 
 
         self.farm_list = validated_targets
+        self.native_lists_synced = False
+        for raid in self.raid_dispatcher.clear():
+            self.troop_ledger.release(raid.reservation)
+        self.assign_source_villages(force=True)
+        self.rebuild_target_queue()
         self.log_message(f"Yağma listesi {len(self.farm_list)} hedefle güncellendi.")
         if self.gui_logger_callback and hasattr(self.gui_logger_callback.__self__, 'update_farm_targets_display'): # GUI'yi güncelle
             self.gui_logger_callback.__self__.update_farm_targets_display(self.farm_list)
 
 
-    def automated_farming_cycle(self):
+    @staticmethod
+    def _troop_package(farm_target: Dict[str, Any]) -> Dict[str, int]:
+        """Hedefe gönderilecek askerler, asker anahtarıyla (geçersiz miktarlar atlanır)."""
+        package = {}
+        for troop_name, count in farm_target["troops"].items():
+            try:
+                if int(count) > 0:
+                    package[unit_key(troop_name)] = int(count)
+            except (TypeError, ValueError):
+                continue
+        return package
+
+    def assign_source_villages(self, force: bool = False) -> int:
         """
-        Yağma listesini döngüsel olarak kontrol eder ve saldırıları gönderir. [cite: 251]
-        Her hedef için asker kontrolü ve bekleme süresi yönetimi yapar. [cite: 251]
+        Hedefleri, köylerin sahip olduğu askerleri birim türü bazında aşmadan toplam gidiş-dönüş süresi en az olacak
+        şekilde kaynak köylere dağıtır (YZ'nin veya varsayılanın seçtiği köyün yerine geçer). Hiçbir köyün karşılayamadığı
+        hedefler mevcut köylerinde kalır; asker defteri onları asker dönene kadar bekletir. Kaynak köyü değişen hedef sayısını döndürür.
         """
-        if not self.account_data.villages:
-            self.log_message("Hesapta aktif köy bulunmadığı için yağma yapılamıyor.")
-            return
+        villages = [village for village in self.account_data.villages if village.coordinates]
+        if len(villages) < 2 or not self.farm_list:
+            return 0
+        tribe = self.client.tribe
+        if force:
+            self.source_assigner.clear()
+        owned = [self.troop_ledger.owned(village) for village in villages]
+        modifiers = [village_modifiers(village, self.server_speed, self.hero_speed_bonus) for village in villages]
+        # Köy konumları/çarpanları ve hedef listesi değişirse tüm gruplar yeniden çözülür; asker değişimi yalnızca ilgili grupları etkiler
+        context = (tuple((v.id, v.coordinates["x"], v.coordinates["y"], m.tournament_square_level) for v, m in zip(villages, modifiers)),
+                   tuple(raid_key(target) for target in self.farm_list), tribe, self.server_speed, self.hero_speed_bonus)
+        packages = [self._troop_package(target) for target in self.farm_list]
+        speeds = [army_speed(target["troops"], tribe) for target in self.farm_list]
 
-        if not self.farm_list:
-            self.log_message("Yağma listesi boş. Yağma döngüsü atlanıyor.")
-            return
+        def cost(i: int, j: int) -> Optional[float]:
+            if not speeds[j]:
+                return None
+            distance = map_distance(villages[i].coordinates, self.farm_list[j]["target_coords"], modifiers[i].map_size)
+            return 2 * travel_seconds(distance, speeds[j], modifiers[i])
 
-        self.log_message(f"Otomatik yağma döngüsü başlatılıyor ({len(self.farm_list)} hedef)...")
-        random.shuffle(self.farm_list) # Hedeflere rastgele sırada saldırmak için [cite: 252]
+        assignment = self.source_assigner.assign(owned, packages, cost, weight=lambda key: unit_carry(key, tribe) or 1, context=context)
+        changed = 0
+        for farm_target, i in zip(self.farm_list, assignment):
+            if i is None or farm_target.get("source_village_id") == villages[i].id:
+                continue
+            farm_target["source_village_id"] = villages[i].id
+            changed += 1
+            if farm_target in self.target_queue: # Yeni köyün yürüyüş süresine göre
+                self.target_queue.push(farm_target, self.target_eligible_at(farm_target))
+        if changed:
+            self.native_lists_synced = False # Hedefler başka köyün listesine taşınmalı
+            self.log_message(f"Kaynak köy ataması güncellendi: {changed}/{len(self.farm_list)} hedefin köyü değişti.")
+        unserved = sum(1 for package, i in zip(packages, assignment) if package and i is None)
+        if unserved and (changed or force):
+            self.log_message(f"{unserved} hedef için hiçbir köyde yeterli asker yok; mevcut kaynak köylerinde bekleyecekler.")
+        return changed
+
+    def round_trip_seconds(self, farm_target: Dict[str, Any]) -> Optional[float]:
+        """Hedefin askerlerinin kaynak köyden gidip dönme süresi; köy koordinatı veya birim hızı bilinmiyorsa None."""
+        source_village = self.account_data.get_village(farm_target.get("source_village_id"))
+        if not source_village:
+            return None
+        modifiers = village_modifiers(source_village, self.server_speed, self.hero_speed_bonus)
+        return raid_round_trip_seconds(source_village, farm_target["target_coords"], farm_target["troops"], self.client.tribe, modifiers)
+
+    def target_cooldown(self, farm_target: Dict[str, Any]) -> float:
+        """Hedef, askerleri döndükten sonra (en az `min_target_cooldown_seconds`) yeniden uygun olur."""
+        round_trip = self.round_trip_seconds(farm_target)
+        return max(self.min_target_cooldown_seconds, round_trip) if round_trip else self.target_cooldown_seconds
+
+    def target_eligible_at(self, farm_target: Dict[str, Any]) -> float:
+        return farm_target.get("last_raid_time", 0) + self.target_cooldown(farm_target)
+
+    def rebuild_target_queue(self):
+        """farm_list dışarıdan değiştirildiğinde (örn. anlık görüntüden yükleme) çağrılır."""
+        self.target_queue.rebuild(self.farm_list, self.target_eligible_at)
+
+    def raid_return_time(self, farm_target: Dict[str, Any], sent_at: float) -> float:
+        """Askerlerin köye döneceği zaman; yürüyüş süresi hesaplanamazsa hedef bekleme süresi kadar sonrası varsayılır."""
+        return sent_at + (self.round_trip_seconds(farm_target) or self.target_cooldown_seconds)
+
+    def _on_raid_dropped(self, raid: PendingRaid):
+        """Gönderim kuyruğunda süresi dolan yağma: askerler serbest kalır, hedef yeniden seçilebilir."""
+        self.troop_ledger.release(raid.reservation)
+        self.target_queue.push(raid.farm_target, time.time())
+
+    def retry_later(self, farm_target: Dict[str, Any]):
+        """
+        Hedef yeniden denenir: kaynak köyün yoldaki askerleri daha önce dönüyorsa o zaman, değilse retry aralığında;
+        hiçbir zaman hedefin bekleme süresi bitmeden değil.
+        """
+        retry_at = time.time() + random.uniform(*self.target_retry_seconds)
+        troops_back_at = self.troop_ledger.next_return_time(farm_target.get("source_village_id"))
+        retry_at = min(retry_at, troops_back_at) if troops_back_at else retry_at
+        self.target_queue.push(farm_target, max(retry_at, self.target_eligible_at(farm_target)))
+
+    def next_eligible_time(self) -> Optional[float]:
+        """Sıradaki hedefin uygun olacağı zaman (kuyruk boşsa None). Gönderim kuyruğu doluysa yer açılması beklenir."""
+        next_time = self.target_queue.next_time()
+        if next_time is not None and self.raid_dispatcher.is_full():
+            next_time = max(next_time, self.raid_dispatcher.next_send_time() or next_time)
+        return next_time
+
+    def select_raid(self, farm_target: Dict[str, Any]) -> Optional[Tuple[Village, Dict[str, int]]]:
+        """
+        Kuyruktan çıkan hedefin şimdi yağmalanıp yağmalanamayacağını kontrol eder (kaynak köy, evdeki askerler).
+        Uygunsa (kaynak köy, gönderilecek askerler), değilse None döndürür.
+        """
+        source_village_id = farm_target.get("source_village_id", self.account_data.villages[0].id) # YZ'den gelmezse ilk köy [cite: 252]
+        target_coords = farm_target["target_coords"]
+        troops_to_send_dict = farm_target["troops"] # {'Lejyoner': 10, 'Baltacı': 5} gibi
+
+        # Kaynak köyü bul
+        source_village: Optional[Village] = self.account_data.get_village(source_village_id)
+
+        if not source_village:
+            self.log_message(f"Yağma için kaynak köy ID {source_village_id} bulunamadı. Hedef {target_coords} atlanıyor.")
+            return None
+
+        # Kuyruk uygunluk zamanına göre sıralıdır; erken çıkan hedef, anahtarı güncellenmemiş bir kayıttır
+        eligible_at = self.target_eligible_at(farm_target)
+        if time.time() < eligible_at:
+            logger.warning(f"Hedef {target_coords} kuyruktan ~{int((eligible_at - time.time()) / 60)} dk erken çıktı; "
+                           "uygunluk zamanı değişmiş ama kuyruk güncellenmemiş.")
+            return None
+
+        # Asker yeterlilik kontrolü
+        can_send_raid = True
+        actual_troops_to_send = {} # Yeterli asker varsa gönderilecek miktar
+        missing_troops_log = []
+
+        for troop_name, required_count_raw in troops_to_send_dict.items():
+            try:
+                required_count = int(required_count_raw)
+                if required_count <= 0: continue # Geçerli olmayan miktarı atla
+            except ValueError:
+                self.log_message(f"Hedef {target_coords} için '{troop_name}' asker miktarı ({required_count_raw}) geçersiz. Atlanıyor.")
+                can_send_raid = False
+                break # Bu hedefi tamamen atla
+
+            found_at_home_count = self.troop_ledger.available(source_village, troop_name) # Son okuma, yola çıkan ve dönen askerlerle düzeltilmiş
+
+            if found_at_home_count >= required_count:
+                actual_troops_to_send[troop_name] = required_count
+            else:
+                missing_troops_log.append(f"{troop_name} (istenilen: {required_count}, mevcut: {found_at_home_count})")
+                can_send_raid = False # Eğer herhangi bir asker tipi yetersizse bu hedefi atla
+
+        if not can_send_raid or not actual_troops_to_send: # Ya asker yetersiz ya da gönderilecek asker yok
+            if missing_troops_log: # Sadece eksik varsa logla
+                self.log_message(f"Köy '{source_village.name}' -> {target_coords} (Ad: {farm_target.get('village_name')}) hedefine yeterli asker yok. Eksikler: {', '.join(missing_troops_log)}")
+            elif not actual_troops_to_send and troops_to_send_dict : # İstenen asker var ama hepsi 0 veya geçersizdi
+                self.log_message(f"Köy '{source_village.name}' -> {target_coords} (Ad: {farm_target.get('village_name')}) hedefine gönderilecek geçerli asker bulunamadı.")
+            return None
 
+
+        self.log_message(f"Köy '{source_village.name}' adresinden {target_coords} (Ad: {farm_target.get('village_name')}) hedefine {actual_troops_to_send} ile yağma gönderiliyor...")
+        return source_village, actual_troops_to_send
+
+    def record_raid_result(self, farm_target: Dict[str, Any], source_village: Village, success: bool, notify: bool = True):
+        """
+        Gönderim sonucunu hedefe işler; başarılıysa bekleme süresi başlar. Gönderilen askerler sayfa yeniden okunmadan
+        TroopLedger'da dönüş zamanına kadar ayrılı kalır ve o zaman serbest kalır (bkz. settle_reservation).
+        """
+        target_coords = farm_target["target_coords"]
+        if success:
+            round_trip = self.round_trip_seconds(farm_target)
+            timing = f" Varış ~{round_trip / 120:.0f} dk, dönüş ~{round_trip / 60:.0f} dk sonra." if round_trip else ""
+            self.log_message(f"Yağma saldırısı {target_coords} (Ad: {farm_target.get('village_name')}) hedefine başarıyla gönderildi.{timing}")
+            farm_target["last_raid_time"] = time.time() # Son yağma zamanını güncelle [cite: 253]
+            self.target_queue.push(farm_target, self.target_eligible_at(farm_target))
+            if notify and self.on_raid_sent:
+                self.on_raid_sent() # Çökmeden sonra aynı hedefe ikinci kez gönderilmesin
+        else:
+            self.log_message(f"Yağma saldırısı {target_coords} (Ad: {farm_target.get('village_name')}) hedefine gönderilemedi.")
+            self.retry_later(farm_target)
+
+    def desired_native_slots(self) -> Dict[str, Dict[Tuple[int, int], Dict[str, int]]]:
+        """Yağma listesinin yerleşik listelerdeki karşılığı: kaynak köy ID -> {(x, y): birimler}."""
+        desired: Dict[str, Dict[Tuple[int, int], Dict[str, int]]] = {}
         for farm_target in self.farm_list:
-            source_village_id = farm_target.get("source_village_id", self.account_data.villages[0].id) # YZ'den gelmezse ilk köy [cite: 252]
-            target_coords = farm_target["target_coords"]
-            troops_to_send_dict = farm_target["troops"] # {'Lejyoner': 10, 'Baltacı': 5} gibi
+            units = troops_to_units(farm_target["troops"], lambda name: unit_field(name, self.client.tribe))
+            source_village_id = farm_target.get("source_village_id")
+            if units and source_village_id:
+                coords = farm_target["target_coords"]
+                desired.setdefault(str(source_village_id), {})[(int(coords["x"]), int(coords["y"]))] = units
+        return desired
 
-            # Kaynak köyü bul
-            source_village: Optional[Village] = next((v for v in self.account_data.villages if v.id == source_village_id), None)
+    def apply_native_slots(self, farm_lists: List[NativeFarmList]) -> int:
+        """Hedeflere yerleşik listedeki liste/slot ID'lerini yazar; listede karşılığı olan hedef sayısını döndürür."""
+        index = slot_index(farm_lists)
+        mapped = 0
+        for farm_target in self.farm_list:
+            coords = farm_target["target_coords"]
+            slot = index.get((str(farm_target.get("source_village_id")), int(coords["x"]), int(coords["y"])))
+            farm_target["native_list_id"], farm_target["native_slot_id"] = (slot.list_id, slot.id) if slot else (None, None)
+            mapped += slot is not None
+        self.native_lists_synced = True
+        self.log_message(f"Yerleşik yağma listeleri eşitlendi: {mapped}/{len(self.farm_list)} hedef listede.")
+        return mapped
 
-            if not source_village:
-                self.log_message(f"Yağma için kaynak köy ID {source_village_id} bulunamadı. Hedef {target_coords} atlanıyor.")
-                continue
+    def _log_sync_plan(self, plan: FarmListSyncPlan):
+        self.log_message(f"Yerleşik yağma listeleri eşitleniyor: {sum(len(slots) for slots in plan.add.values())} ekleme, "
+                         f"{len(plan.update)} güncelleme, {len(plan.delete)} silme.")
 
-            # Hedef bekleme süresi kontrolü
-            last_raid_time = farm_target.get("last_raid_time", 0)
-            if (time.time() - last_raid_time) < self.target_cooldown_seconds:
-                remaining_cooldown = int((self.target_cooldown_seconds - (time.time() - last_raid_time)) / 60)
-                self.log_message(f"Hedef {target_coords} (Köy: {farm_target.get('village_name', 'Bilinmiyor')}) beklemede. Kalan süre: ~{remaining_cooldown} dakika.")
-                continue
+    def sync_native_farm_lists(self) -> bool:
+        """farm_list'i botun yerleşik yağma listelerine eşitler. Liste API'si kullanılamıyorsa False."""
+        return run_steps(self.native_list_sync_steps(), self.client)
+
+    def native_list_sync_steps(self) -> Steps[bool]:
+        desired = self.desired_native_slots()
+        farm_lists = yield call("get_farm_lists")
+        if farm_lists is None:
+            return False
+        plan = plan_farm_list_sync(desired, farm_lists)
+        if plan.lists_to_create: # Yeni listelerin ID'si gerektiği için plan listeler açıldıktan sonra yeniden çıkarılır
+            for village_id, name in plan.lists_to_create:
+                yield call("create_farm_list", village_id, name)
+            farm_lists = yield call("get_farm_lists")
+            if farm_lists is None:
+                return False
+            plan = plan_farm_list_sync(desired, farm_lists)
+        if plan.delete or plan.update or plan.add:
+            self._log_sync_plan(plan)
+            if plan.delete: yield call("delete_farm_list_slots", plan.delete) # Önce silinir: eklemeler için yer açılır
+            if plan.update: yield call("update_farm_list_slots", plan.update)
+            if plan.add: yield call("add_farm_list_slots", [slot for slots in plan.add.values() for slot in slots])
+            farm_lists = yield call("get_farm_lists")
+            if farm_lists is None:
+                return False
+        self.apply_native_slots(farm_lists)
+        return True
 
-            # Asker yeterlilik kontrolü
-            can_send_raid = True
-            actual_troops_to_send = {} # Yeterli asker varsa gönderilecek miktar
-            missing_troops_log = []
-
-            for troop_name, required_count_raw in troops_to_send_dict.items():
-                try:
-                    required_count = int(required_count_raw)
-                    if required_count <= 0: continue # Geçerli olmayan miktarı atla
-                except ValueError:
-                    self.log_message(f"Hedef {target_coords} için '{troop_name}' asker miktarı ({required_count_raw}) geçersiz. Atlanıyor.")
-                    can_send_raid = False
-                    break # Bu hedefi tamamen atla
-
-                found_at_home_count = 0
-                for troop_at_home in source_village.troops_home: # BotEngine'in güncellediği troops_home kullanılır
-                    if troop_at_home.type_name.lower() == troop_name.lower(): # İsimleri küçük harfe çevirerek karşılaştır
-                        found_at_home_count = troop_at_home.count
-                        break
-
-                if found_at_home_count >= required_count:
-                    actual_troops_to_send[troop_name] = required_count
-                else:
-                    missing_troops_log.append(f"{troop_name} (istenilen: {required_count}, mevcut: {found_at_home_count})")
-                    can_send_raid = False # Eğer herhangi bir asker tipi yetersizse bu hedefi atla
-
-            if not can_send_raid or not actual_troops_to_send: # Ya asker yetersiz ya da gönderilecek asker yok
-                if missing_troops_log: # Sadece eksik varsa logla
-                    self.log_message(f"Köy '{source_village.name}' -> {target_coords} (Ad: {farm_target.get('village_name')}) hedefine yeterli asker yok. Eksikler: {', '.join(missing_troops_log)}")
-                elif not actual_troops_to_send and troops_to_send_dict : # İstenen asker var ama hepsi 0 veya geçersizdi
-                    self.log_message(f"Köy '{source_village.name}' -> {target_coords} (Ad: {farm_target.get('village_name')}) hedefine gönderilecek geçerli asker bulunamadı.")
+    def settle_reservation(self, reservation: Optional[Reservation], farm_target: Dict[str, Any], success: bool):
+        """Gönderilen yağmanın askerleri dönüşe kadar ayrılı kalır; gönderilemeyeninki geri alınır."""
+        if reservation is None:
+            return
+        if success:
+            sent_at = time.time()
+            self.troop_ledger.confirm(reservation, sent_at, self.raid_return_time(farm_target, sent_at))
+        else:
+            self.troop_ledger.release(reservation)
+
+    def select_native_batch(self) -> Tuple[List[Tuple[Dict[str, Any], Village, Reservation]], Dict[int, List[int]]]:
+        """
+        Zamanı gelmiş, yerleşik listede slotu olan ve gönderilebilecek hedefler ile liste ID -> slot ID'leri; seçilmeyenler
+        sonra yeniden denenir. Seçilen her hedefin askerleri hemen ayrılır, aynı turdaki diğer hedeflere sayılmaz.
+        """
+        batch: List[Tuple[Dict[str, Any], Village, Reservation]] = []
+        slots_by_list: Dict[int, List[int]] = {}
+        for farm_target in self.target_queue.pop_due():
+            raid = self.select_raid(farm_target) if farm_target.get("native_slot_id") else None
+            if not raid:
+                self.retry_later(farm_target)
                 continue
+            source_village, troops = raid
+            batch.append((farm_target, source_village, self.troop_ledger.reserve(source_village.id, troops)))
+            slots_by_list.setdefault(farm_target["native_list_id"], []).append(farm_target["native_slot_id"])
+        return batch, slots_by_list
 
+    def record_native_results(self, batch: List[Tuple[Dict[str, Any], Village, Reservation]], results: Optional[Dict[int, bool]]):
+        if results is None:
+            self.log_message("Yağma listesi gönderimi başarısız; listeler bir sonraki turda yeniden eşitlenecek.")
+            self.native_lists_synced = False
+            for farm_target, _, reservation in batch:
+                self.troop_ledger.release(reservation)
+                self.retry_later(farm_target)
+            return
+        for farm_target, source_village, reservation in batch:
+            success = results.get(farm_target["native_slot_id"], False)
+            self.settle_reservation(reservation, farm_target, success)
+            self.record_raid_result(farm_target, source_village, success, notify=False)
+        if self.on_raid_sent and any(results.values()):
+            self.on_raid_sent()
+
+    def native_farming_cycle(self) -> bool:
+        """Uygun hedefleri yerleşik listelerden tek istekte gönderir. Listeler kullanılamıyorsa False (tek tek gönderim)."""
+        return run_steps(self.native_farming_steps(), self.client)
 
-            self.log_message(f"Köy '{source_village.name}' adresinden {target_coords} (Ad: {farm_target.get('village_name')}) hedefine {actual_troops_to_send} ile yağma gönderiliyor...")
+    def native_farming_steps(self) -> Steps[bool]:
+        if not self.native_lists_synced and not (yield from self.native_list_sync_steps()):
+            self.log_message("Yerleşik yağma listeleri kullanılamıyor; hedefler tek tek gönderilecek.")
+            return False
+        batch, slots_by_list = self.select_native_batch()
+        if batch:
+            self.record_native_results(batch, (yield call("send_farm_lists", slots_by_list)))
+        else:
+            self.log_message("Yerleşik yağma listelerinde şu an gönderilecek hedef yok.")
+        return True
 
-            if self.client.send_raid(source_village.id, target_coords, actual_troops_to_send):
-                self.log_message(f"Yağma saldırısı {target_coords} (Ad: {farm_target.get('village_name')}) hedefine başarıyla gönderildi.")
-                farm_target["last_raid_time"] = time.time() # Son yağma zamanını güncelle [cite: 253]
+    def automated_farming_cycle(self):
+        """
+        Yağma listesini döngüsel olarak kontrol eder; yerleşik listelerle tek istekte gönderir ya da
+        uygun hedefleri gönderim kuyruğuna alır (bkz. dispatch_due_raid). [cite: 251]
+        """
+        run_steps(self.farming_cycle_steps(), self.client)
+
+    def farming_cycle_steps(self) -> Steps[None]:
+        if not self.account_data.villages:
+            self.log_message("Hesapta aktif köy bulunmadığı için yağma yapılamıyor.")
+            return
+
+        if not self.farm_list:
+            self.log_message("Yağma listesi boş. Yağma döngüsü atlanıyor.")
+            return
+
+        self.assign_source_villages()
+        if self.use_native_farm_lists and (yield from self.native_farming_steps()):
+            return
+
+        self.log_message(f"Otomatik yağma döngüsü başlatılıyor ({len(self.farm_list)} hedef)...")
+        self.enqueue_eligible_raids()
+
+    def enqueue_eligible_raids(self) -> int:
+        """Zamanı gelen hedefleri rastgele sırayla gönderim kuyruğuna alır; eklenen yağma sayısını döndürür."""
+        room = self.raid_dispatcher.max_backlog - len(self.raid_dispatcher)
+        due_targets = self.target_queue.pop_due(limit=max(0, room))
+        random.shuffle(due_targets) # Hedeflere rastgele sırada saldırmak için [cite: 252]
+        added = 0
+        for farm_target in due_targets:
+            raid = self.select_raid(farm_target)
+            if not raid:
+                self.retry_later(farm_target)
+                continue
+            source_village, troops = raid
+            reservation = self.troop_ledger.reserve(source_village.id, troops)
+            if self.raid_dispatcher.enqueue(farm_target, source_village, troops, reservation):
+                added += 1
             else:
-                self.log_message(f"Yağma saldırısı {target_coords} (Ad: {farm_target.get('village_name')}) hedefine gönderilemedi.")
+                self.troop_ledger.release(reservation)
+                self.retry_later(farm_target)
+        if room <= 0:
+            self.log_message(f"Yağma kuyruğu dolu ({self.raid_dispatcher.max_backlog}); yeni hedefler yer açılınca alınacak.")
+        self.log_message(f"{added} yağma gönderim kuyruğuna alındı; {self.raid_dispatcher.describe()}.")
+        return added
+
+    def record_dispatched_raid(self, raid: PendingRaid, success: bool):
+        self.raid_dispatcher.record(success)
+        self.settle_reservation(raid.reservation, raid.farm_target, success)
+        self.record_raid_result(raid.farm_target, raid.source_village, success)
+        if not self.raid_dispatcher:
+            self.log_message(f"Yağma kuyruğu boşaldı: {self.raid_dispatcher.describe()}.")
 
-            # Botun çok hızlı davranmasını engellemek için rastgele bir bekleme
-            time.sleep(random.uniform(self.raid_interval_seconds, self.raid_interval_seconds + 10))
+    def dispatch_due_raid(self) -> bool:
+        """Tempo izin veriyorsa kuyruktaki sıradaki yağmayı gönderir; gönderim denendiyse True."""
+        return run_steps(self.dispatch_steps(), self.client)
 
-        self.log_message("Otomatik yağma döngüsü tamamlandı.")
+    def dispatch_steps(self) -> Steps[bool]:
+        raid = self.raid_dispatcher.pop_due()
+        if not raid:
+            return False
+        self.record_dispatched_raid(raid, (yield call("send_raid", raid.source_village.id, raid.farm_target["target_coords"], raid.troops)))
+        return True
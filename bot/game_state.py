@@ -1,8 +1,50 @@
 # --- travian_bot_project/bot/game_state.py ---
+import math
+import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Hashable, Sequence
 
-@dataclass
+
+def unit_key(type_name: str) -> str:
+    """Asker türünün karşılaştırma anahtarı (sayfadaki ad, YZ listesi ve tercihler farklı yazabilir)."""
+    return type_name.strip().casefold()
+
+
+class _ListIndex:
+    """
+    Bir listeye anahtar -> konum indeksi. Ayrıştırıcılar listeyi her yenilemede yeniden atar; indeks liste nesnesi
+    değişince veya boyu değişince bir sonraki aramada yeniden kurulur. Bulunan öğenin anahtarı doğrulanır ve
+    bulunamayan anahtarda indeks yeniden kurulur; böylece yerinde değişiklik (örn. villages[0] = yeni_köy) kaçmaz.
+    """
+    __slots__ = ("key_fn", "_source", "_length", "_positions")
+
+    def __init__(self, key_fn: Callable[[Any], Hashable]):
+        self.key_fn = key_fn
+        self._source: Optional[Sequence] = None
+        self._length = -1
+        self._positions: Dict[Hashable, int] = {}
+
+    def _rebuild(self, items: Sequence):
+        self._source, self._length = items, len(items)
+        self._positions = {}
+        for position, item in enumerate(items):
+            self._positions.setdefault(self.key_fn(item), position) # Yinelenen anahtarda ilk öğe (eski doğrusal arama gibi)
+
+    def find(self, items: Sequence, key: Hashable):
+        if items is not self._source or len(items) != self._length:
+            self._rebuild(items)
+        position = self._positions.get(key)
+        if position is not None and self.key_fn(items[position]) == key:
+            return items[position]
+        self._rebuild(items) # Iskalama doğrusal aramanın maliyetinde kalır
+        position = self._positions.get(key)
+        return items[position] if position is not None else None
+
+    def __deepcopy__(self, memo):
+        return _ListIndex(self.key_fn)
+
+
+@dataclass(slots=True)
 class Building:
     """Bir köydeki tek bir binayı temsil eder."""
     name: str
@@ -11,13 +53,13 @@ class Building:
     location_id: Optional[str] = None  # Köy içindeki konumu
     build_time_remaining: Optional[int] = 0  # Saniye cinsinden
 
-@dataclass
+@dataclass(slots=True)
 class Troop:
     """Belirli bir türdeki asker birliğini temsil eder."""
     type_name: str  # Örneğin, "Lejyoner"
     count: int
 
-@dataclass
+@dataclass(slots=True)
 class Village:
     """Bir oyuncu köyünü temsil eder."""
     name: str
@@ -31,6 +73,10 @@ class Village:
     building_queue: List[Building] = field(default_factory=list)  # Devam eden veya sıradaki inşaatlar [cite: 216]
     population: int = 0
     crop_consumption: int = 0
+    resources_updated_at: float = field(default_factory=time.time)  # `resources` değerlerinin okunduğu an (epoch sn)
+    # Konum ID'si ve asker anahtarı indeksleri; `_` ile başlayan alanlar durum anlık görüntüsüne yazılmaz
+    _building_index: _ListIndex = field(default_factory=lambda: _ListIndex(lambda b: b.location_id), init=False, repr=False, compare=False)
+    _troop_index: _ListIndex = field(default_factory=lambda: _ListIndex(lambda t: unit_key(t.type_name)), init=False, repr=False, compare=False)
 
     def can_afford(self, cost: Dict[str, int]) -> bool:
         """Belirli bir maliyeti karşılayıp karşılayamayacağını kontrol eder."""
@@ -39,14 +85,59 @@ class Village:
                 return False
         return True
 
+    def _capacity_for(self, resource: str) -> int:
+        return self.storage_capacity["granary"] if resource == "crop" else self.storage_capacity["warehouse"]
+
+    def projected_resources(self, at: Optional[float] = None) -> Dict[str, int]:
+        """
+        `at` anındaki (varsayılan: şimdi) tahmini kaynakları döndürür. Saatlik üretim depo/ambar kapasitesinde
+        kesilir; tahıl için net üretim kullanıldığından negatif tahıl sıfırın altına inmez.
+        """
+        elapsed_hours = max(0.0, ((time.time() if at is None else at) - self.resources_updated_at) / 3600)
+        projected = {}
+        for resource, amount in self.resources.items():
+            value = amount + self.production_rates.get(resource, 0) * elapsed_hours
+            projected[resource] = int(max(0, min(self._capacity_for(resource), value)))
+        return projected
+
+    def can_afford_at(self, cost: Dict[str, int], at: Optional[float] = None) -> bool:
+        projected = self.projected_resources(at)
+        return all(projected.get(resource, 0) >= amount for resource, amount in cost.items())
+
+    def time_until_affordable(self, cost: Dict[str, int]) -> Optional[float]:
+        """
+        Maliyetin karşılanabilmesine kalan saniye (şimdi karşılanıyorsa 0). Maliyet kapasiteyi aşıyorsa veya
+        eksik kaynağın üretimi sıfır/negatifse hiçbir zaman karşılanamaz: None döner. Şimdi yeten ama azalan
+        (negatif net tahıl) kaynak, diğerleri beklenirken maliyetin altına düşüyorsa da None döner.
+        """
+        now = time.time()
+        projected = self.projected_resources(now)
+        wait_seconds = 0.0
+        for resource, amount in cost.items():
+            missing = amount - projected.get(resource, 0)
+            if missing <= 0:
+                continue
+            rate = self.production_rates.get(resource, 0)
+            if amount > self._capacity_for(resource) or rate <= 0:
+                return None
+            wait_seconds = max(wait_seconds, math.ceil(missing / rate * 3600) + 1) # +1 sn: tahmin tamsayıya yuvarlanır
+        if wait_seconds and not self.can_afford_at(cost, now + wait_seconds):
+            return None
+        return wait_seconds
+
     def get_building_by_location_id(self, location_id: str) -> Optional[Building]:
         """Belirli bir konum ID'sine sahip binayı döndürür."""
-        for building in self.buildings:
-            if building.location_id == location_id:
-                return building
-        return None
+        return self._building_index.find(self.buildings, location_id)
 
-@dataclass
+    def get_troop(self, type_name: str) -> Optional[Troop]:
+        return self._troop_index.find(self.troops_home, unit_key(type_name))
+
+    def troop_count(self, type_name: str) -> int:
+        """Köyde evde bulunan bu türdeki asker sayısı (yoksa 0)."""
+        troop = self.get_troop(type_name)
+        return troop.count if troop else 0
+
+@dataclass(slots=True)
 class HeroStatus:
     """Kahramanın durumunu temsil eder."""
     health: int = 100
@@ -55,10 +146,15 @@ class HeroStatus:
     current_location: Optional[str] = None
     adventure_available: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class PlayerAccount:
     """Oyuncunun tüm Travian hesabını temsil eder."""
     username: str
     villages: List[Village] = field(default_factory=list)
     hero: HeroStatus = field(default_factory=HeroStatus)
-    culture_points: int = 0 
+    culture_points: int = 0
+    _village_index: _ListIndex = field(default_factory=lambda: _ListIndex(lambda v: v.id), init=False, repr=False, compare=False)
+
+    def get_village(self, village_id: Optional[str]) -> Optional[Village]:
+        return self._village_index.find(self.villages, village_id)
+
@@ -0,0 +1,95 @@
+# --- travian_bot_project/bot/http_session.py ---
+import logging
+from typing import Optional, List, Dict, Any, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+class TravianHttpSession:
+    """
+    Playwright oturumunun çerezlerini paylaşan, bağlantı havuzlu keep-alive HTTP oturumu.
+    Salt-okunur sayfa çekimleri (dorf1, dorf2, build.php?gid=16, /hero) ve JavaScript gerektirmeyen form
+    gönderimleri (askeri üs) için kullanılır; oturum açma ve diğer eylemler tarayıcıda kalır.
+    """
+
+    def __init__(self, server_url: str, user_agent: str, pool_size: int = 4, timeout: float = 20.0):
+        self.server_url = server_url.strip('/')
+        self.timeout = timeout
+        self.is_valid: bool = False # Çerezler yüklendi ve son istek oturum dışına düşmedi
+
+        self.session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=frozenset(["GET"]))
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "tr-TR,tr;q=0.9,en;q=0.8",
+        })
+
+    def load_cookies(self, cookies: List[Dict[str, Any]]):
+        """BrowserContext.cookies() çıktısını oturumun çerez kavanozuna kopyalar."""
+        self.session.cookies.clear()
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain"), path=cookie.get("path", "/"),
+                secure=cookie.get("secure", False),
+            )
+        self.is_valid = bool(cookies)
+        logger.info(f"HTTP oturumuna {len(cookies)} çerez aktarıldı.")
+
+    def fetch_html(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Sunucudan bir sayfanın ham HTML'ini çeker. Hata veya oturum düşmesi durumunda None döner."""
+        url = f"{self.server_url}/{path.lstrip('/')}"
+        try:
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP isteği başarısız ({url}): {e}")
+            return None
+
+        if response.status_code != 200:
+            logger.warning(f"HTTP isteği beklenmeyen durum kodu döndürdü ({url}): {response.status_code}")
+            return None
+        if self._looks_logged_out(response):
+            logger.warning(f"HTTP oturumu geçersiz görünüyor ({url} -> {response.url}). Çerezler yenilenmeli.")
+            self.is_valid = False
+            return None
+        return response.text
+
+    def post_form(self, path: str, data: Dict[str, str], referer: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """
+        Formu gönderir ve yönlendirmeleri izler; (HTML, son URL) döner. POST yeniden denenmez: yanıt alınamazsa
+        isteğin sunucuya ulaşıp ulaşmadığı bilinmediğinden çağıran tekrar göndermemelidir. Hata/oturum düşmesinde None.
+        """
+        url = path if path.startswith("http") else f"{self.server_url}/{path.lstrip('/')}"
+        headers = {"Referer": referer, "Origin": self.server_url} if referer else {"Origin": self.server_url}
+        try:
+            response = self.session.post(url, data=data, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"HTTP form gönderimi başarısız ({url}): {e}")
+            return None
+        if response.status_code != 200:
+            logger.warning(f"HTTP form gönderimi beklenmeyen durum kodu döndürdü ({url}): {response.status_code}")
+            return None
+        if self._looks_logged_out(response):
+            logger.warning(f"HTTP oturumu form gönderiminde geçersiz görünüyor ({url} -> {response.url}).")
+            self.is_valid = False
+            return None
+        return response.text, response.url
+
+    def _looks_logged_out(self, response: requests.Response) -> bool:
+        # Oturum düştüğünde sunucu giriş sayfasına yönlendirir veya giriş formunu döndürür
+        if "login" in response.url.lower() or response.url.rstrip('/') == self.server_url:
+            return True
+        return 'name="password"' in response.text and "logout" not in response.text
+
+    def close(self):
+        self.is_valid = False
+        try:
+            self.session.close()
+        except Exception as e:
+            logger.warning(f"HTTP oturumu kapatılırken hata: {e}")
@@ -0,0 +1,63 @@
+# --- travian_bot_project/bot/page_pool.py ---
+import logging
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, List, Tuple, Dict, Any, Optional
+from playwright._impl._errors import Error as PlaywrightError # sync_api'nin hata sınıfı; sync_api tarayıcı açılırken yüklenir
+
+if TYPE_CHECKING:
+    from playwright.sync_api import BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+class PagePool:
+    """
+    Aynı BrowserContext içinde en fazla `max_pages` ek sayfa tutar (çerezler ortaktır). Sayfalar ilk ihtiyaçta
+    açılır ve context kapanana kadar yeniden kullanılır. Ana `client.page` havuza dahil değildir; böylece
+    eylemler (yükseltme, yağma) için kullanılan sayfanın durumu paralel çekimlerden etkilenmez.
+    """
+    def __init__(self, context: "BrowserContext", max_pages: int = 4):
+        self.context = context
+        self.max_pages = max(1, max_pages)
+        self._pages: List["Page"] = []
+
+    def _get_pages(self, count: int) -> List["Page"]:
+        self._pages = [p for p in self._pages if not p.is_closed()]
+        while len(self._pages) < min(count, self.max_pages):
+            self._pages.append(self.context.new_page())
+        return self._pages[:min(count, self.max_pages)]
+
+    def load_and_extract(self, urls: List[str], extract_script: str, timeout: float = 40000) -> List[Optional[Dict[str, Any]]]:
+        """
+        URL'leri havuzdaki sayfalarda eşzamanlı yükler ve her birinde `extract_script` çalıştırır.
+        Sync API tek thread'de çalıştığından navigasyonlar önce hepsi başlatılır (expect_navigation), sonra beklenir;
+        yüklemeler tarayıcıda paralel ilerler. Sonuç listesi URL sırasındadır; başarısız yüklemeler None'dır
+        (gruptaki bir navigasyon hata verirse bayat sayfa okunmasın diye grubun tamamı None'dır).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        for batch_start in range(0, len(urls), self.max_pages):
+            batch = list(enumerate(urls))[batch_start:batch_start + self.max_pages]
+            pages = self._get_pages(len(batch))
+            started: List[Tuple[int, "Page"]] = []
+            try:
+                with ExitStack() as stack:
+                    for (index, url), page in zip(batch, pages):
+                        stack.enter_context(page.expect_navigation(wait_until="domcontentloaded", timeout=timeout))
+                        page.evaluate("url => { window.location.href = url; }", url)
+                        started.append((index, page))
+                    # ExitStack kapanırken her sayfanın navigasyonu beklenir
+            except PlaywrightError as e:
+                # Bir navigasyon hata verince diğerleri de beklenmez; sayfalar önceki köyün DOM'unu gösteriyor olabilir
+                logger.warning(f"Sayfa havuzunda navigasyon hatası, {len(started)} sayfalık grup atlandı: {e}")
+                continue
+            for index, page in started:
+                try:
+                    results[index] = page.evaluate(extract_script)
+                except PlaywrightError as e:
+                    logger.warning(f"Sayfa havuzunda çıkarma hatası ({urls[index]}): {e}")
+        return results
+
+    def close(self):
+        for page in self._pages:
+            try: page.close()
+            except Exception as e: logger.debug(f"Havuz sayfası kapatılırken hata: {e}")
+        self._pages = []
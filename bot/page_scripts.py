@@ -0,0 +1,113 @@
+# --- travian_bot_project/bot/page_scripts.py ---
+# Tarayıcıda page.evaluate ile çalıştırılan çıkarma betikleri. Senkron (TravianClient) ve asenkron
+# (AsyncTravianClient) istemciler aynı betikleri kullanır; ürettikleri yük bot.parsers ile ayrıştırılır.
+
+# dorf1 sayfasındaki kaynakları, kaynak alanlarını, inşaat kuyruğunu ve asker satırlarını
+# tek bir page.evaluate çağrısıyla toplar. Eleman başına locator/get_attribute IPC turları yerine
+# tarayıcıdan tek bir JSON yükü döner; ayrıştırma bot.parsers içindeki `parse_*_payload` fonksiyonlarında yapılır.
+DORF1_EXTRACT_JS = """
+() => {
+    const q = (sel, root = document) => root.querySelector(sel);
+    const qa = (sel, root = document) => Array.from(root.querySelectorAll(sel));
+    const text = (sel, root = document) => { const el = q(sel, root); return el ? el.innerText : null; };
+    const resourcesScript = qa('script').map(s => s.textContent || '')
+        .find(t => t.includes('var resources = {') && t.includes('maxStorage') && t.includes('production')) || null;
+    return {
+        resources_script: resourcesScript,
+        stock: {
+            l1: text('div#l1.value, span#l1'),
+            l2: text('div#l2.value, span#l2'),
+            l3: text('div#l3.value, span#l3'),
+            l4: text('div#l4.value, span#l4'),
+            warehouse: text('div#stockBar div.warehouse div.capacity div.value, #stockBarWarehouse .capacity'),
+            granary: text('div#stockBar div.granary div.capacity div.value, #stockBarGranary .capacity'),
+            free_crop: text('#stockBarFreeCrop span.value, span#stockBarFreeCrop, div#stockBarFreeCrop.value'),
+        },
+        production: q('table#production') ? [1, 2, 3, 4].map(i => text(`table#production tbody tr:nth-child(${i}) td.num`)) : null,
+        population: text('div#sidebarBoxActiveVillage div.population span, span.population-value'),
+        fields: qa('div#resourceFieldContainer a.resourceField[data-aid]').map(el => ({
+            aid: el.getAttribute('data-aid'),
+            gid: el.getAttribute('data-gid'),
+            title: el.getAttribute('title') || '',
+            class: el.getAttribute('class') || '',
+        })),
+        queue: qa('div.buildingList ul li').map(li => {
+            const timer = q('span.timer[data-value], span.timer[value]', li);
+            return {
+                name: text('div.name', li),
+                timer: timer ? (timer.getAttribute('data-value') || timer.getAttribute('value')) : null,
+            };
+        }),
+        troops: qa('div#villageInfoboxRightContent table#troops tbody tr, div.villageInfobox.units table#troops tbody tr, table.troop_details tbody tr').map(row => {
+            const img = q('td.ico img.unit, td:first-child img.unit, .uniticon img', row);
+            return {
+                has_img: !!img,
+                alt: img ? img.getAttribute('alt') : null,
+                title: img ? img.getAttribute('title') : null,
+                class: img ? (img.getAttribute('class') || '') : '',
+                count: text('td.num, td.un, .troop', row),
+                text: row.innerText,
+            };
+        }),
+    };
+}
+"""
+
+# dorf2 sayfasındaki bina slotlarını tek bir page.evaluate çağrısıyla toplar.
+DORF2_EXTRACT_JS = """
+() => ({
+    slots: Array.from(document.querySelectorAll('div#villageContent div.buildingSlot[data-gid], map#map2 area[gid]')).map(el => {
+        const label = el.querySelector('div.labelLayer');
+        return {
+            gid: el.getAttribute('data-gid'),
+            name: el.getAttribute('data-name') || '',
+            title: el.getAttribute('data-title') || el.getAttribute('title') || el.getAttribute('alt') || '',
+            label: label ? label.innerText : null,
+            class: el.getAttribute('class') || '',
+            href: el.getAttribute('href'),
+        };
+    }),
+})
+"""
+
+# build.php'deki bir sonraki seviyenin maliyetini (odun, tuğla, demir, tahıl sırasıyla) okur.
+UPGRADE_COST_JS = """
+() => Array.from(document.querySelectorAll(
+    '#contract .resourceWrapper .resource .value, div.upgradeBuilding .inlineIcon.resource span.value, #contract span.resources'
+)).slice(0, 4).map(el => el.textContent)
+"""
+
+# Kahraman sayfasındaki sağlık, deneyim, durum ve macera bilgisini tek bir page.evaluate çağrısıyla toplar.
+HERO_EXTRACT_JS = """
+() => {
+    const text = sel => { const el = document.querySelector(sel); return el ? el.textContent : null; };
+    const adventureButton = document.querySelector('div#sidebarBoxHero div.layoutButton.adventureWhite, #topBarHero a.layoutButton.adventure');
+    const statusIcon = document.querySelector('#topBarHero div.heroStatus a i');
+    return {
+        health: text('div.health svg title, .heroDashboardGeneral #health tooltip, .healthPath title, #topBarHero svg.health path.title title'),
+        experience: text('div.experience svg title, .heroDashboardGeneral #experience tooltip, .experiencePath title, #topBarHero svg.experience path.title title'),
+        status: text('.heroStatus div.text, .heroStatusMessage, #heroStatus div.movements div.text') || (statusIcon ? (statusIcon.getAttribute('class') || '').trim() || null : null),
+        adventure_button_class: adventureButton ? (adventureButton.getAttribute('class') || '') : null,
+        adventure_link_count: document.querySelectorAll("a[href*='hero/adventures'], .adventureListAvailable .adventureSlot").length,
+        on_hero_page: location.pathname.endsWith('/hero'),
+    };
+}
+"""
+
+# Oyunun kendi JSON API'sine (/api/v1/...) sayfanın oturumuyla istek atar: çerezler ve X-Version başlığı
+# oyun arayüzünün kullandığıyla aynıdır. Argüman: {method, path, body}; dönüş: {status, body (JSON veya metin)}.
+GAME_API_JS = """
+async ({method, path, body}) => {
+    const headers = {'Content-Type': 'application/json; charset=UTF-8', 'X-Requested-With': 'XMLHttpRequest'};
+    const version = window.Travian && Travian.Game && Travian.Game.version;
+    if (version) headers['X-Version'] = version;
+    const response = await fetch(path, {
+        method, headers, credentials: 'same-origin',
+        body: body === null || body === undefined ? undefined : JSON.stringify(body),
+    });
+    const text = await response.text();
+    let parsed = text;
+    try { parsed = text ? JSON.parse(text) : null; } catch (e) {}
+    return {status: response.status, body: parsed};
+}
+"""
@@ -0,0 +1,71 @@
+# --- travian_bot_project/bot/page_state.py ---
+import re
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PageSnapshot:
+    """Bir sayfadan çıkarılmış yükün (DOM anlık görüntüsü) önbellek kaydı."""
+    payload: Dict[str, Any]
+    loaded_at: float
+
+@dataclass
+class PageStateTracker:
+    """
+    TravianClient'ın hangi sayfada olduğunu (yol, aktif newdid, son yükleme zamanı) ve sayfa başına
+    son çıkarılan yükü izler. Taze bir anlık görüntü varsa çağıranlar sayfayı yeniden yüklemeden ondan beslenir.
+    """
+    max_age: float = 30.0  # saniye; bu süreden eski anlık görüntüler yeniden çekilir
+    current_path: Optional[str] = None  # örn. "dorf1.php", "build.php", "hero"
+    active_village_id: Optional[str] = None  # sunucu tarafında seçili köy (son newdid)
+    last_load_time: float = 0.0
+    _snapshots: Dict[Tuple[str, str], PageSnapshot] = field(default_factory=dict)
+
+    @staticmethod
+    def path_of(url: str) -> str:
+        return urlparse(url).path.rsplit('/', 1)[-1] or "/"
+
+    def record_navigation(self, url: str, village_id: Optional[str] = None):
+        """Tarayıcı veya HTTP ile yapılan her sayfa yüklemesinden sonra çağrılır."""
+        self.current_path = self.path_of(url)
+        newdid_match = re.search(r'[?&]newdid=(\d+)', url)
+        # newdid sunucudaki aktif köyü değiştirir; URL'de yoksa önceki seçim geçerliliğini korur
+        if village_id or newdid_match:
+            self.active_village_id = village_id or newdid_match.group(1)
+        self.last_load_time = time.time()
+
+    def is_on(self, path: str, village_id: Optional[str] = None) -> bool:
+        """Tarayıcı şu an `path` sayfasında (ve verildiyse `village_id` köyünde) mı?"""
+        if self.current_path != path:
+            return False
+        return village_id is None or self.active_village_id == village_id
+
+    def store(self, path: str, village_id: str, payload: Dict[str, Any]):
+        self._snapshots[(path, village_id)] = PageSnapshot(payload=payload, loaded_at=time.time())
+
+    def get_fresh(self, path: str, village_id: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """`max_age` (varsayılan: self.max_age) içindeki anlık görüntüyü döndürür, yoksa None."""
+        snapshot = self._snapshots.get((path, village_id))
+        if not snapshot:
+            return None
+        age = time.time() - snapshot.loaded_at
+        if age > (self.max_age if max_age is None else max_age):
+            return None
+        logger.debug(f"{path} (köy {village_id}) için {age:.1f} sn'lik önbellekteki anlık görüntü kullanılıyor.")
+        return snapshot.payload
+
+    def invalidate(self, village_id: Optional[str] = None, path: Optional[str] = None):
+        """Bir eylemden (yükseltme, eğitim, yağma) sonra etkilenen anlık görüntüleri düşürür. Argümansız çağrı hepsini siler."""
+        for key in [k for k in self._snapshots if (village_id is None or k[1] == village_id) and (path is None or k[0] == path)]:
+            del self._snapshots[key]
+
+    def reset(self):
+        self.current_path = None
+        self.active_village_id = None
+        self.last_load_time = 0.0
+        self._snapshots.clear()
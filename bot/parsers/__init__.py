@@ -0,0 +1,15 @@
+# --- travian_bot_project/bot/parsers/__init__.py ---
+# Tarayıcıdan bağımsız HTML ayrıştırıcıları. Ham HTML'i (HTTP hızlı yolu veya kayıtlı sayfalar)
+# TravianClient'ın sayfa içi çıkarma betikleriyle aynı yük (payload) biçimine, oradan da
+# game_state nesnelerine (Village, Building, Troop, HeroStatus) çevirir.
+from .payload import extract_dorf1_payload, extract_dorf2_payload, extract_hero_payload, extract_village_list_payload, extract_map_position
+from .pages import (
+    clean_text_for_int, safe_int, safe_int_from_payload, apply_resources_to_village, apply_village_payloads,
+    parse_resources_payload, parse_resource_fields_payload, parse_village_center_payload,
+    parse_building_queue_payload, parse_troops_payload, parse_hero_payload, parse_village_list_payload,
+    parse_resources, parse_resource_fields, parse_building_queue, parse_troops, parse_village_center,
+    parse_hero, parse_village_list, parse_map_position, parse_village,
+)
+from .rally_point import (
+    RallyForm, extract_rally_send_form, extract_rally_confirm_form, extract_rally_error, fill_raid_form, parse_raid_result,
+)
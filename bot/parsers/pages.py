@@ -0,0 +1,489 @@
+# --- travian_bot_project/bot/parsers/pages.py ---
+import re
+import json
+import time
+import html
+import logging
+from typing import Optional, List, Dict, Any, Iterable
+from ..game_state import Village, Building, Troop, HeroStatus
+from .payload import extract_dorf1_payload, extract_dorf2_payload, extract_hero_payload, extract_village_list_payload, extract_map_position
+
+logger = logging.getLogger(__name__)
+
+# Travian sayıları yön (bidi) işaretleriyle sarar: '\u202d142\u202c'
+_BIDI_CHARS_RE = re.compile(r'[\u202A-\u202F\u200E\u200F]')
+
+
+def clean_text_for_int(text: Optional[str]) -> str:
+    if not text:
+        return "0"
+    cleaned = text.replace('.', '').replace(',', '')
+    cleaned = _BIDI_CHARS_RE.sub('', cleaned)
+    cleaned = cleaned.replace('\xa0', '').replace('\u2212', '-') # Negatif koordinatlar için unicode eksi işareti
+    return cleaned.strip()
+
+
+def safe_int(text: Optional[str], resource_name: str = "Değer", default_value: int = 0) -> int:
+    cleaned_text = clean_text_for_int(text)
+    try:
+        if re.fullmatch(r'-?\d+', cleaned_text):
+            return int(cleaned_text)
+        else:
+            logger.debug(f"'{resource_name}' için metin sayısal değil: '{text}'. Varsayılan ({default_value}) kullanılıyor.")
+            return default_value
+    except ValueError:
+        logger.warning(f"'{resource_name}' metinden dönüştürülemedi. Değer: '{text}'. Varsayılan ({default_value}) kullanılıyor.")
+        return default_value
+
+
+def safe_int_from_payload(raw_value: Optional[str], resource_name: str, default_value: int = 0) -> int:
+    """Sayfa yükünden gelen ham metni tamsayıya çevirir; eleman sayfada yoksa (None) varsayılanı döndürür."""
+    if raw_value is None:
+        logger.debug(f"'{resource_name}' için element bulunamadı. Varsayılan ({default_value}) kullanılıyor.")
+        return default_value
+    return safe_int(raw_value, resource_name, default_value)
+
+
+def _percent_from_title(title: Optional[str]) -> int:
+    """'Sağlık: 51%' veya çift kodlanmış 'Tecrübe &#x202d;59&#x202c;&#37;' başlığından yüzdeyi okur (yön işaretleri atılır)."""
+    if not title:
+        return 0
+    # Bazı başlıklar HTML varlıklarını iki kez kodlar; ikinci kez çözülür
+    text = _BIDI_CHARS_RE.sub('', html.unescape(title))
+    match = re.search(r'(\d+)\s*%', text)
+    return int(match.group(1)) if match else 0
+
+
+def _extract_js_object(script: str, var_name: str) -> Optional[str]:
+    """`var <isim> = {...}` atamasındaki nesne metnini iç içe süslü parantezleri sayarak çıkarır."""
+    match = re.search(r'var\s+' + re.escape(var_name) + r'\s*=\s*\{', script)
+    if not match:
+        return None
+    start = match.end() - 1
+    depth = 0
+    for index in range(start, len(script)):
+        if script[index] == '{':
+            depth += 1
+        elif script[index] == '}':
+            depth -= 1
+            if depth == 0:
+                return script[start:index + 1]
+    return None
+
+
+def _js_to_json_like(js_obj_str: Optional[str]) -> Optional[str]:
+    if not js_obj_str: return None
+    # Add quotes around keys
+    return re.sub(r'([{,]\s*)([a-zA-Z_]\w*)(\s*:)', r'\1"\2"\3', js_obj_str)
+
+
+def parse_resources_payload(payload: Dict[str, Any], village_id: str) -> Dict[str, int]:
+    """dorf1 yükünden kaynak, kapasite, üretim ve nüfus bilgilerini çıkarır."""
+    resources_data = {}
+
+    try:
+        script_content_raw = payload.get("resources_script")
+        if not script_content_raw:
+            logger.warning("Kaynakları içeren JavaScript bloğu bulunamadı.")
+            raise ValueError("Kaynakları içeren JavaScript bloğu bulunamadı.")
+
+        resources_json_str = _extract_js_object(script_content_raw, "resources")
+        if not resources_json_str:
+            logger.warning("JavaScript 'resources' nesnesi bulunamadı.")
+            raise ValueError("JavaScript 'resources' nesnesi bulunamadı veya formatı beklenenden farklı.")
+        max_storage_json_str = _extract_js_object(script_content_raw, "maxStorage")
+        production_json_str = _extract_js_object(script_content_raw, "production")
+
+        js_data_res = json.loads(_js_to_json_like(resources_json_str))
+        # Güncel sürümlerde 'resources' nesnesi production/storage/maxStorage alt nesnelerini içerir
+        js_data_max_storage = json.loads(_js_to_json_like(max_storage_json_str)) if max_storage_json_str else js_data_res.get("maxStorage", {})
+        js_data_prod = json.loads(_js_to_json_like(production_json_str)) if production_json_str else js_data_res.get("production", {})
+        storage_obj = js_data_res.get('storage', js_data_res)
+
+        resources_data['wood'] = safe_int(str(storage_obj.get('l1')), "Odun (JS)")
+        resources_data['clay'] = safe_int(str(storage_obj.get('l2')), "Tuğla (JS)")
+        resources_data['iron'] = safe_int(str(storage_obj.get('l3')), "Demir (JS)")
+        resources_data['crop'] = safe_int(str(storage_obj.get('l4')), "Tahıl (JS)")
+
+        resources_data['warehouse_capacity'] = safe_int(str(js_data_max_storage.get('l1')), "Ambar Kapasitesi (JS)")
+        resources_data['granary_capacity'] = safe_int(str(js_data_max_storage.get('l4')), "Tahıl Ambarı Kapasitesi (JS)")
+
+        resources_data['wood_prod'] = safe_int(str(js_data_prod.get('l1')), "Odun Üretimi (JS)")
+        resources_data['clay_prod'] = safe_int(str(js_data_prod.get('l2')), "Tuğla Üretimi (JS)")
+        resources_data['iron_prod'] = safe_int(str(js_data_prod.get('l3')), "Demir Üretimi (JS)")
+        # l4 net tahıl üretimi, l5 serbest tahıldır (game_state.crop_consumption bu değeri taşır)
+        resources_data['crop_prod'] = safe_int(str(js_data_prod.get('l4')), "Net Tahıl Üretimi (JS)")
+        resources_data['crop_consumption'] = safe_int(str(js_data_prod.get('l5')), "Tahıl Tüketimi / Serbest Tahıl (JS)")
+        resources_data['free_crop'] = resources_data['crop_consumption']
+
+        logger.info(f"Kaynaklar köy {village_id} için JavaScript nesnesinden başarıyla çekildi.")
+
+    except Exception as js_e:
+        logger.warning(f"JavaScript kaynak nesnesi ayrıştırılamadı ({js_e}), HTML elementlerine fallback yapılıyor.")
+        stock = payload.get("stock") or {}
+        resources_data['wood'] = safe_int_from_payload(stock.get("l1"), "Odun (HTML)")
+        resources_data['clay'] = safe_int_from_payload(stock.get("l2"), "Tuğla (HTML)")
+        resources_data['iron'] = safe_int_from_payload(stock.get("l3"), "Demir (HTML)")
+        resources_data['crop'] = safe_int_from_payload(stock.get("l4"), "Tahıl (HTML)")
+
+        resources_data['warehouse_capacity'] = safe_int_from_payload(stock.get("warehouse"), "Ambar Kapasitesi (HTML)", default_value=800)
+        resources_data['granary_capacity'] = safe_int_from_payload(stock.get("granary"), "Tahıl Ambarı Kapasitesi (HTML)", default_value=800)
+
+        production_cells = payload.get("production")
+        if production_cells:
+            for key, cell_text, label in zip(['wood_prod', 'clay_prod', 'iron_prod', 'crop_prod'], production_cells,
+                                             ["Odun Üretimi (HTML)", "Tuğla Üretimi (HTML)", "Demir Üretimi (HTML)", "Net Tahıl Üretimi (HTML)"]):
+                resources_data[key] = safe_int_from_payload(cell_text, label)
+        else: # Fallback for production if table not found
+            logger.warning("Üretim tablosu (table#production) bulunamadı. Üretim değerleri sıfır olarak ayarlanıyor.")
+            for key in ['wood_prod', 'clay_prod', 'iron_prod', 'crop_prod']: resources_data[key] = 0
+
+        # Free crop ("Serbest Tahıl"); game_state.crop_consumption bu değeri taşır.
+        resources_data['free_crop'] = safe_int_from_payload(stock.get("free_crop"), "Serbest Tahıl (HTML)")
+
+    # Population
+    resources_data['population'] = safe_int_from_payload(payload.get("population"), "Nüfus")
+
+    logger.info(f"Son kaynaklar (köy {village_id}): {resources_data}")
+    return resources_data
+
+
+def apply_resources_to_village(village: Village, resources_data: Dict[str, int]):
+    """`parse_resources_payload` çıktısını Village alanlarına aktarır."""
+    if not resources_data:
+        return
+    village.resources_updated_at = time.time()
+    village.resources = {res: resources_data.get(res, village.resources.get(res, 0)) for res in ["wood", "clay", "iron", "crop"]}
+    village.storage_capacity["warehouse"] = resources_data.get("warehouse_capacity", village.storage_capacity["warehouse"])
+    village.storage_capacity["granary"] = resources_data.get("granary_capacity", village.storage_capacity["granary"])
+    village.population = resources_data.get("population", village.population)
+    # "free_crop" (Serbest Tahıl) game_state'teki crop_consumption alanına eşlenir
+    village.crop_consumption = resources_data.get("free_crop", village.crop_consumption)
+    for res in ["wood", "clay", "iron", "crop"]:
+        village.production_rates[res] = resources_data.get(f"{res}_prod", village.production_rates[res]) # crop: net üretim
+
+
+def parse_resource_fields_payload(payload: Dict[str, Any]) -> List[Building]:
+    """dorf1 yükündeki kaynak alanlarını (konum 1-18) Building listesine çevirir."""
+    buildings: List[Building] = []
+    field_entries = payload.get("fields") or []
+    logger.info(f"{len(field_entries)} kaynak alanı elementi bulundu (Selektör: div#resourceFieldContainer a.resourceField[data-aid]).")
+
+    for i, entry in enumerate(field_entries):
+        try:
+            location_id = entry.get("aid")
+            gid = entry.get("gid") # Building type ID
+            title_text = entry.get("title") or ""
+            class_attr = entry.get("class") or ""
+
+            name = f"Kaynak GID {gid}" # Default name
+            level = 0
+
+            # Try to parse name and level from title (e.g., "Woodcutter <span class='level'>Level 2</span>||Upgrade to level 3...")
+            # This parsing is fragile and highly dependent on game localization and HTML structure.
+            title_main_part = title_text.split("||")[0]
+            name_match_html = re.match(r'(.+?)<span class="level">Seviye\s*(\d+)</span>', title_main_part, re.IGNORECASE)
+            name_match_simple = re.match(r'(.+?)\s+Seviye\s*(\d+)', title_main_part, re.IGNORECASE)
+
+            if name_match_html:
+                name = name_match_html.group(1).strip()
+                level = int(name_match_html.group(2))
+            elif name_match_simple:
+                name = name_match_simple.group(1).strip()
+                level = int(name_match_simple.group(2))
+            elif title_main_part and "Seviye" not in title_main_part : # e.g. "Woodcutter" (level 0 or not shown)
+                name = title_main_part.strip()
+                level = 0 # Assume 0 if not specified in title and no level class found later
+
+            # Override or confirm level from class attribute (e.g., class="... level5 ...")
+            level_class_match = re.search(r'\blevel(\d+)\b', class_attr)
+            if level_class_match:
+                level_from_class = int(level_class_match.group(1))
+                if level_from_class > level : # Prefer higher level if discrepancy, or if title parsing failed
+                    level = level_from_class
+                if name == f"Kaynak GID {gid}" and title_main_part: # if name parsing failed but title exists
+                    name = title_main_part.split("<span")[0].strip() or f"Kaynak GID {gid} L{level}"
+
+
+            # Basic check if it's a known building type or just an empty plot to be built
+            if name == f"Kaynak GID {gid}" and gid == "0": # GID 0 is often an empty plot
+                name = "Boş Alan (Kaynak)"
+
+            is_under_construction = "underConstruction" in class_attr
+
+            if location_id: # Must have location_id
+                 buildings.append(Building(name=name, level=level, location_id=location_id, gid=gid))
+                 logger.debug(f"Kaynak alanı eklendi: Name='{name}', Level={level}, LocID='{location_id}', GID='{gid}', UnderConstruction={is_under_construction}")
+            else:
+                logger.warning(f"Kaynak alanı atlanıyor (konum ID yok): title='{title_text}', class='{class_attr}'")
+        except Exception as field_e:
+            logger.debug(f"Kaynak alanı (index {i}) ayrıştırılamadı: {field_e}. Veri: {entry}")
+
+    logger.info(f"{len(buildings)} kaynak alanı binası çekildi.")
+    return buildings
+
+
+def parse_village_center_payload(payload: Dict[str, Any]) -> List[Building]:
+    """dorf2 yükündeki köy merkezi binalarını (konum 19+) Building listesine çevirir."""
+    buildings: List[Building] = []
+    slot_entries = payload.get("slots") or []
+    logger.info(f"dorf2'de {len(slot_entries)} potansiyel bina slotu/alanı bulundu.")
+
+    for i, entry in enumerate(slot_entries):
+        try:
+            gid = entry.get("gid")
+            if not gid or gid == "0": # Skip empty slots
+                continue
+
+            # Name from data-name, title attribute (e.g., "Main Building Level 1") or alt attribute for map areas
+            name_from_title_attr = entry.get("title") or ""
+            name = name_from_title_attr.split(" Seviye")[0].strip() if " Seviye" in name_from_title_attr else name_from_title_attr.strip()
+            if entry.get("name"): name = entry["name"].strip()
+            if not name: name = f"Bina GID {gid}"
+
+
+            level = 0
+            # Level from label layer text or class
+            level_text_from_label = (entry.get("label") or "").strip()
+            if level_text_from_label:
+                level = safe_int(level_text_from_label, name + " Seviyesi", default_value=0) # default 0
+
+            # Level from class (e.g. levelX)
+            class_attr = entry.get("class") or ""
+            level_class_match = re.search(r'\blevel(\d+)\b', class_attr)
+            if level_class_match:
+                level_from_class = int(level_class_match.group(1))
+                if level_from_class > level: level = level_from_class
+
+            if level == 0 and "Seviye" in name_from_title_attr: # Try parsing from title if other methods yield 0
+                level_match_title = re.search(r'Seviye\s*(\d+)', name_from_title_attr)
+                if level_match_title: level = int(level_match_title.group(1))
+
+
+            # location_id from class (aXX) or from 'href' (build.php?id=XX) for map areas
+            location_id = None
+            loc_id_match_class = re.search(r'\ba(\d+)\b', class_attr) # e.g. "a19" for slot 19
+            if loc_id_match_class:
+                location_id = loc_id_match_class.group(1)
+
+            if not location_id:
+                href_attr = entry.get("href")
+                if href_attr:
+                    loc_id_match_href = re.search(r'[?&]id=(\d+)', href_attr)
+                    if loc_id_match_href:
+                        location_id = loc_id_match_href.group(1)
+
+            if not location_id:
+                logger.warning(f"{name} (GID: {gid}) için konum ID'si bulunamadı, atlanıyor. Class: '{class_attr}', Title: '{name_from_title_attr}'")
+                continue
+
+            buildings.append(Building(name=name, level=level, gid=gid, location_id=location_id))
+            logger.debug(f"Köy merkezi binası eklendi: Name='{name}', Level={level}, LocID='{location_id}', GID='{gid}'")
+
+        except Exception as building_e:
+            logger.debug(f"Köy binası slotu (index {i}, GID: {entry.get('gid')}) ayrıştırılamadı: {building_e}")
+    return buildings
+
+
+def parse_building_queue_payload(payload: Dict[str, Any], village_id: str) -> List[Building]:
+    """dorf1 yükündeki inşaat kuyruğunu Building listesine çevirir."""
+    queue: List[Building] = []
+    queue_entries = payload.get("queue") or []
+    logger.info(f"{len(queue_entries)} inşaat kuyruğu öğesi bulundu (köy {village_id}).")
+
+    for i, entry in enumerate(queue_entries):
+        try:
+            if not entry.get("name") or not entry.get("timer"):
+                logger.debug(f"Kuyruk öğesi {i} için isim/zamanlayıcı bulunamadı veya görünür değil.")
+                continue
+
+            name_level_text = entry["name"].strip()
+            duration_seconds = safe_int(entry["timer"], "Kuyruk Süresi")
+
+            match = re.match(r'(.+?)\s+Seviye\s+(\d+)', name_level_text, re.IGNORECASE)
+            if match:
+                name = match.group(1).strip()
+                level_being_built = int(match.group(2)) # This is the level it will become
+                queue.append(Building(name=name, level=level_being_built, build_time_remaining=duration_seconds))
+            else:
+                logger.warning(f"Kuyruk öğesi metni anlaşılamadı: '{name_level_text}'")
+
+        except Exception as item_e:
+            logger.warning(f"Kuyruk öğesi (index {i}) ayrıştırılırken hata: {item_e}")
+    return queue
+
+
+def parse_troops_payload(payload: Dict[str, Any], village_id: str) -> List[Troop]:
+    """dorf1 yükündeki asker satırlarını Troop listesine çevirir."""
+    troops_list: List[Troop] = []
+    troop_rows = payload.get("troops") or []
+    count = len(troop_rows)
+    logger.info(f"{count} potansiyel asker satırı bulundu (köy {village_id}).")
+
+    if count == 0: # No table rows found
+         logger.info(f"Köyde {village_id} asker tablosu bulunamadı veya boş.")
+         return []
+
+    # Check for "no troops" message if the table itself has a specific class or text
+    first_row_text_lc = (troop_rows[0].get("text") or "").lower()
+    if "hazır yok" in first_row_text_lc or "no troops" in first_row_text_lc :
+         if count == 1 : # Only one row and it says "no troops"
+            logger.info(f"Köyde {village_id} asker bulunmuyor (mesaj: '{first_row_text_lc}').")
+            return []
+
+
+    for i, row in enumerate(troop_rows):
+        try:
+            # img: td.ico img.unit OR td:first-child img.unit OR .uniticon img; count: td.num OR td.un OR .troop
+            if row.get("has_img") and row.get("count") is not None:
+                type_name = row.get("alt") or row.get("title")
+                if not type_name:
+                    class_attr = row.get("class") or ""
+                    match_class_troop = re.search(r'\bu(\d+)\b', class_attr) # e.g. u1, u11, u21 for Romans
+                    if match_class_troop: type_name = f"Birim u{match_class_troop.group(1)}"
+
+                count_str = row["count"]
+                count_val = safe_int(count_str, type_name or f"Asker Satırı {i}")
+
+                if type_name and count_val > 0:
+                    troops_list.append(Troop(type_name=type_name, count=count_val))
+                    logger.debug(f"Bulunan asker: {type_name}, Sayı: {count_val}")
+                elif type_name and count_val == 0 and not ("hazır yok" in count_str.lower() or "no troops" in count_str.lower()):
+                    logger.debug(f"Asker tipi '{type_name}' mevcut ama sayısı 0.")
+                elif not type_name and count_val > 0 :
+                     logger.warning(f"Asker sayısı {count_val} bulundu ama tipi belirlenemedi. Satır: {row.get('text')}")
+
+
+        except Exception as troop_row_e:
+            logger.debug(f"Asker satırı (index {i}) ayrıştırılırken hata: {troop_row_e}. Satır içeriği: {row.get('text')}")
+    return troops_list
+
+
+def parse_hero_payload(payload: Dict[str, Any]) -> HeroStatus:
+    """Kahraman yükünü HeroStatus nesnesine çevirir."""
+    health = _percent_from_title(payload.get("health"))
+    experience = _percent_from_title(payload.get("experience"))
+
+    # Status: metin ("Home", "Adventure", ...) veya üst çubuktaki durum ikonu sınıfı (heroHome, heroRunning, ...)
+    status = "Bilinmiyor"
+    status_text = payload.get("status")
+    if status_text:
+         status_text_raw = status_text.lower()
+         if "evde" in status_text_raw or "köyde" in status_text_raw or "home" in status_text_raw: status = "Evde"
+         elif "macera" in status_text_raw or "adventure" in status_text_raw: status = "Macerada"
+         elif "yolda" in status_text_raw or "returning" in status_text_raw or "outgoing" in status_text_raw or "running" in status_text_raw: status = "Yolda"
+         else: status = status_text.strip() # Use raw if not recognized
+
+    # Adventure available: sidebar/top bar button (not disabled) or adventure links on the hero page
+    adventure_available = False
+    adventure_button_class = payload.get("adventure_button_class")
+    if adventure_button_class is not None and "disable" not in adventure_button_class:
+        adventure_available = True
+    elif payload.get("on_hero_page") and payload.get("adventure_link_count", 0) > 0:
+        adventure_available = True
+
+    return HeroStatus(health=health, experience=experience, status=status, adventure_available=adventure_available)
+
+
+def parse_village_list_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Kenar çubuğundaki köy listesini [{id, name, coordinates, active}] biçimine çevirir."""
+    villages = []
+    for entry in payload.get("villages") or []:
+        if not entry.get("did"):
+            continue
+        coordinates = None
+        x_match = re.search(r'-?\d+', clean_text_for_int(entry.get("x")))
+        y_match = re.search(r'-?\d+', clean_text_for_int(entry.get("y")))
+        if x_match and y_match:
+            coordinates = {"x": int(x_match.group(0)), "y": int(y_match.group(0))}
+        villages.append({
+            "id": entry["did"],
+            "name": (entry.get("name") or "").strip() or f"Köy {entry['did']}",
+            "coordinates": coordinates,
+            "active": bool(entry.get("active")),
+        })
+    return villages
+
+
+def _is_center_slot(building: Building) -> bool:
+    return bool(building.location_id and building.location_id.isdigit() and int(building.location_id) > 18)
+
+
+def apply_village_payloads(village: Village, aspects: Iterable[str], dorf1_payload: Optional[Dict[str, Any]] = None,
+                           dorf2_payload: Optional[Dict[str, Any]] = None):
+    """
+    İstenen durum parçalarını (bkz. dirty_state.VILLAGE_ASPECTS) dorf1/dorf2 yüklerinden Village'a aktarır.
+    Yükü verilmeyen sayfanın parçalarına ve istenmeyen parçalara dokunulmaz (örn. "fields" köy merkezini korur).
+    """
+    aspects = set(aspects)
+    if dorf1_payload is not None:
+        if "resources" in aspects:
+            apply_resources_to_village(village, parse_resources_payload(dorf1_payload, village.id))
+        if "fields" in aspects:
+            village.buildings = parse_resource_fields_payload(dorf1_payload) + [b for b in village.buildings if _is_center_slot(b)]
+        if "queue" in aspects:
+            village.building_queue = parse_building_queue_payload(dorf1_payload, village.id)
+        if "troops" in aspects:
+            village.troops_home = parse_troops_payload(dorf1_payload, village.id)
+    if dorf2_payload is not None and "center" in aspects:
+        village.buildings = [b for b in village.buildings if not _is_center_slot(b)] + parse_village_center_payload(dorf2_payload)
+
+
+# --- Ham HTML alan kolaylık fonksiyonları (HTTP hızlı yolu, kayıtlı sayfalar, ölçümler) ---
+
+def parse_resources(dorf1_html: str, village_id: str = "?") -> Dict[str, int]:
+    return parse_resources_payload(extract_dorf1_payload(dorf1_html), village_id)
+
+
+def parse_resource_fields(dorf1_html: str) -> List[Building]:
+    return parse_resource_fields_payload(extract_dorf1_payload(dorf1_html))
+
+
+def parse_building_queue(dorf1_html: str, village_id: str = "?") -> List[Building]:
+    return parse_building_queue_payload(extract_dorf1_payload(dorf1_html), village_id)
+
+
+def parse_troops(dorf1_html: str, village_id: str = "?") -> List[Troop]:
+    return parse_troops_payload(extract_dorf1_payload(dorf1_html), village_id)
+
+
+def parse_village_center(dorf2_html: str) -> List[Building]:
+    return parse_village_center_payload(extract_dorf2_payload(dorf2_html))
+
+
+def parse_hero(page_html: str) -> HeroStatus:
+    return parse_hero_payload(extract_hero_payload(page_html))
+
+
+def parse_village_list(page_html: str) -> List[Dict[str, Any]]:
+    return parse_village_list_payload(extract_village_list_payload(page_html))
+
+
+def parse_map_position(map_html: str) -> Optional[Dict[str, int]]:
+    """Harita sayfasının (karte.php) başlangıç merkez koordinatlarını döndürür. Kareler sayfada değil, API ile yüklenir."""
+    return extract_map_position(map_html)
+
+
+def parse_village(dorf1_html: str, dorf2_html: Optional[str] = None, village_id: Optional[str] = None) -> Optional[Village]:
+    """
+    dorf1 (ve varsa dorf2) HTML'inden eksiksiz bir Village oluşturur. Köy ID'si verilmezse kenar çubuğundaki
+    aktif köyden alınır; isim ve koordinatlar da oradan okunur.
+    """
+    dorf1_payload = extract_dorf1_payload(dorf1_html)
+    village_list_payload = extract_village_list_payload(dorf1_html)
+    village_list = parse_village_list_payload(village_list_payload)
+    active_entry = next((v for v in village_list if (v["id"] == village_id if village_id else v["active"])), None)
+    village_id = village_id or (active_entry["id"] if active_entry else None)
+    if not village_id:
+        logger.error("Köy ID'si verilmedi ve sayfada aktif köy bulunamadı.")
+        return None
+
+    village = Village(name=village_list_payload.get("active_name") or (active_entry["name"] if active_entry else f"Köy {village_id}"),
+                      id=village_id, coordinates=active_entry["coordinates"] if active_entry else None)
+    apply_resources_to_village(village, parse_resources_payload(dorf1_payload, village_id))
+    village.buildings = parse_resource_fields_payload(dorf1_payload)
+    if dorf2_html:
+        village.buildings += parse_village_center(dorf2_html)
+    village.building_queue = parse_building_queue_payload(dorf1_payload, village_id)
+    village.troops_home = parse_troops_payload(dorf1_payload, village_id)
+    return village
@@ -0,0 +1,179 @@
+# --- travian_bot_project/bot/parsers/payload.py ---
+import re
+import logging
+from typing import Optional, Dict, Any
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+logger = logging.getLogger(__name__)
+
+# Seçiciler bot/page_scripts.py içindeki DORF1_EXTRACT_JS / DORF2_EXTRACT_JS / HERO_EXTRACT_JS ile birebir aynıdır.
+# Modül yüklenirken bir kez derlenir; her sayfada yeniden XPath'e çevrilmez.
+_SEL = {name: CSSSelector(selector) for name, selector in {
+    "script": "script",
+    "l1": "div#l1.value, span#l1",
+    "l2": "div#l2.value, span#l2",
+    "l3": "div#l3.value, span#l3",
+    "l4": "div#l4.value, span#l4",
+    "warehouse": "div#stockBar div.warehouse div.capacity div.value, #stockBarWarehouse .capacity",
+    "granary": "div#stockBar div.granary div.capacity div.value, #stockBarGranary .capacity",
+    "free_crop": "#stockBarFreeCrop span.value, span#stockBarFreeCrop, div#stockBarFreeCrop.value",
+    "production_table": "table#production",
+    "production_rows": "table#production tbody tr",
+    "num_cell": "td.num",
+    "population": "div#sidebarBoxActiveVillage div.population span, span.population-value",
+    "fields": "div#resourceFieldContainer a.resourceField[data-aid]",
+    "queue_items": "div.buildingList ul li",
+    "queue_name": "div.name",
+    "queue_timer": "span.timer[data-value], span.timer[value]",
+    "troop_rows": "div#villageInfoboxRightContent table#troops tbody tr, div.villageInfobox.units table#troops tbody tr, table.troop_details tbody tr",
+    "troop_img": "td.ico img.unit, td:first-child img.unit, .uniticon img",
+    "troop_count": "td.num, td.un, .troop",
+    "slots": "div#villageContent div.buildingSlot[data-gid], map#map2 area[gid]",
+    "label_layer": "div.labelLayer",
+    "hero_health": "div.health svg title, .heroDashboardGeneral #health tooltip, .healthPath title, #topBarHero svg.health path.title title",
+    "hero_experience": "div.experience svg title, .heroDashboardGeneral #experience tooltip, .experiencePath title, #topBarHero svg.experience path.title title",
+    "hero_status": ".heroStatus div.text, .heroStatusMessage, #heroStatus div.movements div.text",
+    "hero_status_icon": "#topBarHero div.heroStatus a i",
+    "hero_adventure_button": "div#sidebarBoxHero div.layoutButton.adventureWhite, #topBarHero a.layoutButton.adventure",
+    "hero_adventure_links": "a[href*='hero/adventures'], .adventureListAvailable .adventureSlot",
+    "active_village_name": "div#sidebarBoxActiveVillage div#villageName input.villageInput",
+    "village_entries": "div#sidebarBoxVillageList div.listEntry.village[data-did]",
+    "village_entry_name": "span.name",
+    "coordinate_x": "span.coordinateX",
+    "coordinate_y": "span.coordinateY",
+}.items()}
+
+
+def _parse_document(page_html: str):
+    return lxml_html.fromstring(page_html)
+
+
+def _first(root, name: str):
+    matches = _SEL[name](root)
+    return matches[0] if matches else None
+
+
+def _icon_class(element) -> Optional[str]:
+    """Üst çubuktaki kahraman durum ikonunun sınıfını (ör. 'heroHome') döndürür."""
+    if element is None:
+        return None
+    return (element.get("class") or "").strip() or None
+
+
+def _text(element) -> Optional[str]:
+    """innerText'e yakın davranır: boşlukları tek boşluğa indirger. Eleman yoksa None döner."""
+    if element is None:
+        return None
+    return " ".join(element.text_content().split())
+
+
+def extract_dorf1_payload(page_html: str) -> Dict[str, Any]:
+    """dorf1 HTML'inden `page_scripts.DORF1_EXTRACT_JS` ile aynı yapıda bir yük üretir."""
+    root = _parse_document(page_html)
+
+    resources_script = None
+    for script in _SEL["script"](root):
+        content = script.text_content() or ""
+        if "var resources = {" in content and "maxStorage" in content and "production" in content:
+            resources_script = content
+            break
+
+    production = None
+    if _first(root, "production_table") is not None:
+        rows = _SEL["production_rows"](root)
+        production = [_text(_first(rows[i], "num_cell")) if i < len(rows) else None for i in range(4)]
+
+    fields = [{
+        "aid": el.get("data-aid"),
+        "gid": el.get("data-gid"),
+        "title": el.get("title") or "",
+        "class": el.get("class") or "",
+    } for el in _SEL["fields"](root)]
+
+    queue = []
+    for li in _SEL["queue_items"](root):
+        timer = _first(li, "queue_timer")
+        queue.append({
+            "name": _text(_first(li, "queue_name")),
+            "timer": (timer.get("data-value") or timer.get("value")) if timer is not None else None,
+        })
+
+    troops = []
+    for row in _SEL["troop_rows"](root):
+        img = _first(row, "troop_img")
+        troops.append({
+            "has_img": img is not None,
+            "alt": img.get("alt") if img is not None else None,
+            "title": img.get("title") if img is not None else None,
+            "class": (img.get("class") or "") if img is not None else "",
+            "count": _text(_first(row, "troop_count")),
+            "text": _text(row),
+        })
+
+    return {
+        "resources_script": resources_script,
+        "stock": {key: _text(_first(root, key)) for key in ("l1", "l2", "l3", "l4", "warehouse", "granary", "free_crop")},
+        "production": production,
+        "population": _text(_first(root, "population")),
+        "fields": fields,
+        "queue": queue,
+        "troops": troops,
+    }
+
+
+def extract_dorf2_payload(page_html: str) -> Dict[str, Any]:
+    """dorf2 HTML'inden `page_scripts.DORF2_EXTRACT_JS` ile aynı yapıda bir yük üretir."""
+    root = _parse_document(page_html)
+    slots = []
+    for el in _SEL["slots"](root):
+        slots.append({
+            "gid": el.get("data-gid"),
+            "name": el.get("data-name") or "",
+            "title": el.get("data-title") or el.get("title") or el.get("alt") or "",
+            "label": _text(_first(el, "label_layer")),
+            "class": el.get("class") or "",
+            "href": el.get("href"),
+        })
+    return {"slots": slots}
+
+
+def extract_hero_payload(page_html: str) -> Dict[str, Any]:
+    """/hero HTML'inden `page_scripts.HERO_EXTRACT_JS` ile aynı yapıda bir yük üretir."""
+    root = _parse_document(page_html)
+    adventure_button = _first(root, "hero_adventure_button")
+    return {
+        "health": _text(_first(root, "hero_health")),
+        "experience": _text(_first(root, "hero_experience")),
+        "status": _text(_first(root, "hero_status")) or _icon_class(_first(root, "hero_status_icon")),
+        "adventure_button_class": (adventure_button.get("class") or "") if adventure_button is not None else None,
+        "adventure_link_count": len(_SEL["hero_adventure_links"](root)),
+        "on_hero_page": True,
+    }
+
+
+def extract_village_list_payload(page_html: str) -> Dict[str, Any]:
+    """Her oyun sayfasındaki kenar çubuğundan aktif köy adını ve köy listesini çıkarır."""
+    root = _parse_document(page_html)
+    name_input = _first(root, "active_village_name")
+    villages = []
+    for entry in _SEL["village_entries"](root):
+        villages.append({
+            "did": entry.get("data-did"),
+            "name": _text(_first(entry, "village_entry_name")),
+            "x": _text(_first(entry, "coordinate_x")),
+            "y": _text(_first(entry, "coordinate_y")),
+            "active": "active" in (entry.get("class") or "").split(),
+        })
+    return {
+        "active_name": (name_input.get("value") or "").strip() if name_input is not None else None,
+        "villages": villages,
+    }
+
+
+def extract_map_position(page_html: str) -> Optional[Dict[str, int]]:
+    """karte.php içindeki `mapInitialPosition: {x: .., y: ..}` değerini okur."""
+    match = re.search(r'mapInitialPosition\s*:\s*\{\s*x\s*:\s*(-?\d+)\s*,\s*y\s*:\s*(-?\d+)', page_html)
+    if not match:
+        return None
+    return {"x": int(match.group(1)), "y": int(match.group(2))}
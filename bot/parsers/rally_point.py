@@ -0,0 +1,106 @@
+# --- travian_bot_project/bot/parsers/rally_point.py ---
+# Askeri üs (build.php?gid=16&tt=2) gönderme ve onay formları. Form alanları (gizli zaman damgası/kontrol
+# değerleri dahil) tarayıcıya gerek kalmadan okunur; HTTP hızlı yolu bu alanlarla formları doğrudan gönderir.
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from lxml.cssselect import CSSSelector
+
+from .payload import _parse_document, _text
+from ..units import tribe_from_unit_class
+
+logger = logging.getLogger(__name__)
+
+RAID_EVENT_TYPE = "4" # 2: destek, 3: normal saldırı, 4: yağma
+
+_FORMS = CSSSelector("form")
+_INPUTS = CSSSelector("input[name], select[name], button[name]")
+_UNIT_IMAGES = CSSSelector("img.unit")
+_ERROR = CSSSelector("p.error, div.error, span.error, .alert.error")
+_TROOP_FIELD_RE = re.compile(r'^(?:troop\[)?(t\d{1,2})\]?$')
+
+
+@dataclass
+class RallyForm:
+    action: str
+    fields: Dict[str, str] = field(default_factory=dict)
+    tribe: Optional[str] = None # Formdaki birim resimlerinden (u<N>) çıkarılır
+
+    def troop_field_name(self, unit_field: str) -> Optional[str]:
+        """'t3' -> formdaki adı ('t3' veya 'troop[t3]')."""
+        for name in (f"troop[{unit_field}]", unit_field):
+            if name in self.fields:
+                return name
+        return None
+
+
+def _read_form(form) -> RallyForm:
+    fields: Dict[str, str] = {}
+    for element in _INPUTS(form):
+        input_type = (element.get("type") or "").lower()
+        if input_type in ("checkbox", "radio") and element.get("checked") is None:
+            continue
+        if element.tag == "select":
+            selected = element.xpath(".//option[@selected]") or element.xpath(".//option")
+            fields[element.get("name")] = selected[0].get("value", "") if selected else ""
+        else:
+            fields[element.get("name")] = element.get("value", "")
+    tribe = next((t for t in (tribe_from_unit_class(img.get("class") or "") for img in _UNIT_IMAGES(form)) if t), None)
+    return RallyForm(action=form.get("action") or "build.php?gid=16&tt=2", fields=fields, tribe=tribe)
+
+
+def extract_rally_send_form(page_html: str) -> Optional[RallyForm]:
+    """Asker gönderme formu: birim alanları (t1../troop[t1]..) ve koordinat alanları olan form."""
+    for form in _FORMS(_parse_document(page_html)):
+        rally_form = _read_form(form)
+        has_troops = any(_TROOP_FIELD_RE.match(name) for name in rally_form.fields)
+        has_coords = any(name in rally_form.fields for name in ("x", "troop[x]", "xCoordInput"))
+        if has_troops and has_coords and "a" not in rally_form.fields:
+            return rally_form
+    return None
+
+
+def extract_rally_confirm_form(page_html: str) -> Optional[RallyForm]:
+    """Onay formu: sunucunun ürettiği 'a' (onay anahtarı) veya 'sendReally' alanını taşıyan form."""
+    for form in _FORMS(_parse_document(page_html)):
+        rally_form = _read_form(form)
+        if "a" in rally_form.fields or "sendReally" in rally_form.fields:
+            return rally_form
+    return None
+
+
+def extract_rally_error(page_html: str) -> Optional[str]:
+    errors = [_text(element) for element in _ERROR(_parse_document(page_html))]
+    return next((e.strip() for e in errors if e and e.strip()), None)
+
+
+def fill_raid_form(form: RallyForm, target_coords: Dict[str, int], units: Dict[str, int]) -> Dict[str, str]:
+    """Gönderme formunu yağma olarak doldurur: seçilmeyen birimler boşaltılır, koordinatlar ve olay türü yazılır."""
+    fields = dict(form.fields)
+    for name in fields:
+        if _TROOP_FIELD_RE.match(name):
+            fields[name] = ""
+    for unit_field, count in units.items():
+        name = form.troop_field_name(unit_field)
+        if name:
+            fields[name] = str(count)
+    for axis in ("x", "y"):
+        for name in (axis, f"troop[{axis}]"):
+            if name in fields or name == axis:
+                fields[name] = str(target_coords[axis])
+    fields["eventType" if "eventType" in fields or "c" not in fields else "c"] = RAID_EVENT_TYPE
+    return fields
+
+
+def parse_raid_result(page_html: str, final_url: str) -> Tuple[bool, Optional[str]]:
+    """
+    Onay gönderiminin sonucu: başarıda sunucu askeri üs genel bakışına (tt=1) yönlendirir ve onay formu
+    tekrar görünmez. Hata varsa sayfadaki hata metni döner.
+    """
+    error = extract_rally_error(page_html)
+    if error:
+        return False, error
+    if "tt=1" in final_url or extract_rally_confirm_form(page_html) is None and extract_rally_send_form(page_html) is None:
+        return True, None
+    return False, "onay sonrası beklenmeyen sayfa"
@@ -0,0 +1,139 @@
+# --- travian_bot_project/bot/raid_dispatcher.py ---
+import time
+import random
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .game_state import Village
+from .troop_ledger import Reservation
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class PendingRaid:
+    farm_target: Dict[str, Any]
+    source_village: Village
+    troops: Dict[str, int]
+    reservation: Optional[Reservation] = None # Kuyruktayken askerler başka hedeflere verilmesin
+    enqueued_at: float = field(default_factory=time.time)
+
+    @property
+    def key(self) -> Tuple[int, int]:
+        return raid_key(self.farm_target)
+
+
+def raid_key(farm_target: Dict[str, Any]) -> Tuple[int, int]:
+    """Kuyrukta hedef başına tek yağma: hedef koordinatları (yağma listesinde tekildir)."""
+    coords = farm_target["target_coords"]
+    return int(coords["x"]), int(coords["y"])
+
+
+class RaidDispatcher:
+    """
+    Tek tek gönderilen yağmaların tempolu kuyruğu. Yağma döngüsü uygun hedefleri `enqueue` ile ekleyip hemen döner;
+    motor `next_send_time` zamanında uyanır, `pop_due` ile tek yağmayı alıp gönderir ve sonucu `record` ile bildirir.
+    Gönderimler arası `min_interval` + [0, `jitter`] sn beklenir; kuyruk `max_backlog` ile sınırlıdır ve
+    `max_wait` sn'den uzun bekleyen yağmalar (askerler ve hedef artık değişmiş olabilir) gönderilmeden düşürülür.
+    """
+    def __init__(self, min_interval: float = 10.0, jitter: float = 10.0, max_backlog: int = 50, max_wait: float = 15 * 60):
+        self.min_interval = max(0.0, min_interval)
+        self.jitter = max(0.0, jitter)
+        self.max_backlog = max(1, max_backlog)
+        self.max_wait = max_wait
+        self._queue: Deque[PendingRaid] = deque()
+        self._queued_keys: Dict[Tuple[int, int], PendingRaid] = {}
+        self._next_send_at = 0.0
+        self._sent_times: Deque[float] = deque() # Son bir saatteki gönderimler (saatlik hız için)
+        self.on_drop: Optional[Callable[[PendingRaid], None]] = None # Gönderilmeden düşürülen yağma (hedef yeniden kuyruğa alınabilir)
+        self.sent = 0
+        self.failed = 0
+        self.rejected = 0 # Kuyruk doluyken eklenemeyenler
+        self.expired = 0
+
+    def configure(self, interval: Optional[float] = None, max_backlog: Optional[int] = None):
+        """
+        Ortalama gönderim aralığını (sn) ve kuyruk sınırını ayarlar. Her aralık [`interval`/2, 3*`interval`/2]
+        içinde düzgün dağılımla seçilir (`min_interval` = `interval`/2, `jitter` = `interval`); ortalaması `interval`dır.
+        """
+        if interval is not None:
+            interval = max(0.0, interval)
+            self.min_interval, self.jitter = interval / 2, interval
+        if max_backlog is not None:
+            self.max_backlog = max(1, max_backlog)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def is_full(self) -> bool:
+        return len(self._queue) >= self.max_backlog
+
+    def is_queued(self, farm_target: Dict[str, Any]) -> bool:
+        return raid_key(farm_target) in self._queued_keys
+
+    def enqueue(self, farm_target: Dict[str, Any], source_village: Village, troops: Dict[str, int], reservation: Optional[Reservation] = None) -> bool:
+        """Yağmayı kuyruğa ekler. Hedef zaten kuyruktaysa veya kuyruk doluysa False."""
+        if self.is_queued(farm_target):
+            return False
+        if self.is_full():
+            self.rejected += 1
+            return False
+        raid = PendingRaid(farm_target, source_village, troops, reservation)
+        self._queue.append(raid)
+        self._queued_keys[raid.key] = raid
+        return True
+
+    def next_send_time(self) -> Optional[float]:
+        """Sıradaki yağmanın gönderilebileceği zaman (kuyruk boşsa None)."""
+        return self._next_send_at if self._queue else None
+
+    def pop_due(self, now: Optional[float] = None) -> Optional[PendingRaid]:
+        """Tempo izin veriyorsa sıradaki yağmayı çıkarır; süresi dolanları atlar. Sonraki gönderim zamanı burada ilerler."""
+        now = time.time() if now is None else now
+        if now < self._next_send_at:
+            return None
+        while self._queue:
+            raid = self._queue.popleft()
+            del self._queued_keys[raid.key]
+            if now - raid.enqueued_at > self.max_wait:
+                self.expired += 1
+                logger.info(f"Yağma {raid.farm_target['target_coords']} kuyrukta çok bekledi ({int(now - raid.enqueued_at)} sn), düşürüldü.")
+                if self.on_drop:
+                    self.on_drop(raid)
+                continue
+            self._next_send_at = now + random.uniform(self.min_interval, self.min_interval + self.jitter)
+            return raid
+        return None
+
+    def record(self, success: bool, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        if success:
+            self.sent += 1
+            self._sent_times.append(now)
+        else:
+            self.failed += 1
+
+    def clear(self) -> List[PendingRaid]:
+        """Yağma listesi değiştiğinde bekleyen yağmalar (eski hedef nesneleri) bırakılır ve döndürülür."""
+        dropped = list(self._queue)
+        self._queue.clear()
+        self._queued_keys.clear()
+        return dropped
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        while self._sent_times and now - self._sent_times[0] > 3600:
+            self._sent_times.popleft()
+        return {
+            "queued": len(self._queue),
+            "oldest_wait": int(now - self._queue[0].enqueued_at) if self._queue else 0,
+            "sent_last_hour": len(self._sent_times),
+            "sent": self.sent, "failed": self.failed, "rejected": self.rejected, "expired": self.expired,
+        }
+
+    def describe(self, now: Optional[float] = None) -> str:
+        s = self.stats(now)
+        return (f"kuyrukta {s['queued']} (en eski {s['oldest_wait']} sn), son 1 saatte {s['sent_last_hour']} gönderim; "
+                f"toplam {s['sent']} başarılı, {s['failed']} başarısız, {s['rejected']} kuyruk dolu, {s['expired']} süresi doldu")
@@ -0,0 +1,89 @@
+# --- travian_bot_project/bot/scheduler.py ---
+import heapq
+import itertools
+import time
+import logging
+from typing import Dict, List, Optional, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+class TimerScheduler:
+    """
+    Zamanlanmış işlerin min-heap'i. Her iş bir anahtarla (örn. "build:34808", "hero_adventure", "farm")
+    tanımlanır; aynı anahtar yeniden zamanlanırsa eski kayıt geçersiz sayılır (tembel silme).
+    BotEngine her yöneticinin bir sonraki uyanma zamanını buraya yazar ve en erken olana kadar uyur.
+    """
+    def __init__(self):
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due_times: Dict[str, float] = {}  # anahtar -> geçerli zaman
+        self._reasons: Dict[str, str] = {}
+        self._counter = itertools.count()
+
+    def schedule(self, key: str, when: float, reason: str = ""):
+        """`key` işini `when` (epoch sn) zamanına kurar; önceki zamanlamanın yerini alır."""
+        self._due_times[key] = when
+        self._reasons[key] = reason
+        heapq.heappush(self._heap, (when, next(self._counter), key))
+        logger.debug(f"Zamanlandı: {key} -> {int(when - time.time())} sn sonra ({reason})")
+
+    def schedule_earliest(self, key: str, when: float, reason: str = ""):
+        """Yalnızca mevcut zamanlamadan daha erkense (veya hiç yoksa) kurar."""
+        current = self._due_times.get(key)
+        if current is None or when < current:
+            self.schedule(key, when, reason)
+
+    def cancel(self, key: str):
+        self._due_times.pop(key, None)
+        self._reasons.pop(key, None)
+
+    def _drop_stale_head(self):
+        while self._heap and self._due_times.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_wake_time(self) -> Optional[float]:
+        self._drop_stale_head()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[str]:
+        """Zamanı gelmiş iş anahtarlarını (zaman sırasıyla) döndürür ve kuyruktan çıkarır."""
+        now = time.time() if now is None else now
+        due = []
+        while True:
+            self._drop_stale_head()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            self._due_times.pop(key, None)
+            self._reasons.pop(key, None)
+            due.append(key)
+        return due
+
+    def wait_until_next(self, should_continue: Callable[[], bool], max_sleep: float) -> float:
+        """
+        En erken işe kadar (en fazla `max_sleep` sn) 1 sn'lik dilimlerle uyur; `should_continue` False dönerse erken çıkar.
+        Uyunan süreyi döndürür.
+        """
+        next_time = self.next_wake_time()
+        sleep_for = max_sleep if next_time is None else max(0.0, min(max_sleep, next_time - time.time()))
+        start = time.time()
+        while should_continue():
+            remaining = sleep_for - (time.time() - start)
+            if remaining <= 0:
+                break
+            time.sleep(min(1.0, remaining))
+        return time.time() - start
+
+    def describe(self) -> List[Tuple[str, int, str]]:
+        """(anahtar, kalan saniye, sebep) listesini en erkenden başlayarak döndürür (loglama için)."""
+        now = time.time()
+        return sorted(((key, int(when - now), self._reasons.get(key, "")) for key, when in self._due_times.items()), key=lambda item: item[1])
+
+    def entries(self) -> List[Tuple[str, float, str]]:
+        """(anahtar, zaman, sebep) listesi; durum anlık görüntüsüne yazılır ve `schedule` ile geri yüklenir."""
+        return [(key, when, self._reasons.get(key, "")) for key, when in self._due_times.items()]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._due_times
+
+    def __len__(self) -> int:
+        return len(self._due_times)
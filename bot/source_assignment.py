@@ -0,0 +1,183 @@
+# --- travian_bot_project/bot/source_assignment.py ---
+# Çok köylü hesaplarda yağma hedeflerinin kaynak köylere dağıtımı. Her hedef, paketindeki baskın birime göre gruplanır;
+# her grup o birimin köylerdeki sayısıyla ayrı bir ulaştırma problemi (minimum maliyetli akış) olarak çözülür.
+# Arz köydeki birim sayısı, talep paketteki birim sayısı, maliyet gidiş-dönüş süresidir.
+import heapq
+import math
+import logging
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def assign_sources(supply: Sequence[int], demand: Sequence[int], cost: Sequence[Sequence[Optional[float]]]) -> List[Optional[int]]:
+    """
+    `cost[i][j]`: hedef j'nin köy i'den yağmalanma maliyeti (gidiş-dönüş süresi); None ise köy i o paketi gönderemez.
+    Karşılanabilen en büyük talebi en az toplam maliyetle dağıtan akış ardışık en kısa yollarla bulunur: her adımda
+    artık arzı olan bir köyden, gerekirse başka köylerin üstlendiği akışı geri iterek, talebi kalan bir hedefe giden
+    en ucuz yol aranır. Yollar yalnızca köyler üzerinden kurulur ve köy potansiyelleriyle Dijkstra kullanılır.
+    Her hedef akışının en büyük kısmını taşıyan köye verilir; akış almayan hedefler None kalır.
+    """
+    m, n = len(supply), len(demand)
+    unit_cost = [[cost[i][j] / demand[j] if cost[i][j] is not None and demand[j] > 0 else None for j in range(n)] for i in range(m)]
+    residual_supply = list(supply)
+    residual_demand = list(demand)
+    flows: List[Dict[int, int]] = [{} for _ in range(m)] # köy -> {hedef: akış}
+    # Her köy için hedefler birim maliyete göre sıralı; talebi biten hedefler işaretçiyle atlanır (talep yalnızca azalır)
+    order = [sorted((j for j in range(n) if unit_cost[i][j] is not None), key=lambda j, i=i: unit_cost[i][j]) for i in range(m)]
+    pointer = [0] * m
+    # i -> k kenarları: i'nin j'ye akışını artırıp k'nin j'deki akışını azaltmak. Her çift için (maliyet, j) min-heap'i;
+    # akışı sıfırlanan j'ler okunurken atlanır (tembel silme)
+    edges: List[List[List[Tuple[float, int]]]] = [[[] for _ in range(m)] for _ in range(m)]
+    potential = [0.0] * m
+    sink_potential = 0.0
+
+    def open_edges(k: int, j: int):
+        for i in range(m):
+            if i != k and unit_cost[i][j] is not None:
+                heapq.heappush(edges[i][k], (unit_cost[i][j] - unit_cost[k][j], j))
+
+    def cheapest_edge(i: int, k: int) -> Optional[Tuple[float, int]]:
+        heap = edges[i][k]
+        while heap and heap[0][1] not in flows[k]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    limit = 10 * (n + m) + 100
+    for _ in range(limit):
+        dist = [-potential[i] if residual_supply[i] > 0 else math.inf for i in range(m)] # İndirgenmiş maliyetlerle
+        pred: List[Optional[Tuple[int, int]]] = [None] * m # köy k'ye hangi (köy i, hedef j) üzerinden gelindi
+        done = [False] * m
+        for _ in range(m):
+            u = min((i for i in range(m) if not done[i]), key=lambda i: dist[i], default=None)
+            if u is None or dist[u] == math.inf:
+                break
+            done[u] = True
+            for k in range(m):
+                if done[k]:
+                    continue
+                edge = cheapest_edge(u, k)
+                if edge is None:
+                    continue
+                candidate = dist[u] + max(0.0, edge[0] + potential[u] - potential[k])
+                if candidate < dist[k] - 1e-12:
+                    dist[k], pred[k] = candidate, (u, edge[1])
+        real = [dist[i] + potential[i] for i in range(m)]
+
+        best = None # (maliyet, köy, hedef)
+        for i in range(m):
+            if real[i] == math.inf:
+                continue
+            while pointer[i] < len(order[i]) and residual_demand[order[i][pointer[i]]] <= 0:
+                pointer[i] += 1
+            if pointer[i] < len(order[i]):
+                j = order[i][pointer[i]]
+                if best is None or real[i] + unit_cost[i][j] < best[0]:
+                    best = (real[i] + unit_cost[i][j], i, j)
+        if best is None:
+            break
+        sink_distance, last_village, target = best
+        potential = [min(real[i], potential[i] + sink_distance - sink_potential) for i in range(m)]
+        sink_potential = sink_distance
+
+        path = [] # (köy i, hedef j, akışı azalan köy k)
+        village = last_village
+        while pred[village] is not None:
+            i, j = pred[village]
+            path.append((i, j, village))
+            village = i
+        amount = min(residual_demand[target], residual_supply[village], *(flows[k][j] for _, j, k in path))
+        if amount <= 0:
+            break
+        for i, j, k in path + [(last_village, target, None)]:
+            if j not in flows[i]:
+                flows[i][j] = 0
+                open_edges(i, j)
+            flows[i][j] += amount
+            if k is not None:
+                flows[k][j] -= amount
+                if not flows[k][j]:
+                    del flows[k][j]
+        residual_supply[village] -= amount
+        residual_demand[target] -= amount
+    else:
+        logger.warning(f"Kaynak köy ataması {limit} adımda tamamlanamadı; {sum(residual_demand)} birimlik talep dağıtılmadan kaldı.")
+
+    assignment: List[Optional[int]] = []
+    for j in range(n):
+        shares = [(flows[i][j], -cost[i][j], i) for i in range(m) if flows[i].get(j, 0) > 0]
+        assignment.append(max(shares)[2] if shares else None)
+    return assignment
+
+
+def _covers(stock: Dict[str, int], package: Dict[str, int]) -> bool:
+    return all(stock.get(key, 0) >= count for key, count in package.items())
+
+
+class SourceAssigner:
+    """
+    Asker paketlerini köylerin birim türü bazındaki stoğunu aşmadan dağıtır. Gruplar büyükten küçüğe çözülür; bir
+    hedefe verilen paketin tüm birimleri köyün kalan stoğundan düşülür, stoğa sığmayan hedefler None kalır.
+    Bir grubun hedefleri, gördüğü stok ve `context` değişmediyse önceki çözümü yeniden kullanılır.
+    """
+    def __init__(self):
+        self._cache: Dict[str, Tuple[tuple, List[Optional[int]]]] = {} # baskın birim -> (imza, hedef başına köy)
+        self.solved_groups = 0
+
+    def clear(self):
+        self._cache.clear()
+
+    def assign(self, stock: Sequence[Dict[str, int]], packages: Sequence[Dict[str, int]], cost: Callable[[int, int], Optional[float]],
+               weight: Optional[Callable[[str], float]] = None, context: Hashable = None) -> List[Optional[int]]:
+        """
+        `stock[i]`: köy i'nin birimleri, `packages[j]`: hedef j'ye gidecek birimler, `cost(i, j)`: gidiş-dönüş süresi
+        (None: gönderilemez). Baskın birim `weight` (örn. taşıma kapasitesi) ile ağırlıklı en büyük paydır.
+        """
+        remaining = [dict(s) for s in stock]
+        groups: Dict[str, List[int]] = {}
+        for j, package in enumerate(packages):
+            if package:
+                dominant = max(package, key=lambda key: (package[key] * (weight(key) if weight else 1), key))
+                groups.setdefault(dominant, []).append(j)
+
+        result: List[Optional[int]] = [None] * len(packages)
+        for unit in sorted(groups, key=lambda u: (-sum(packages[j][u] for j in groups[u]), u)):
+            targets = groups[unit]
+            units = sorted({key for j in targets for key in packages[j]})
+            signature = (context, tuple((j, tuple(sorted(packages[j].items()))) for j in targets),
+                         tuple(tuple(r.get(key, 0) for key in units) for r in remaining))
+            cached = self._cache.get(unit)
+            if cached and cached[0] == signature:
+                chosen = cached[1]
+            else:
+                chosen = self._solve(unit, targets, packages, remaining, cost)
+                self._cache[unit] = (signature, chosen)
+                self.solved_groups += 1
+            for j, i in zip(targets, chosen):
+                if i is not None:
+                    for key, count in packages[j].items():
+                        remaining[i][key] = remaining[i].get(key, 0) - count
+                    result[j] = i
+        self._cache = {unit: entry for unit, entry in self._cache.items() if unit in groups}
+        return result
+
+    @staticmethod
+    def _solve(unit: str, targets: List[int], packages: Sequence[Dict[str, int]], remaining: List[Dict[str, int]],
+               cost: Callable[[int, int], Optional[float]]) -> List[Optional[int]]:
+        m = len(remaining)
+        costs = [[cost(i, j) if _covers(remaining[i], packages[j]) else None for j in targets] for i in range(m)]
+        flow = assign_sources([r.get(unit, 0) for r in remaining], [packages[j][unit] for j in targets], costs)
+        # Akışın böldüğü paketler ve paketteki diğer birimler stoğu aşabilir: hedefler ucuzdan pahalıya yerleştirilir,
+        # akışın köyüne sığmayan bir sonraki en ucuz köye kayar, hiçbir köye sığmayan None kalır
+        stock = [dict(r) for r in remaining]
+        chosen: List[Optional[int]] = [None] * len(targets)
+        for t in sorted(range(len(targets)), key=lambda t: (flow[t] is None, costs[flow[t]][t] if flow[t] is not None else 0)):
+            candidates = sorted((i for i in range(m) if costs[i][t] is not None), key=lambda i: (i != flow[t], costs[i][t]))
+            package = packages[targets[t]]
+            for i in candidates:
+                if _covers(stock[i], package):
+                    for key, count in package.items():
+                        stock[i][key] -= count
+                    chosen[t] = i
+                    break
+        return chosen
@@ -0,0 +1,49 @@
+# --- travian_bot_project/bot/throttle.py ---
+import asyncio
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class RequestThrottle:
+    """
+    Bir hesabın sunucuya giden sayfa işlemlerini sınırlar: önce hesabın kendi hız sınırına (jeton kovası) uyulur,
+    ardından tüm hesapların paylaştığı işçi havuzundan (`worker_slots`) bir yer alınır.
+    `async with throttle:` bloğu bir sayfa yüklemesini veya eylemi kapsar.
+    """
+    def __init__(self, worker_slots: Optional[asyncio.Semaphore] = None, min_interval: float = 1.0, burst: int = 2):
+        self.worker_slots = worker_slots
+        self.min_interval = max(0.0, min_interval) # İki istek arası ortalama en az süre (sn)
+        self.burst = max(1, burst) # Boşta biriktirilebilecek en fazla hak
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.request_count = 0
+        self.waited_seconds = 0.0
+
+    async def _take_token(self):
+        if self.min_interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) / self.min_interval)
+            self._updated_at = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) * self.min_interval
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+                self._tokens, self._updated_at = 1.0, time.monotonic()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self._take_token() # Önce hız sınırı beklenir; ortak işçi yeri yalnızca iş süresince tutulur
+        if self.worker_slots:
+            await self.worker_slots.acquire()
+        self.request_count += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.worker_slots:
+            self.worker_slots.release()
+        return False
@@ -0,0 +1,72 @@
+# --- travian_bot_project/bot/travel.py ---
+# Yürüyüş süreleri. Harita kenarlarda sarar (x=200'ün doğusu x=-200'dür); ordu en yavaş birimi hızında ilerler.
+# Turnuva alanı ve kahraman hız bonusu yalnızca ilk `TOURNAMENT_SQUARE_THRESHOLD` alandan sonraki yolda geçerlidir.
+import math
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .game_state import Village
+from .units import unit_speed
+
+logger = logging.getLogger(__name__)
+
+MAP_SIZE = 401 # -200..200
+TOURNAMENT_SQUARE_THRESHOLD = 20 # alan
+TOURNAMENT_SQUARE_BONUS_PER_LEVEL = 0.2 # Seviye başına +%20 hız
+TOURNAMENT_SQUARE_GID = "14"
+
+
+@dataclass(slots=True)
+class TravelModifiers:
+    server_speed: float = 1.0 # Sunucunun asker hızı çarpanı
+    tournament_square_level: int = 0
+    hero_speed_bonus: float = 0.0 # Kahraman eşyalarından, oran olarak (0.25 = %25); eşiğin ötesinde turnuva alanına eklenir
+    map_size: int = MAP_SIZE
+
+
+def map_distance(a: Dict[str, int], b: Dict[str, int], map_size: int = MAP_SIZE) -> float:
+    """İki koordinat arasındaki uzaklık; her eksende haritanın sarması dikkate alınır."""
+    dx = abs(int(a["x"]) - int(b["x"])) % map_size
+    dy = abs(int(a["y"]) - int(b["y"])) % map_size
+    return math.hypot(min(dx, map_size - dx), min(dy, map_size - dy))
+
+
+def army_speed(troops: Dict[str, int], tribe: Optional[str] = None) -> Optional[int]:
+    """Gönderilecek askerlerin en yavaşının hızı; hızı bilinmeyen bir birim varsa None."""
+    speeds = []
+    for name, count in troops.items():
+        try:
+            if int(count) > 0:
+                speeds.append(unit_speed(name, tribe))
+        except (TypeError, ValueError):
+            continue # Geçersiz miktar; bu birim gönderilmez
+    return min(speeds) if speeds and None not in speeds else None
+
+
+def travel_seconds(distance: float, speed: float, modifiers: TravelModifiers) -> float:
+    """`speed` (alan/saat) hızındaki ordunun `distance` alanı gitme süresi (sn)."""
+    base_speed = speed * modifiers.server_speed
+    near = min(distance, TOURNAMENT_SQUARE_THRESHOLD)
+    far = distance - near
+    far_speed = base_speed * (1 + modifiers.tournament_square_level * TOURNAMENT_SQUARE_BONUS_PER_LEVEL + modifiers.hero_speed_bonus)
+    return (near / base_speed + far / far_speed) * 3600
+
+
+def village_modifiers(village: Village, server_speed: float = 1.0, hero_speed_bonus: float = 0.0) -> TravelModifiers:
+    """Köyün turnuva alanı seviyesiyle birlikte yürüyüş çarpanları."""
+    level = max((b.level for b in village.buildings if b.gid == TOURNAMENT_SQUARE_GID), default=0)
+    return TravelModifiers(server_speed=server_speed, tournament_square_level=level, hero_speed_bonus=hero_speed_bonus)
+
+
+def raid_round_trip_seconds(village: Village, target_coords: Dict[str, int], troops: Dict[str, int], tribe: Optional[str] = None,
+                            modifiers: Optional[TravelModifiers] = None) -> Optional[float]:
+    """
+    Köyden hedefe gidiş ve dönüş süresi toplamı (sn; dönüş gidişle aynı hızdadır). Köyün koordinatı
+    veya askerlerin hızı bilinmiyorsa None.
+    """
+    speed = army_speed(troops, tribe)
+    if not village.coordinates or not speed:
+        return None
+    modifiers = modifiers or village_modifiers(village)
+    return 2 * travel_seconds(map_distance(village.coordinates, target_coords, modifiers.map_size), speed, modifiers)
@@ -1,15 +1,44 @@
 # --- travian_bot_project/bot/travian_client.py ---
-from playwright.sync_api import sync_playwright, Page, BrowserContext, Browser, Playwright, Error as PlaywrightError # Added Playwright
-from typing import Optional, List, Dict, Any
+# sync_api/async_api'nin dışa aktardığı hata sınıfının kendisi; sync_api (~90 ms) yalnızca tarayıcı açılırken yüklenir
+from playwright._impl._errors import Error as PlaywrightError
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from .game_state import Village, Building, Troop, HeroStatus
+from .page_state import PageStateTracker
+from .page_pool import PagePool
+from .page_scripts import DORF1_EXTRACT_JS, DORF2_EXTRACT_JS, UPGRADE_COST_JS, HERO_EXTRACT_JS, GAME_API_JS
+from .dirty_state import VILLAGE_ASPECTS, DORF1_ASPECTS, DORF2_ASPECTS
+from .units import troop_input_fields, unit_field
+from .farm_lists import (
+    NativeFarmList, FARM_LISTS_API_PATH, FARM_LIST_SLOT_API_PATH, FARM_LIST_SEND_API_PATH, GRAPHQL_API_PATH, FARM_LISTS_QUERY,
+    parse_farm_lists_response, send_request_body, parse_send_response,
+)
+from config.network_profile import NetworkProfile, get_network_profile
+from .parsers import (
+    extract_dorf1_payload, extract_dorf2_payload, extract_hero_payload, clean_text_for_int, safe_int,
+    apply_village_payloads, parse_resources_payload, parse_resource_fields_payload, parse_village_center_payload,
+    parse_building_queue_payload, parse_troops_payload, parse_hero_payload,
+    extract_rally_send_form, extract_rally_confirm_form, extract_rally_error, fill_raid_form, parse_raid_result,
+)
 import time
 import re
+import os
 import logging
 import random # get_nearby_village_info simülasyonu için
-import json # JavaScript nesnesini ayrıştırmak için
+import threading
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, BrowserContext, Browser, Playwright
+    from .http_session import TravianHttpSession
 
 logger = logging.getLogger(__name__)
 
+# Hesap başına kayıtlı oturum (storage_state) dosyalarının dizini; çerez içerdiği için git'e eklenmez
+SESSIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sessions")
+
+# Asker adı -> askeri üs formundaki giriş alanı (Romalılar). Kabileye göre eşleme için bkz. units.unit_field.
+TROOP_INPUT_FIELDS = troop_input_fields("romans")
+
 class TravianClient:
     """
     Playwright kullanarak Travian sunucusuyla etkileşim kurar.
@@ -17,37 +46,43 @@ class TravianClient:
     Playwright kaynaklarını başlatan ve sonlandıran thread tarafından kullanılmalıdır.
     """
 
-    def __init__(self, server_url: str, username: str, password: str):
+    def __init__(self, server_url: str, username: str, password: str, network_profile: Optional[NetworkProfile] = None,
+                 max_parallel_pages: int = 4):
         # server_url should be the base URL, e.g., "https://ts50.x5.europe.travian.com"
         self.server_url = server_url.strip('/')
         self.username = username
         self.password = password
-        self.playwright_instance: Optional[Playwright] = None # Changed from playwright_context
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
+        self.playwright_instance: Optional["Playwright"] = None # Changed from playwright_context
+        self.browser: Optional["Browser"] = None
+        self.context: Optional["BrowserContext"] = None
+        self.page: Optional["Page"] = None
         self.current_village_id: Optional[str] = None
         self._is_active: bool = False # To track if login was successful and resources are active
+        self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
+        # Salt-okunur sayfa çekimleri için tarayıcısız HTTP hızlı yolu (giriş sonrası çerezler kopyalanır)
+        self.use_http_fast_path: bool = True
+        self.http: Optional["TravianHttpSession"] = None
+        # Gereksiz kaynakları (görsel, yazı tipi, CSS, izleme/ödeme betikleri) engelleyen ağ profili; bkz. config/network_profile.py
+        self.network_profile: NetworkProfile = network_profile or get_network_profile(self.server_url)
+        self.blocked_request_count: int = 0
+        # Hesap başına oturum (çerez/localStorage) dosyası; yeniden başlatmalarda form girişi atlanır
+        self.storage_state_path: str = self._default_storage_state_path()
+        self._playwright_thread_id: Optional[int] = None # Playwright sync nesneleri başlatıldıkları thread'e bağlıdır
+        # Geçerli sayfa/köy ve taze sayfa yükleri; gereksiz navigasyon ve reload'ları önler
+        self.page_state = PageStateTracker()
+        self.tribe: Optional[str] = None # Askeri üs formundaki birim resimlerinden öğrenilir (bkz. units.py)
+        self.farm_list_villages: Dict[int, str] = {} # Yerleşik yağma listesi ID -> sahibi köy (gönderim sonrası önbellek temizliği)
+        # Son başarısız yükseltme denemesinde build.php'de görülen maliyet (motor, kaynak yetene kadar tekrar denemez)
+        self.last_upgrade_cost: Optional[Dict[str, int]] = None
+        # Çok köylü yenilemelerde aynı anda yüklenecek en fazla sayfa (HTTP iş parçacığı veya havuz sayfası)
+        self.max_parallel_pages: int = max(1, max_parallel_pages)
+        self.page_pool: Optional[PagePool] = None
 
     def _clean_text_for_int(self, text: Optional[str]) -> str:
-        if not text:
-            return "0"
-        cleaned = text.replace('.', '').replace(',', '')
-        cleaned = re.sub(r'[\u202A-\u202F\u200E\u200F]', '', cleaned)
-        cleaned = cleaned.replace('\xa0', '')
-        return cleaned.strip()
+        return clean_text_for_int(text)
 
     def _get_safe_int_from_text(self, text: Optional[str], resource_name: str = "Değer", default_value: int = 0) -> int:
-        cleaned_text = self._clean_text_for_int(text)
-        try:
-            if re.fullmatch(r'-?\d+', cleaned_text):
-                return int(cleaned_text)
-            else:
-                logger.debug(f"'{resource_name}' için metin sayısal değil: '{text}'. Varsayılan ({default_value}) kullanılıyor.")
-                return default_value
-        except ValueError:
-            logger.warning(f"'{resource_name}' metinden dönüştürülemedi. Değer: '{text}'. Varsayılan ({default_value}) kullanılıyor.")
-            return default_value
+        return safe_int(text, resource_name, default_value)
 
     def _get_safe_int_from_locator(self, locator_selector: str, resource_name: str, attribute: Optional[str] = None, default_value: int = 0) -> int:
         if not self.page:
@@ -73,41 +108,116 @@ class TravianClient:
             logger.error(f"'{resource_name}' ({locator_selector}) çekilirken genel hata: {e}", exc_info=True)
             return default_value
 
-    def login(self) -> bool:
-        # This method should be called from the thread that will perform Playwright operations
-        if self._is_active:
-            logger.info("Zaten aktif bir oturum var. Önce kapatılıyor...")
-            self.close() # Close existing session before starting a new one
-
+    def _extract_page_payload(self, extract_script: str) -> Dict[str, Any]:
+        """Yüklü sayfada çıkarma betiğini tek bir page.evaluate ile çalıştırır ve JSON yükünü döndürür."""
         try:
+            payload = self.page.evaluate(extract_script)
+            return payload if isinstance(payload, dict) else {}
+        except PlaywrightError as e:
+            logger.warning(f"Sayfa verisi page.evaluate ile çıkarılamadı: {e}")
+            return {}
+
+    def _default_storage_state_path(self) -> str:
+        host = re.sub(r'^https?://', '', self.server_url).replace('/', '_').replace(':', '_')
+        user = re.sub(r'[^\w.-]', '_', self.username)
+        return os.path.join(SESSIONS_DIR, f"{host}__{user}.json")
+
+    def _owned_by_other_thread(self) -> bool:
+        return self.playwright_instance is not None and self._playwright_thread_id != threading.get_ident()
+
+    def _ensure_browser(self):
+        """Playwright sürücüsünü ve Chromium'u yalnızca çalışmıyorsa başlatır; sıcak tarayıcı yeniden kullanılır."""
+        if self._owned_by_other_thread():
+            # Sync nesneler başka thread'den kapatılamaz; kapatma işi onları başlatan thread'e (motorun run döngüsü) kalır
+            raise RuntimeError(f"Playwright başka bir thread'de (ID: {self._playwright_thread_id}) başlatılmış; "
+                               "bu istemci yalnızca o thread'den kullanılabilir.")
+        if self.browser and self.browser.is_connected():
+            return
+        if not self.playwright_instance:
             logger.info("Playwright başlatılıyor...")
+            from playwright.sync_api import sync_playwright
             self.playwright_instance = sync_playwright().start() # START PLAYWRIGHT IN CURRENT THREAD
+            self._playwright_thread_id = threading.get_ident()
             logger.info(f"Playwright başlatıldı: {self.playwright_instance}")
+        self.browser = self.playwright_instance.chromium.launch(headless=True, slow_mo=self.network_profile.slow_mo)
 
-            self.browser = self.playwright_instance.chromium.launch(headless=True, slow_mo=50) # headless=True olarak ayarlandı, slow_mo isteğe bağlı düşürülebilir
+    def _open_context(self) -> bool:
+        """Yeni bir context ve sayfa açar; kayıtlı storage_state varsa yükler. Oturum geri yüklendiyse True döner."""
+        restored = os.path.exists(self.storage_state_path)
+        try:
             self.context = self.browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36"
+                user_agent=self.user_agent,
+                storage_state=self.storage_state_path if restored else None,
             )
-            self.context.set_default_timeout(40000)
-            self.page = self.context.new_page()
-            
-            # Navigate to the base URL, assuming it redirects to login or is the login page.
+        except PlaywrightError as e:
+            logger.warning(f"Kayıtlı oturum dosyası yüklenemedi ({e}), boş context açılıyor.")
+            restored = False
+            self.context = self.browser.new_context(user_agent=self.user_agent)
+        self.context.set_default_timeout(40000)
+        self._apply_network_profile(self.context)
+        self.page = self.context.new_page()
+        self.page.on("framenavigated", self._on_frame_navigated)
+        if restored:
+            logger.info(f"Kayıtlı oturum yüklendi: {self.storage_state_path}")
+        return restored
+
+    def _on_frame_navigated(self, frame):
+        if self.page and frame == self.page.main_frame:
+            self.page_state.record_navigation(frame.url)
+
+    def save_storage_state(self):
+        """Context'in çerez/localStorage durumunu hesap dosyasına yazar (atomik: önce geçici dosya)."""
+        if not self.context:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.storage_state_path), exist_ok=True)
+            tmp_path = self.storage_state_path + ".tmp"
+            self.context.storage_state(path=tmp_path)
+            os.replace(tmp_path, self.storage_state_path)
+            logger.debug(f"Oturum durumu kaydedildi: {self.storage_state_path}")
+        except Exception as e:
+            logger.warning(f"Oturum durumu kaydedilemedi: {e}")
+
+    def discard_storage_state(self):
+        if os.path.exists(self.storage_state_path):
+            try: os.remove(self.storage_state_path)
+            except OSError as e: logger.warning(f"Kayıtlı oturum dosyası silinemedi: {e}")
+
+    def _mark_logged_in(self):
+        self._is_active = True
+        self._init_http_session()
+        self.save_storage_state()
+
+    def login(self) -> bool:
+        # This method should be called from the thread that will perform Playwright operations
+        if self._owned_by_other_thread():
+            logger.error(f"Giriş reddedildi: Playwright başka bir thread'de (ID: {self._playwright_thread_id}) çalışıyor; "
+                         "önce o thread istemciyi kapatmalı.")
+            return False
+        if self._is_active or self.context:
+            logger.info("Mevcut oturum context'i kapatılıyor...")
+            self.reset_context()
+
+        try:
+            self._ensure_browser()
+            restored = self._open_context()
+
+            # Kayıtlı oturum varsa doğrudan dorf1'e gidilir; geçerliyse form girişi atlanır.
             # Travian often has login on the main page or /dorf1.php if not logged in.
-            login_page_url = f"{self.server_url}/" # Or specific login path e.g. /login.php
+            login_page_url = f"{self.server_url}/dorf1.php" if restored else f"{self.server_url}/"
             logger.info(f"{login_page_url} adresine gidiliyor...")
             self.page.goto(login_page_url, wait_until="domcontentloaded")
 
-            # Check if already logged in (e.g., by looking for dorf1.php in URL or a logout button)
-            # This simple check might need to be more robust
-            if "dorf1.php" in self.page.url:
-                logger.info("Giriş yapılmış gibi görünüyor (dorf1.php URL'de).")
+            # Oturumun geçerliliği köy ID'sine değil, dorf1'deki giriş işaretlerine göre belirlenir
+            if self._is_logged_in_page():
+                logger.info("Giriş yapılmış gibi görünüyor (dorf1.php, çıkış bağlantısı var).")
                 self._update_current_village_id_after_login()
-                if self.current_village_id:
-                    self._is_active = True
-                    logger.info("Giriş başarılı (zaten giriş yapılmış).")
-                    return True
-                else: # On dorf1 but couldn't get village ID, something is wrong
-                    logger.warning("dorf1.php'de ama köy ID alınamadı, normal giriş denenecek.")
+                self._mark_logged_in()
+                logger.info("Giriş başarılı (kayıtlı oturum geçerli)." if restored else "Giriş başarılı (zaten giriş yapılmış).")
+                return True
+            elif restored:
+                logger.info("Kayıtlı oturum geçersiz, form ile giriş yapılacak.")
+                self.discard_storage_state()
 
 
             logger.info("Kullanıcı adı ve şifre giriliyor...")
@@ -149,7 +259,7 @@ class TravianClient:
                     self.page.wait_for_url(f"**{self.server_url}**/dorf1.php**", timeout=45000)
                     logger.info("Giriş başarılı.")
                     self._update_current_village_id_after_login()
-                    self._is_active = True
+                    self._mark_logged_in()
                     return True
                 except PlaywrightError as e:
                     logger.error(f"Giriş sonrası dorf1.php'ye yönlendirme beklenirken hata: {e}")
@@ -157,7 +267,7 @@ class TravianClient:
                     if "logout.php" in self.page.content(): # Check for logout button as sign of success
                          logger.info("dorf1.php'ye yönlendirilmedi ama çıkış butonu bulundu, giriş başarılı sayılıyor.")
                          self._update_current_village_id_after_login() # May not be on dorf1
-                         self._is_active = True
+                         self._mark_logged_in()
                          return True
                     logger.error(f"Giriş başarısız oldu. Sayfa URL: {self.page.url}, Sayfa içeriği (ilk 500 karakter): {self.page.content()[:500]}")
                     self.close()
@@ -176,9 +286,16 @@ class TravianClient:
             self.close()
             return False
 
+    def _is_logged_in_page(self) -> bool:
+        """Sayfa dorf1 ve giriş formu yerine oyunun çıkış bağlantısı veya köy listesi görünüyorsa True."""
+        if "dorf1.php" not in self.page.url or self.page.locator("input[name='password']").count():
+            return False
+        return bool(self.page.locator("a[href*='logout'], div#sidebarBoxVillageList").count())
+
     def _update_current_village_id_after_login(self):
-        if not self.page or not self._is_active:
-            logger.warning("Sayfa yok veya aktif oturum yok, köy ID'si güncellenemiyor.")
+        # Giriş sırasında da çağrılır (oturum henüz aktif işaretlenmemişken); yalnızca sayfa gerekir
+        if not self.page:
+            logger.warning("Sayfa yok, köy ID'si güncellenemiyor.")
             return
         try:
             # Ensure on dorf1 or a page where village list is visible
@@ -214,16 +331,13 @@ class TravianClient:
             logger.info("Playwright kaynakları zaten kapalı veya hiç başlatılmadı.")
             return
 
+        if self._owned_by_other_thread():
+            logger.error(f"Playwright kaynakları başka bir thread'e (ID: {self._playwright_thread_id}) ait; buradan kapatılamaz.")
+            return
+
         logger.info("Playwright kaynakları kapatılıyor...")
-        self._is_active = False # Mark as inactive before attempting to close
-        
         # It's important that these are called from the same thread that started Playwright
-        if self.page:
-            try: self.page.close()
-            except Exception as e: logger.warning(f"Sayfa kapatılırken hata: {e}")
-        if self.context:
-            try: self.context.close()
-            except Exception as e: logger.warning(f"Tarayıcı context'i kapatılırken hata: {e}")
+        self.reset_context()
         if self.browser:
             try: self.browser.close()
             except Exception as e: logger.warning(f"Tarayıcı kapatılırken hata: {e}")
@@ -235,24 +349,125 @@ class TravianClient:
             except Exception as e: logger.warning(f"Playwright context'i durdurulurken hata: {e}")
         
         self.page, self.context, self.browser, self.playwright_instance = None, None, None, None
+        self._playwright_thread_id = None
         logger.info("Playwright kaynakları temizlendi.")
 
+    def reset_context(self):
+        """
+        Sadece sayfa ve context'i kapatır; Playwright sürücüsü ve Chromium süreci açık kalır.
+        Aktif oturumun çerezleri önce diske yazılır, böylece sonraki login() form girişine gerek duymaz.
+        """
+        if self._is_active:
+            self.save_storage_state()
+        self._is_active = False # Mark as inactive before attempting to close
+        if self.http:
+            self.http.close()
+            self.http = None
+        if self.page_pool:
+            self.page_pool.close()
+            self.page_pool = None
+        if self.page:
+            try: self.page.close()
+            except Exception as e: logger.warning(f"Sayfa kapatılırken hata: {e}")
+        if self.context:
+            try: self.context.close()
+            except Exception as e: logger.warning(f"Tarayıcı context'i kapatılırken hata: {e}")
+        self.page, self.context = None, None
+        self.page_state.reset()
+
+
+    def _apply_network_profile(self, context: "BrowserContext"):
+        """Ağ profilinde engellenen istekleri context seviyesinde iptal eder (tüm sayfalara uygulanır)."""
+        if not self.network_profile.blocks_anything:
+            logger.info(f"'{self.network_profile.name}' ağ profili: kaynak engelleme kapalı.")
+            return
+        profile = self.network_profile
+
+        def handle_route(route):
+            request = route.request
+            if profile.should_block(request.resource_type, request.url):
+                self.blocked_request_count += 1
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route("**/*", handle_route)
+        logger.info(f"'{profile.name}' ağ profili uygulandı: engellenen türler={sorted(profile.blocked_resource_types)}, "
+                    f"engellenen URL kalıpları={len(profile.blocked_url_patterns)}, slow_mo={profile.slow_mo}")
+
+    def _init_http_session(self):
+        """Giriş sonrası tarayıcı context çerezlerini havuzlu bir HTTP oturumuna kopyalar."""
+        if not self.use_http_fast_path or not self.context:
+            return
+        try:
+            if not self.http:
+                from .http_session import TravianHttpSession # requests ilk oturum açılışında yüklenir
+                self.http = TravianHttpSession(self.server_url, self.user_agent, pool_size=self.max_parallel_pages)
+            self.http.load_cookies(self.context.cookies())
+        except Exception as e:
+            logger.warning(f"HTTP hızlı yolu başlatılamadı, tarayıcı kullanılacak: {e}")
+            self.http = None
+
+    def fetch_page_html(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Salt-okunur bir sayfanın (dorf1.php, dorf2.php, build.php?gid=16, hero) ham HTML'ini döndürür.
+        Önce HTTP hızlı yolunu dener; oturum düşmüşse çerezleri bir kez tazeler, yine olmazsa tarayıcıya döner.
+        """
+        if self.http and self.use_http_fast_path:
+            if not self.http.is_valid:
+                self._init_http_session()
+            page_html = self.http.fetch_html(path, params)
+            if page_html is None and self.http and not self.http.is_valid:
+                self._init_http_session()
+                page_html = self.http.fetch_html(path, params) if self.http else None
+            if page_html is not None:
+                return page_html
+            logger.info(f"HTTP hızlı yolu '{path}' için başarısız, tarayıcıya dönülüyor.")
+
+        if not self.page or not self._is_active:
+            logger.error("Sayfa mevcut değil veya aktif oturum yok. Sayfa HTML'i çekilemiyor."); return None
+        query = "&".join(f"{key}={value}" for key, value in (params or {}).items())
+        self.page.goto(f"{self.server_url}/{path.lstrip('/')}" + (f"?{query}" if query else ""), wait_until="domcontentloaded")
+        return self.page.content()
+
+    def _get_village_payload(self, village_id: str, page_name: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Köyün dorf1/dorf2 sayfasının çıkarma yükünü döndürür. `max_age` içinde alınmış bir anlık görüntü varsa
+        sayfa hiç yüklenmez. Aksi halde HTTP hızlı yolu açıksa ham HTML ayrıştırılır, değilse sayfa tarayıcıda
+        yüklenip sayfa içi betik çalıştırılır. Navigasyon başarısızsa None döner.
+        """
+        cached = self.page_state.get_fresh(page_name, village_id, max_age)
+        if cached is not None:
+            return cached
+        payload = self._load_village_payload(village_id, page_name)
+        if payload is not None:
+            self.page_state.store(page_name, village_id, payload)
+        return payload
+
+    def _load_village_payload(self, village_id: str, page_name: str) -> Optional[Dict[str, Any]]:
+        if self.http and self.use_http_fast_path:
+            page_html = self.http.fetch_html(page_name, {"newdid": village_id})
+            if page_html is not None:
+                self.current_village_id = village_id # newdid sunucu tarafındaki aktif köyü de değiştirir
+                if page_name == "dorf1.php":
+                    return extract_dorf1_payload(page_html)
+                return extract_dorf2_payload(page_html)
+            if not self.http.is_valid:
+                self._init_http_session()
+            logger.info(f"HTTP hızlı yolu köy {village_id} {page_name} için başarısız, tarayıcıya dönülüyor.")
+
+        if not self._goto_village_page(village_id, page_name):
+            return None
+        return self._extract_page_payload(DORF1_EXTRACT_JS if page_name == "dorf1.php" else DORF2_EXTRACT_JS)
 
     def navigate_to_village(self, village_id: str):
         if not self.page or not self._is_active:
             logger.error("Sayfa mevcut değil veya aktif oturum yok. Navigasyon yapılamıyor.")
             return
         try:
-            target_url_with_did = f"{self.server_url}/dorf1.php?newdid={village_id}"
-            
-            current_url_path = self.page.url.split('?')[0]
-            current_newdid_match = re.search(r'[?&]newdid=(\d+)', self.page.url)
-            current_page_newdid = current_newdid_match.group(1) if current_newdid_match else None
-
-            if not current_url_path.endswith("dorf1.php") or current_page_newdid != village_id:
-                logger.info(f"Köy ID {village_id} ({target_url_with_did}) adresine gidiliyor.")
-                self.page.goto(target_url_with_did, wait_until="domcontentloaded")
-                self.current_village_id = village_id # Update current village ID upon successful navigation
+            if not self.page_state.is_on("dorf1.php", village_id):
+                logger.info(f"Köy ID {village_id} ({self.server_url}/dorf1.php?newdid={village_id}) adresine gidiliyor.")
+                self._goto_village_page(village_id, "dorf1.php")
             else:
                 logger.info(f"Zaten köy ID {village_id} ({self.page.url}) dorf1.php sayfasındayız.")
         except Exception as e:
@@ -267,125 +482,12 @@ class TravianClient:
         if not target_village_id: logger.error("Kaynak çekmek için köy ID'si belirlenemedi."); return None
         
         try:
-            # Ensure we are on the dorf1 page of the target village
-            current_page_did_match = re.search(r'[?&]newdid=(\d+)', self.page.url)
-            current_page_did = current_page_did_match.group(1) if current_page_did_match else None
-            current_url_path = self.page.url.split('?')[0]
-
-            if not current_url_path.endswith("dorf1.php") or current_page_did != target_village_id:
-                self.navigate_to_village(target_village_id)
-                if not self.page.url.split('?')[0].endswith("dorf1.php"): # Check if navigation was successful
-                    logger.error(f"Köy {target_village_id} dorf1.php sayfasına navigasyon başarısız.")
-                    return None
-            else: # Already on correct village's dorf1, reload to get fresh data
-                logger.info(f"Köy {target_village_id} için dorf1.php sayfası yenileniyor...")
-                self.page.reload(wait_until="domcontentloaded")
+            payload = self._get_village_payload(target_village_id, "dorf1.php")
+            if payload is None:
+                logger.error(f"Köy {target_village_id} dorf1.php sayfasına navigasyon başarısız.")
+                return None
+            return parse_resources_payload(payload, target_village_id)
 
-            resources_data = {}
-            
-            try:
-                logger.debug("JavaScript kaynak nesnesi aranıyor...")
-                all_scripts = self.page.query_selector_all("script")
-                script_content_raw = None
-                for script_tag in all_scripts:
-                    content = script_tag.inner_text()
-                    if "var resources = {" in content and "maxStorage" in content and "production" in content:
-                        script_content_raw = content
-                        logger.debug("Potansiyel kaynak JavaScript bloğu bulundu.")
-                        break
-                
-                if script_content_raw:
-                    match_js = re.search(r'var\s+resources\s*=\s*(\{[\s\S]*?\})\s*;?\s*(var\s+maxStorage\s*=\s*(\{[\s\S]*?\})\s*;?)?\s*(var\s+production\s*=\s*(\{[\s\S]*?\})\s*;?)?', script_content_raw)
-                    if match_js:
-                        resources_json_str = match_js.group(1)
-                        max_storage_json_str = match_js.group(3) if match_js.group(2) else None
-                        production_json_str = match_js.group(5) if match_js.group(4) else None
-
-                        # Convert JS object literal to valid JSON (heuristic)
-                        def js_to_json_like(js_obj_str):
-                            if not js_obj_str: return None
-                            # Add quotes around keys
-                            s = re.sub(r'([{,]\s*)([a-zA-Z_]\w*)(\s*:)', r'\1"\2"\3', js_obj_str)
-                            return s
-
-                        js_data_res = json.loads(js_to_json_like(resources_json_str))
-                        js_data_max_storage = json.loads(js_to_json_like(max_storage_json_str)) if max_storage_json_str else js_data_res.get("maxStorage", {}) # Fallback if not separate
-                        js_data_prod = json.loads(js_to_json_like(production_json_str)) if production_json_str else js_data_res.get("production", {}) # Fallback
-
-                        # It seems 'resources' contains 'storage', 'maxStorage', 'production' in some game versions
-                        storage_obj = js_data_res.get('storage', js_data_res) # If 'storage' key exists, use it, else assume top level
-                        
-                        resources_data['wood'] = self._get_safe_int_from_text(str(storage_obj.get('l1')), "Odun (JS)")
-                        resources_data['clay'] = self._get_safe_int_from_text(str(storage_obj.get('l2')), "Tuğla (JS)")
-                        resources_data['iron'] = self._get_safe_int_from_text(str(storage_obj.get('l3')), "Demir (JS)")
-                        resources_data['crop'] = self._get_safe_int_from_text(str(storage_obj.get('l4')), "Tahıl (JS)")
-
-                        resources_data['warehouse_capacity'] = self._get_safe_int_from_text(str(js_data_max_storage.get('l1')), "Ambar Kapasitesi (JS)")
-                        resources_data['granary_capacity'] = self._get_safe_int_from_text(str(js_data_max_storage.get('l4')), "Tahıl Ambarı Kapasitesi (JS)")
-                        
-                        resources_data['wood_prod'] = self._get_safe_int_from_text(str(js_data_prod.get('l1')), "Odun Üretimi (JS)")
-                        resources_data['clay_prod'] = self._get_safe_int_from_text(str(js_data_prod.get('l2')), "Tuğla Üretimi (JS)")
-                        resources_data['iron_prod'] = self._get_safe_int_from_text(str(js_data_prod.get('l3')), "Demir Üretimi (JS)")
-                        # l4 is net crop, l5 is free crop (consumption)
-                        resources_data['crop_prod'] = self._get_safe_int_from_text(str(js_data_prod.get('l4')), "Net Tahıl Üretimi (JS)") # Net production
-                        resources_data['crop_consumption'] = self._get_safe_int_from_text(str(js_data_prod.get('l5')), "Tahıl Tüketimi / Serbest Tahıl (JS)") # Actually free crop or consumption?
-                        # The game state `crop_consumption` should be actual consumption. `free_crop` is usually `production - consumption`.
-                        # If l5 is "free crop", then actual consumption = (gross production) - free_crop.
-                        # Gross production for crop is not directly in l1-l5 production usually.
-                        # For now, let's assume l4 is net, and we need gross crop to calculate consumption if l5 is free_crop.
-                        # Or, if l5 means something else (e.g. raw consumption value shown as negative).
-                        # Let's assume for now `crop_prod_net` is `resources_data['crop_prod']`
-                        # and `free_crop` (which is `l5` in Travian JS) is what `game_state.Village.crop_consumption` expects as "Serbest Tahıl"
-                        # This means `game_state.Village.crop_consumption` might be misnamed. It should be `free_crop_production`.
-                        # Let's map l5 to 'free_crop' for now, and game_state can be adjusted.
-                        resources_data['free_crop'] = resources_data['crop_consumption'] # Keep original mapping intent from logs
-
-                        logger.info(f"Kaynaklar köy {target_village_id} için JavaScript nesnesinden başarıyla çekildi.")
-                    else:
-                         logger.warning("JavaScript 'resources' nesnesi regex ile eşleşmedi.")
-                         raise ValueError("JavaScript 'resources' nesnesi bulunamadı veya formatı beklenenden farklı.")
-                else:
-                    logger.warning("Kaynakları içeren JavaScript bloğu bulunamadı.")
-                    raise ValueError("Kaynakları içeren JavaScript bloğu bulunamadı.")
-
-            except Exception as js_e:
-                logger.warning(f"JavaScript kaynak nesnesi ayrıştırılamadı ({js_e}), HTML elementlerine fallback yapılıyor.")
-                resources_data['wood'] = self._get_safe_int_from_locator("div#l1.value, span#l1", "Odun (HTML)")
-                resources_data['clay'] = self._get_safe_int_from_locator("div#l2.value, span#l2", "Tuğla (HTML)")
-                resources_data['iron'] = self._get_safe_int_from_locator("div#l3.value, span#l3", "Demir (HTML)")
-                resources_data['crop'] = self._get_safe_int_from_locator("div#l4.value, span#l4", "Tahıl (HTML)")
-
-                resources_data['warehouse_capacity'] = self._get_safe_int_from_locator("div#stockBar div.warehouse div.capacity div.value, #stockBarWarehouse .capacity", "Ambar Kapasitesi (HTML)", default_value=800)
-                resources_data['granary_capacity'] = self._get_safe_int_from_locator("div#stockBar div.granary div.capacity div.value, #stockBarGranary .capacity", "Tahıl Ambarı Kapasitesi (HTML)", default_value=800)
-            
-                prod_table = self.page.locator("table#production")
-                if prod_table.is_visible(timeout=1000):
-                    resources_data['wood_prod'] = self._get_safe_int_from_locator("table#production tbody tr:nth-child(1) td.num", "Odun Üretimi (HTML)")
-                    resources_data['clay_prod'] = self._get_safe_int_from_locator("table#production tbody tr:nth-child(2) td.num", "Tuğla Üretimi (HTML)")
-                    resources_data['iron_prod'] = self._get_safe_int_from_locator("table#production tbody tr:nth-child(3) td.num", "Demir Üretimi (HTML)")
-                    resources_data['crop_prod'] = self._get_safe_int_from_locator("table#production tbody tr:nth-child(4) td.num", "Net Tahıl Üretimi (HTML)") # Net
-                else: # Fallback for production if table not found
-                    logger.warning("Üretim tablosu (table#production) bulunamadı. Üretim değerleri sıfır olarak ayarlanıyor.")
-                    for key in ['wood_prod', 'clay_prod', 'iron_prod', 'crop_prod']: resources_data[key] = 0
-                
-                # Free crop (or consumption)
-                # Travian usually shows "Free crop" / "Serbest Tahıl". If it's consumption, it's often negative.
-                # Selectors might be #stockBarFreeCrop span.value or similar
-                resources_data['free_crop'] = self._get_safe_int_from_locator("#stockBarFreeCrop span.value, span#stockBarFreeCrop", "Serbest Tahıl (HTML)")
-                # If free_crop is consumption, it's usually total_prod - actual_consumption, or just actual_consumption if negative.
-                # The provided `game_state.Village.crop_consumption` is used for "Serbest Tahıl" in original logs.
-                # So we assume `free_crop` is the value for "Serbest Tahıl".
-                # `game_state.crop_consumption` should ideally store the actual troop consumption.
-                # For now, we keep the mapping from logs: `resources_data.get("crop_consumption", ...)` from bot_engine refers to this 'free_crop'.
-
-
-            # Population
-            pop_selector = "div#sidebarBoxActiveVillage div.population span, span.population-value" # Common selectors
-            resources_data['population'] = self._get_safe_int_from_locator(pop_selector, "Nüfus")
-
-            logger.info(f"Son kaynaklar (köy {target_village_id}): {resources_data}")
-            return resources_data
-            
         except Exception as e:
             logger.error(f"Kaynakları köy {target_village_id} için çekerken genel hata: {e}", exc_info=True)
             return None
@@ -430,42 +532,142 @@ class TravianClient:
             
             coordinates = {"x": coords_x, "y": coords_y} if coords_x is not None and coords_y is not None else None
 
-            resources_info = self.get_village_resources(village_id)
-            if not resources_info:
-                logger.warning(f"Köy {village_id} için kaynaklar çekilemedi. Varsayılan boş değerler kullanılacak.")
-                resources_info = {} # ensure it's a dict for .get() calls
-
-            # Note: `game_state.Village.crop_consumption` seems to be used for "Free Crop" based on BotEngine logic.
-            # If it's meant to be actual troop consumption, calculation is needed: GrossCropProd - FreeCrop = Consumption.
-            # Here, we map "free_crop" from resources_info to game_state's `crop_consumption` to match existing BotEngine usage.
-            # If `game_state.production_rates["crop"]` is NET production, then GrossCropProd = NetCropProd + ActualConsumption.
-
-            village = Village(
-                name=village_name, id=village_id, coordinates=coordinates,
-                resources={
-                    "wood": resources_info.get("wood", 0), "clay": resources_info.get("clay", 0),
-                    "iron": resources_info.get("iron", 0), "crop": resources_info.get("crop", 0)
-                },
-                storage_capacity={
-                    "warehouse": resources_info.get("warehouse_capacity", 800),
-                    "granary": resources_info.get("granary_capacity", 800)
-                },
-                production_rates={ # Ensure these are GROSS production rates if possible, or clearly document if NET
-                    "wood": resources_info.get("wood_prod", 0), "clay": resources_info.get("clay_prod", 0),
-                    "iron": resources_info.get("iron_prod", 0), "crop": resources_info.get("crop_prod", 0) # This is NET from JS
-                },
-                buildings=self.get_village_buildings(village_id),
-                building_queue=self.get_building_queue(village_id),
-                population=resources_info.get("population", 0),
-                crop_consumption=resources_info.get("free_crop", 0), # This is 'Serbest Tahıl' or 'Free Crop'
-                troops_home=self.get_troops_in_village(village_id)
-            )
+            village = Village(name=village_name, id=village_id, coordinates=coordinates)
+            if not self.snapshot_village(village_id, village):
+                logger.warning(f"Köy {village_id} için anlık durum çekilemedi. Varsayılan boş değerler kullanılacak.")
             logger.info(f"İlk köy verileri başarıyla çekildi: {village.name} (ID: {village.id})")
             return village
         except Exception as e:
             logger.error(f"İlk köy verilerini çekerken hata: {e}", exc_info=True)
             return None
 
+    def snapshot_village(self, village_id: str, village: Optional[Village] = None, max_age: Optional[float] = None) -> Optional[Village]:
+        """
+        Bir köyün tüm durumunu tek geçişte çeker: dorf1 ve dorf2 birer kez yüklenir (HTTP hızlı yolu açıksa tarayıcısız).
+        Kaynaklar, kaynak alanları, inşaat kuyruğu ve askerler dorf1'den; köy merkezi binaları dorf2'den okunur.
+        `village` verilirse bu nesne yerinde güncellenir, verilmezse yeni bir Village oluşturulur.
+        `max_age` saniyeden taze sayfa anlık görüntüleri yeniden yüklenmez (bkz. PageStateTracker).
+        """
+        return self.refresh_village(village_id, village, VILLAGE_ASPECTS, max_age)
+
+    def refresh_village(self, village_id: str, village: Optional[Village] = None, aspects: Iterable[str] = VILLAGE_ASPECTS,
+                        max_age: Optional[float] = None) -> Optional[Village]:
+        """
+        Köy durumunun yalnızca istenen parçalarını (bkz. dirty_state.VILLAGE_ASPECTS) yeniler. dorf1 sadece
+        resources/fields/queue/troops, dorf2 sadece center istendiğinde yüklenir; diğer alanlara dokunulmaz.
+        """
+        if not self.page or not self._is_active:
+            logger.error("Sayfa mevcut değil veya aktif oturum yok. Köy durumu çekilemiyor."); return None
+        if not village_id: logger.error("Köy durumu için köy ID'si belirtilmedi."); return None
+        aspects = set(aspects)
+
+        try:
+            if village is None:
+                village = Village(name=f"Köy {village_id}", id=village_id)
+
+            dorf1_payload, dorf2_payload = None, None
+            if aspects & DORF1_ASPECTS:
+                dorf1_payload = self._get_village_payload(village_id, "dorf1.php", max_age)
+                if dorf1_payload is None:
+                    logger.error(f"Köy {village_id} dorf1.php sayfasına navigasyon başarısız.")
+                    return None
+            if aspects & DORF2_ASPECTS:
+                dorf2_payload = self._get_village_payload(village_id, "dorf2.php", max_age)
+                if dorf2_payload is None:
+                    # dorf2 okunamazsa önceki köy merkezi verisini koru
+                    logger.warning(f"Köy {village_id} dorf2.php sayfasına navigasyon başarısız. Önceki köy merkezi verisi korunuyor.")
+            apply_village_payloads(village, aspects, dorf1_payload, dorf2_payload)
+
+            logger.info(f"Köy {village_id} durumu yenilendi ({', '.join(sorted(aspects))}): {len(village.buildings)} bina, {len(village.building_queue)} kuyrukta, {sum(t.count for t in village.troops_home)} asker.")
+            return village
+        except Exception as e:
+            logger.error(f"Köy {village_id} anlık durumu çekilirken hata: {e}", exc_info=True)
+            return None
+
+    def refresh_villages(self, targets: List[Tuple[Village, Iterable[str]]], max_age: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Birden çok köyü yeniler: önce gereken dorf1/dorf2 sayfaları `max_parallel_pages` eşzamanlılıkla
+        önbelleğe çekilir (bkz. prefetch_village_pages), sonra her köy refresh_village ile önbellekten birleştirilir.
+        Köy nesneleri (PlayerAccount.villages) yerinde güncellenir. {köy_id: başarılı_mı} döner.
+        """
+        targets = [(village, set(aspects)) for village, aspects in targets]
+        needed = {}
+        for village, aspects in targets:
+            page_names = []
+            if aspects & DORF1_ASPECTS: page_names.append("dorf1.php")
+            if aspects & DORF2_ASPECTS: page_names.append("dorf2.php")
+            needed[village.id] = page_names
+        self.prefetch_village_pages(needed, max_age)
+        return {village.id: self.refresh_village(village.id, village, aspects, max_age) is not None for village, aspects in targets}
+
+    def snapshot_villages(self, villages: List[Village], max_age: Optional[float] = None) -> Dict[str, bool]:
+        """Tüm köylerin tam durumunu paralel çeker (snapshot_village'ın çok köylü karşılığı)."""
+        return self.refresh_villages([(village, VILLAGE_ASPECTS) for village in villages], max_age)
+
+    def prefetch_village_pages(self, pages_by_village: Dict[str, Iterable[str]], max_age: Optional[float] = None) -> int:
+        """
+        Köy sayfalarının çıkarma yüklerini eşzamanlı çekip PageStateTracker'a yazar; çekilen sayfa sayısını döndürür.
+        Her istek kendi `newdid` parametresini taşır, yani sunucudaki "aktif köy" sırasına güvenilmez.
+        HTTP hızlı yolu açıksa istekler iş parçacıklarına dağıtılır; başarısız olanlar tarayıcı sayfa havuzunda yüklenir.
+        """
+        if not self.page or not self._is_active:
+            return 0
+        pending = [(village_id, page_name) for village_id, page_names in pages_by_village.items() for page_name in page_names
+                   if self.page_state.get_fresh(page_name, village_id, max_age) is None]
+        if len(pending) < 2 or self.max_parallel_pages < 2:
+            return 0 # Tek sayfa için refresh_village'ın sıralı yolu yeterli
+
+        start_time = time.time()
+        loaded = 0
+        if self.http and self.use_http_fast_path:
+            if not self.http.is_valid:
+                self._init_http_session()
+            http = self.http
+
+            def load(target: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+                village_id, page_name = target
+                page_html = http.fetch_html(page_name, {"newdid": village_id}) if http else None
+                if page_html is None:
+                    return None
+                return extract_dorf1_payload(page_html) if page_name == "dorf1.php" else extract_dorf2_payload(page_html)
+
+            with ThreadPoolExecutor(max_workers=self.max_parallel_pages, thread_name_prefix="village-fetch") as executor:
+                payloads = list(executor.map(load, pending))
+            failed = []
+            for target, payload in zip(pending, payloads):
+                if payload is None:
+                    failed.append(target)
+                else:
+                    self.page_state.store(target[1], target[0], payload); loaded += 1
+            pending = failed
+
+        if pending and self.context:
+            if not self.page_pool:
+                self.page_pool = PagePool(self.context, self.max_parallel_pages)
+            urls = [f"{self.server_url}/{page_name}?newdid={village_id}" for village_id, page_name in pending]
+            scripts = {"dorf1.php": DORF1_EXTRACT_JS, "dorf2.php": DORF2_EXTRACT_JS}
+            for page_name in scripts:
+                indexes = [i for i, target in enumerate(pending) if target[1] == page_name]
+                if not indexes:
+                    continue
+                payloads = self.page_pool.load_and_extract([urls[i] for i in indexes], scripts[page_name])
+                for i, payload in zip(indexes, payloads):
+                    if payload is not None:
+                        self.page_state.store(page_name, pending[i][0], payload); loaded += 1
+
+        # Paralel newdid istekleri sunucudaki aktif köyü değiştirdi; ana sayfada eylemden önce köy yeniden seçilmeli
+        self.page_state.active_village_id = None
+        logger.info(f"{loaded} köy sayfası {time.time() - start_time:.1f} sn'de paralel çekildi (eşzamanlılık: {self.max_parallel_pages}).")
+        return loaded
+
+    def _goto_village_page(self, village_id: str, page_name: str) -> bool:
+        """Köyün dorf1/dorf2 sayfasını `newdid` ile bir kez yükler. Navigasyon başarılıysa True döner."""
+        self.page.goto(f"{self.server_url}/{page_name}?newdid={village_id}", wait_until="domcontentloaded")
+        self.current_village_id = village_id
+        # Yönlendirme sonrası URL'de newdid kalmayabilir; aktif köy açıkça kaydedilir
+        self.page_state.record_navigation(self.page.url, village_id)
+        return self.page.url.split('?')[0].endswith(page_name)
+
     def get_village_buildings(self, village_id: Optional[str] = None) -> List[Building]:
         if not self.page or not self._is_active:
             logger.error("Sayfa mevcut değil veya aktif oturum yok. Binalar çekilemiyor."); return []
@@ -473,142 +675,22 @@ class TravianClient:
         target_village_id = village_id or self.current_village_id
         if not target_village_id: logger.error("Bina çekmek için köy ID'si belirlenemedi."); return []
         
-        buildings: List[Building] = []
         try:
             # 1. Kaynak Alanları (dorf1.php)
             logger.info(f"Kaynak alanı binaları dorf1.php'den (köy ID: {target_village_id}) çekiliyor...")
-            self.navigate_to_village(target_village_id) # Ensures on dorf1
-            if not self.page.url.split('?')[0].endswith("dorf1.php"):
+            dorf1_payload = self._get_village_payload(target_village_id, "dorf1.php")
+            if dorf1_payload is None:
                  logger.error(f"Kaynak alanı için dorf1.php (köy {target_village_id}) navigasyonu başarısız.")
                  return []
-
-            # Selector for resource fields. Needs verification against actual game HTML.
-            resource_field_elements = self.page.locator("div#resourceFieldContainer a.resourceField[data-aid]")
-            count = resource_field_elements.count()
-            logger.info(f"{count} kaynak alanı elementi bulundu (Selektör: div#resourceFieldContainer a.resourceField[data-aid]).")
-
-            for i in range(count):
-                element = resource_field_elements.nth(i)
-                try:
-                    location_id = element.get_attribute("data-aid")
-                    gid = element.get_attribute("data-gid") # Building type ID
-                    title_text = element.get_attribute("title") or ""
-                    class_attr = element.get_attribute("class") or ""
-
-                    name = f"Kaynak GID {gid}" # Default name
-                    level = 0
-                    
-                    # Try to parse name and level from title (e.g., "Woodcutter <span class='level'>Level 2</span>||Upgrade to level 3...")
-                    # This parsing is fragile and highly dependent on game localization and HTML structure.
-                    title_main_part = title_text.split("||")[0]
-                    name_match_html = re.match(r'(.+?)<span class="level">Seviye\s*(\d+)</span>', title_main_part, re.IGNORECASE)
-                    name_match_simple = re.match(r'(.+?)\s+Seviye\s*(\d+)', title_main_part, re.IGNORECASE)
-
-                    if name_match_html:
-                        name = name_match_html.group(1).strip()
-                        level = int(name_match_html.group(2))
-                    elif name_match_simple:
-                        name = name_match_simple.group(1).strip()
-                        level = int(name_match_simple.group(2))
-                    elif title_main_part and "Seviye" not in title_main_part : # e.g. "Woodcutter" (level 0 or not shown)
-                        name = title_main_part.strip()
-                        level = 0 # Assume 0 if not specified in title and no level class found later
-
-                    # Override or confirm level from class attribute (e.g., class="... level5 ...")
-                    level_class_match = re.search(r'\blevel(\d+)\b', class_attr)
-                    if level_class_match:
-                        level_from_class = int(level_class_match.group(1))
-                        if level_from_class > level : # Prefer higher level if discrepancy, or if title parsing failed
-                            level = level_from_class
-                        if name == f"Kaynak GID {gid}" and title_main_part: # if name parsing failed but title exists
-                            name = title_main_part.split("<span")[0].strip() or f"Kaynak GID {gid} L{level}"
-
-
-                    # Basic check if it's a known building type or just an empty plot to be built
-                    if name == f"Kaynak GID {gid}" and gid == "0": # GID 0 is often an empty plot
-                        name = "Boş Alan (Kaynak)"
-
-                    is_under_construction = "underConstruction" in class_attr
-                    
-                    if location_id: # Must have location_id
-                         buildings.append(Building(name=name, level=level, location_id=location_id, gid=gid)) # Removed is_under_construction from dataclass
-                         logger.debug(f"Kaynak alanı eklendi: Name='{name}', Level={level}, LocID='{location_id}', GID='{gid}', UnderConstruction={is_under_construction}")
-                    else:
-                        logger.warning(f"Kaynak alanı atlanıyor (konum ID yok): title='{title_text}', class='{class_attr}'")
-                except Exception as field_e:
-                    logger.debug(f"Kaynak alanı (index {i}) ayrıştırılamadı: {field_e}. Element HTML (outer): {element.evaluate('node => node.outerHTML') if element else 'N/A'}")
-            
-            logger.info(f"{len(buildings)} kaynak alanı binası çekildi.")
-            initial_building_count = len(buildings)
+            buildings = parse_resource_fields_payload(dorf1_payload)
 
             # 2. Köy Merkezi Binaları (dorf2.php)
             logger.info(f"Köy merkezi binaları dorf2.php'den (köy ID: {target_village_id}) çekiliyor...")
-            self.page.goto(f"{self.server_url}/dorf2.php?newdid={target_village_id}", wait_until="domcontentloaded")
-            self.current_village_id = target_village_id # Update current village ID
+            dorf2_payload = self._get_village_payload(target_village_id, "dorf2.php")
+            center_buildings = parse_village_center_payload(dorf2_payload) if dorf2_payload is not None else []
+            buildings.extend(center_buildings)
 
-            # Selector for building slots in village center. Needs verification.
-            building_slot_elements = self.page.locator("div#villageContent div.buildingSlot[data-gid], map#map2 area[gid]") # Common patterns
-            count_dorf2 = building_slot_elements.count()
-            logger.info(f"dorf2'de {count_dorf2} potansiyel bina slotu/alanı bulundu.")
-            
-            for i in range(count_dorf2):
-                element = building_slot_elements.nth(i)
-                try:
-                    gid = element.get_attribute("data-gid")
-                    if not gid or gid == "0": # Skip empty slots
-                        continue
-
-                    # Name from title attribute (e.g., "Main Building Level 1") or alt attribute for map areas
-                    name_from_title_attr = element.get_attribute("data-title") or element.get_attribute("title") or element.get_attribute("alt") or ""
-                    name = name_from_title_attr.split(" Seviye")[0].strip() if " Seviye" in name_from_title_attr else name_from_title_attr.strip()
-                    if not name: name = f"Bina GID {gid}"
-
-
-                    level = 0
-                    # Level from label layer text or class
-                    level_text_from_label_el = element.locator("div.labelLayer")
-                    if level_text_from_label_el.is_visible(timeout=50): # Very short timeout, may not exist
-                        level_text_from_label = level_text_from_label_el.inner_text().strip()
-                        level = self._get_safe_int_from_text(level_text_from_label, name + " Seviyesi", default_value=0) # default 0
-                    
-                    # Level from class (e.g. levelX)
-                    class_attr = element.get_attribute("class") or ""
-                    level_class_match = re.search(r'\blevel(\d+)\b', class_attr)
-                    if level_class_match:
-                        level_from_class = int(level_class_match.group(1))
-                        if level_from_class > level: level = level_from_class
-                    
-                    if level == 0 and "Seviye" in name_from_title_attr: # Try parsing from title if other methods yield 0
-                        level_match_title = re.search(r'Seviye\s*(\d+)', name_from_title_attr)
-                        if level_match_title: level = int(level_match_title.group(1))
-
-
-                    # location_id from class (aXX) or from 'href' (build.php?id=XX) for map areas
-                    location_id = None
-                    loc_id_match_class = re.search(r'\ba(\d+)\b', class_attr) # e.g. "a19" for slot 19
-                    if loc_id_match_class:
-                        location_id = loc_id_match_class.group(1)
-                    
-                    if not location_id:
-                        href_attr = element.get_attribute("href")
-                        if href_attr:
-                            loc_id_match_href = re.search(r'[?&]id=(\d+)', href_attr)
-                            if loc_id_match_href:
-                                location_id = loc_id_match_href.group(1)
-                    
-                    if not location_id:
-                        logger.warning(f"{name} (GID: {gid}) için konum ID'si bulunamadı, atlanıyor. Class: '{class_attr}', Title: '{name_from_title_attr}'")
-                        continue
-                    
-                    # is_under_construction = "underConstruction" in class_attr (removed from Building dataclass)
-
-                    buildings.append(Building(name=name, level=level, gid=gid, location_id=location_id))
-                    logger.debug(f"Köy merkezi binası eklendi: Name='{name}', Level={level}, LocID='{location_id}', GID='{gid}'")
-
-                except Exception as building_e:
-                    logger.debug(f"Köy binası slotu (index {i}, GID: {element.get_attribute('data-gid') if element else 'N/A'}) ayrıştırılamadı: {building_e}")
-            
-            logger.info(f"Toplam {len(buildings) - initial_building_count} köy merkezi binası çekildi. Genel toplam: {len(buildings)}")
+            logger.info(f"Toplam {len(center_buildings)} köy merkezi binası çekildi. Genel toplam: {len(buildings)}")
             return buildings
         except Exception as e:
             logger.error(f"Binaları köy {target_village_id} için çekerken genel hata: {e}", exc_info=True)
@@ -621,53 +703,19 @@ class TravianClient:
         target_village_id = village_id or self.current_village_id
         if not target_village_id: logger.error("İnşaat kuyruğu için köy ID'si belirlenemedi."); return []
 
-        queue: List[Building] = []
         try:
-            self.navigate_to_village(target_village_id) # Ensures on dorf1
-            if not self.page.url.split('?')[0].endswith("dorf1.php"):
+            payload = self._get_village_payload(target_village_id, "dorf1.php")
+            if payload is None:
                  logger.error(f"İnşaat kuyruğu için dorf1.php (köy {target_village_id}) navigasyonu başarısız.")
                  return []
-            else: # Reload to get latest queue
-                self.page.reload(wait_until="domcontentloaded")
-
-
-            # Selector for building queue items. Needs verification.
-            queue_elements = self.page.locator("div.buildingList ul li")
-            count = queue_elements.count()
-            logger.info(f"{count} inşaat kuyruğu öğesi bulundu (köy {target_village_id}).")
 
-            for i in range(count):
-                element = queue_elements.nth(i)
-                try:
-                    name_level_text_element = element.locator("div.name")
-                    timer_span = element.locator("span.timer[data-value], span.timer[value]") # Look for data-value or value
-
-                    if not name_level_text_element.is_visible(timeout=200) or not timer_span.is_visible(timeout=200):
-                        logger.debug(f"Kuyruk öğesi {i} için isim/zamanlayıcı bulunamadı veya görünür değil.")
-                        continue
-
-                    name_level_text = name_level_text_element.inner_text().strip()
-                    
-                    duration_seconds_str = timer_span.get_attribute("data-value") or timer_span.get_attribute("value")
-                    duration_seconds = self._get_safe_int_from_text(duration_seconds_str, "Kuyruk Süresi")
-
-                    match = re.match(r'(.+?)\s+Seviye\s+(\d+)', name_level_text, re.IGNORECASE)
-                    if match:
-                        name = match.group(1).strip()
-                        level_being_built = int(match.group(2)) # This is the level it will become
-                        queue.append(Building(name=name, level=level_being_built, build_time_remaining=duration_seconds))
-                    else:
-                        logger.warning(f"Kuyruk öğesi metni anlaşılamadı: '{name_level_text}'")
-
-                except Exception as item_e:
-                    logger.warning(f"Kuyruk öğesi (index {i}) ayrıştırılırken hata: {item_e}")
-            
+            queue = parse_building_queue_payload(payload, target_village_id)
             logger.info(f"İnşaat kuyruğu köy {target_village_id} için çekildi: {len(queue)} öğe.")
             return queue
         except Exception as e:
             logger.error(f"İnşaat kuyruğunu köy {target_village_id} için çekerken hata: {e}", exc_info=True)
             return []
-    
+
     def get_troops_in_village(self, village_id: Optional[str] = None) -> List[Troop]:
         if not self.page or not self._is_active:
             logger.error("Sayfa mevcut değil veya aktif oturum yok. Askerler çekilemiyor."); return []
@@ -675,63 +723,13 @@ class TravianClient:
         target_village_id = village_id or self.current_village_id
         if not target_village_id: logger.error("Asker çekmek için köy ID'si belirtilmedi."); return []
         
-        troops_list: List[Troop] = []
         try:
-            self.navigate_to_village(target_village_id) # Ensures on dorf1
-            if not self.page.url.split('?')[0].endswith("dorf1.php"):
+            payload = self._get_village_payload(target_village_id, "dorf1.php")
+            if payload is None:
                  logger.error(f"Askerler için dorf1.php (köy {target_village_id}) navigasyonu başarısız.")
                  return []
-            else: # Reload to get latest troop counts
-                self.page.reload(wait_until="domcontentloaded")
 
-
-            # Selector for troop rows. Needs verification.
-            troop_rows = self.page.locator("div#villageInfoboxRightContent table#troops tbody tr, table.troop_details tbody tr") # Common patterns
-            count = troop_rows.count()
-            logger.info(f"{count} potansiyel asker satırı bulundu (köy {target_village_id}).")
-
-            if count == 0: # No table rows found
-                 logger.info(f"Köyde {target_village_id} asker tablosu bulunamadı veya boş.")
-                 return []
-            
-            # Check for "no troops" message if the table itself has a specific class or text
-            first_row_text_lc = troop_rows.first.inner_text().lower()
-            if "hazır yok" in first_row_text_lc or "no troops" in first_row_text_lc :
-                 if count == 1 : # Only one row and it says "no troops"
-                    logger.info(f"Köyde {target_village_id} asker bulunmuyor (mesaj: '{first_row_text_lc}').")
-                    return []
-
-
-            for i in range(count):
-                row = troop_rows.nth(i)
-                try:
-                    # td.ico img.unit OR td:first-child img.unit OR .uniticon img
-                    img_element = row.locator("td.ico img.unit, td:first-child img.unit, .uniticon img").first
-                    # td.num OR td.un OR .troop Gletscher
-                    count_element = row.locator("td.num, td.un, .troop").first
-
-                    if img_element.is_visible(timeout=100) and count_element.is_visible(timeout=100):
-                        type_name = img_element.get_attribute("alt") or img_element.get_attribute("title")
-                        if not type_name:
-                            class_attr = img_element.get_attribute("class") or ""
-                            match_class_troop = re.search(r'\bu(\d+)\b', class_attr) # e.g. u1, u11, u21 for Romans
-                            if match_class_troop: type_name = f"Birim u{match_class_troop.group(1)}"
-                        
-                        count_str = count_element.inner_text()
-                        count_val = self._get_safe_int_from_text(count_str, type_name or f"Asker Satırı {i}")
-
-                        if type_name and count_val > 0:
-                            troops_list.append(Troop(type_name=type_name, count=count_val))
-                            logger.debug(f"Bulunan asker: {type_name}, Sayı: {count_val}")
-                        elif type_name and count_val == 0 and not ("hazır yok" in count_str.lower() or "no troops" in count_str.lower()):
-                            logger.debug(f"Asker tipi '{type_name}' mevcut ama sayısı 0.")
-                        elif not type_name and count_val > 0 :
-                             logger.warning(f"Asker sayısı {count_val} bulundu ama tipi belirlenemedi. Satır: {row.inner_text()}")
-
-
-                except Exception as troop_row_e:
-                    logger.debug(f"Asker satırı (index {i}) ayrıştırılırken hata: {troop_row_e}. Satır içeriği: {row.inner_text(timeout=100) if row else 'N/A'}")
-            
+            troops_list = parse_troops_payload(payload, target_village_id)
             logger.info(f"Köy {target_village_id} için {len(troops_list)} farklı tipte, toplam {sum(t.count for t in troops_list)} asker çekildi.")
             return troops_list
         except Exception as e:
@@ -747,18 +745,18 @@ class TravianClient:
         if not target_village_id: logger.error("Yükseltme için köy ID'si belirtilmedi."); return False
         
         logger.warning(f"start_building_upgrade: '{building_name}' (Konum: {location_id}) köy {target_village_id}. Bu fonksiyonun build.php HTML'ine göre revize edilmesi gerekiyor.")
-        # 1. Navigate to village (dorf1 or dorf2)
-        self.navigate_to_village(target_village_id)
+        self.last_upgrade_cost = None
+        # 1. Navigate to the village page holding the slot (dorf1 for resource fields 1-18, dorf2 for village center 19+)
         # 2. Click on the building slot to go to build.php?id=location_id
         try:
-            # Try dorf1 (resource fields 1-18)
             if int(location_id) <= 18:
-                self.page.goto(f"{self.server_url}/dorf1.php?newdid={target_village_id}", wait_until="domcontentloaded")
+                page_name = "dorf1.php"
                 build_link_selector = f"a.resourceField[data-aid='{location_id}']" # Example
-            # Try dorf2 (village center 19+)
             else:
-                self.page.goto(f"{self.server_url}/dorf2.php?newdid={target_village_id}", wait_until="domcontentloaded")
+                page_name = "dorf2.php"
                 build_link_selector = f"div.buildingSlot.a{location_id} a, map#map2 area[href*='id={location_id}']" # Examples
+            if not self.page_state.is_on(page_name, target_village_id): # Tarayıcı zaten bu sayfadaysa tekrar yüklenmez
+                self._goto_village_page(target_village_id, page_name)
 
             slot_link = self.page.locator(build_link_selector).first
             if slot_link.is_visible():
@@ -778,6 +776,7 @@ class TravianClient:
                 logger.info(f"'{building_name}' için yükseltme butonu bulundu, tıklanıyor...")
                 upgrade_button.click()
                 self.page.wait_for_load_state("domcontentloaded") # Wait for action to complete
+                self.page_state.invalidate(target_village_id) # Kuyruk ve kaynaklar değişti
                 # Check for success (e.g., redirect back to dorf1/dorf2, or message)
                 if "dorf1.php" in self.page.url or "dorf2.php" in self.page.url:
                     logger.info(f"'{building_name}' yükseltmesi başarıyla başlatıldı (dorf1/dorf2 yönlendirmesi).")
@@ -791,6 +790,7 @@ class TravianClient:
                 return True # Optimistic, assumes it worked if no immediate error
             else:
                 logger.warning(f"'{building_name}' için yükseltme butonu bulunamadı veya pasif. Kaynak/önkoşul eksik olabilir.")
+                self.last_upgrade_cost = self._read_upgrade_cost()
                 return False
 
         except Exception as e:
@@ -798,6 +798,15 @@ class TravianClient:
             return False
 
 
+    def _read_upgrade_cost(self) -> Optional[Dict[str, int]]:
+        """Açık build.php sayfasından sonraki seviyenin maliyetini okur; okunamazsa None."""
+        cost_texts = self.page.evaluate(UPGRADE_COST_JS)
+        if not cost_texts or len(cost_texts) < 4:
+            return None
+        cost = {res: safe_int(text, f"Yükseltme Maliyeti ({res})") for res, text in zip(["wood", "clay", "iron", "crop"], cost_texts)}
+        logger.info(f"Yükseltme maliyeti okundu: {cost}")
+        return cost
+
     def train_troops(self, village_id: str, troop_type: str, amount: int) -> bool:
         # troop_name_map and troop_counts from original seems to be for multiple troops.
         # This is simplified to one troop type and amount, BotEngine should loop if multiple.
@@ -826,63 +835,22 @@ class TravianClient:
             logger.error("Sayfa mevcut değil veya aktif oturum yok. Kahraman durumu çekilemiyor."); return None
         try:
             logger.info("Kahraman durumu çekiliyor (hero.php)...")
-            self.page.goto(f"{self.server_url}/hero", wait_until="domcontentloaded", timeout=20000)
-
-            # Health: Often a percentage in a title or a specific element text
-            # Example selectors, these WILL need verification for your Travian version
-            health_el = self.page.locator("div.health svg title, .heroDashboardGeneral #health tooltip, .healthPath title").first
-            health = 0
-            if health_el.is_visible(timeout=1000):
-                health_text = health_el.inner_text() # e.g., "Health: 100%"
-                health_match = re.search(r'(\d+)%', health_text)
-                if health_match: health = int(health_match.group(1))
-            
-            # Experience: Similar to health
-            exp_el = self.page.locator("div.experience svg title, .heroDashboardGeneral #experience tooltip, .experiencePath title").first
-            experience = 0
-            if exp_el.is_visible(timeout=1000):
-                exp_text = exp_el.inner_text() # e.g., "Experience: 50%"
-                exp_match = re.search(r'(\d+)%', exp_text)
-                if exp_match: experience = int(exp_match.group(1))
-
-            # Status: "Home", "Adventure", "Reinforcing Village X", "Attacking Y"
-            # This is usually a text element.
-            status_el = self.page.locator(".heroStatus div.text, .heroStatusMessage, #heroStatus div.movements div.text").first # Highly variable
-            status = "Bilinmiyor"
-            if status_el.is_visible(timeout=1000):
-                 status_text_raw = status_el.inner_text().lower()
-                 if "evde" in status_text_raw or "köyde" in status_text_raw or "home" in status_text_raw: status = "Evde"
-                 elif "macera" in status_text_raw or "adventure" in status_text_raw: status = "Macerada"
-                 elif "yolda" in status_text_raw or "returning" in status_text_raw or "outgoing" in status_text_raw: status = "Yolda"
-                 else: status = status_el.inner_text().strip() # Use raw if not recognized
-
-            # Adventure available: Often a button with a count or a specific class
-            # The log showed 'a#button683f34ec7308a' before, which is too specific.
-            # General adventure button often on dorf1 or hero page.
-            # Check for a link to /hero/adventures or a specific adventure button.
-            adventure_button_dorf1_sidebar = self.page.locator("div#sidebarBoxHero div.layoutButton.adventureWhite") # Typical dorf1 sidebar
-            adventure_link_hero_page = self.page.locator("a[href*='hero/adventures'], .adventureListAvailable .adventureSlot") # On hero page
-
-            adventure_available = False
-            if adventure_button_dorf1_sidebar.is_visible(timeout=500) and not adventure_button_dorf1_sidebar.get_attribute("class",timeout=100).contains("disable"):
-                adventure_available = True
-            elif self.page.url.endswith("/hero"): # If on hero page, check specific links
-                 if adventure_link_hero_page.count() > 0 : adventure_available = True
-
-            # If still not found, try the specific ID from logs as a last resort (but it's bad practice)
-            # adventure_button_specific_id = self.page.locator("a#button683f34ec7308a")
-            # if adventure_button_specific_id.is_visible(timeout=100):
-            #     if self._get_safe_int_from_text(adventure_button_specific_id.locator("div.content").inner_text()) > 0:
-            #         adventure_available = True
-
-            hero = HeroStatus(health=health, experience=experience, status=status, adventure_available=adventure_available)
+            payload = None
+            if self.http and self.use_http_fast_path:
+                hero_html = self.fetch_page_html("hero")
+                if hero_html is not None:
+                    payload = extract_hero_payload(hero_html)
+            if payload is None:
+                self.page.goto(f"{self.server_url}/hero", wait_until="domcontentloaded", timeout=20000)
+                payload = self._extract_page_payload(HERO_EXTRACT_JS)
+
+            hero = parse_hero_payload(payload)
             logger.info(f"Kahraman durumu: Sağlık={hero.health}%, Deneyim={hero.experience}%, Durum='{hero.status}', Macera Mevcut={hero.adventure_available}")
             return hero
         except Exception as e:
             logger.error(f"Kahraman durumunu çekerken hata: {e}", exc_info=True)
             return None
 
-
     def send_hero_to_adventure(self) -> bool:
         if not self.page or not self._is_active: logger.error("Sayfa mevcut değil."); return False
         logger.warning("send_hero_to_adventure fonksiyonu hero/adventures HTML'ine göre revize edilmelidir.")
@@ -898,6 +866,7 @@ class TravianClient:
             if start_adventure_button.is_visible(timeout=3000):
                 logger.info("Uygun bir macera ('Maceraya Başla' butonu) bulundu, tıklanıyor...")
                 start_adventure_button.click()
+                self.page_state.invalidate(path="dorf1.php") # Kahraman asker tablosundan çıkar
                 # Some versions have an immediate confirmation page, some don't.
                 # Wait for navigation or confirmation.
                 try:
@@ -933,14 +902,13 @@ class TravianClient:
         # troops_to_send is {'TroopTypeName': count}, e.g. {'Lejyoner': 10}
         # This needs a mapping from TroopTypeName to the game's input field names (e.g. 't1', 't2')
         if not self.page or not self._is_active: logger.error("Sayfa mevcut değil."); return False
-        logger.warning(f"send_raid: Köy {source_village_id} -> {target_coords} ile {troops_to_send}. Bu fonksiyonun Askeri Üs HTML'ine göre revize edilmesi gerekiyor.")
+        if self.use_http_fast_path and self.http and self.http.is_valid:
+            result, self.tribe = send_raid_over_http(self.http, source_village_id, target_coords, troops_to_send, self.tribe)
+            if result is not None:
+                self.page_state.invalidate(source_village_id, "dorf1.php") # Köydeki asker sayıları değişti
+                return result
+            logger.info("Askeri üs HTTP hızlı yolu kullanılamadı, yağma tarayıcı ile gönderiliyor.")
 
-        # Example mapping (ROMANS). This should be part of game config or tribe specific.
-        troop_name_to_input_field = {
-            "Lejyoner": "t1", "Praetorian": "t2", "Imperian": "t3",
-            "Equites Legati": "t4", "Equites Imperatoris": "t5", "Equites Caesaris": "t6",
-            # ... other troops and other tribes
-        }
 
         try:
             # 1. Navigate to Rally Point (gid=16) of the source_village_id
@@ -952,7 +920,7 @@ class TravianClient:
 
             # 3. Fill troop amounts
             for troop_name, count in troops_to_send.items():
-                input_field_name = troop_name_to_input_field.get(troop_name)
+                input_field_name = unit_field(troop_name, self.tribe)
                 if not input_field_name:
                     logger.warning(f"Asker tipi '{troop_name}' için giriş alanı adı bilinmiyor. Atlanıyor.")
                     continue
@@ -972,6 +940,7 @@ class TravianClient:
             send_button_rallypoint = self.page.locator("button#btn_ok, button.green.sendTroops").first
             if send_button_rallypoint.is_visible():
                 send_button_rallypoint.click()
+                self.page_state.invalidate(source_village_id, "dorf1.php") # Köydeki asker sayıları değişecek
                 self.page.wait_for_load_state("domcontentloaded") # Wait for confirmation page
             else:
                 logger.error("Askeri Üs'te 'Gönder' butonu bulunamadı.")
@@ -996,6 +965,55 @@ class TravianClient:
             logger.error(f"Yağma gönderirken hata ({source_village_id} -> {target_coords}): {e}", exc_info=True)
             return False
 
+    def _game_api(self, method: str, path: str, body: Any = None) -> Optional[Any]:
+        """Oyunun JSON API'sine sayfanın oturumuyla tek istek atar (navigasyon yok). 2xx değilse None döner."""
+        if not self.page or not self._is_active:
+            logger.error("Oyun API isteği atılamıyor: sayfa yok veya aktif oturum yok."); return None
+        try:
+            response = self.page.evaluate(GAME_API_JS, {"method": method, "path": path, "body": body})
+        except PlaywrightError as e:
+            logger.warning(f"Oyun API isteği başarısız ({method} {path}): {e}")
+            return None
+        if not 200 <= response.get("status", 0) < 300:
+            logger.warning(f"Oyun API isteği {response.get('status')} döndü ({method} {path}): {str(response.get('body'))[:200]}")
+            return None
+        return response.get("body") if response.get("body") is not None else {}
+
+    def get_farm_lists(self) -> Optional[List[NativeFarmList]]:
+        """Hesabın yerleşik yağma listelerini hedefleriyle birlikte tek istekte okur."""
+        body = self._game_api("POST", GRAPHQL_API_PATH, {"query": FARM_LISTS_QUERY, "variables": {}})
+        farm_lists = parse_farm_lists_response(body) if body is not None else None
+        if farm_lists is not None:
+            self.farm_list_villages = {farm_list.id: farm_list.village_id for farm_list in farm_lists}
+        return farm_lists
+
+    def create_farm_list(self, village_id: str, name: str) -> bool:
+        return self._game_api("POST", FARM_LISTS_API_PATH, {"villageId": int(village_id), "name": name, "defaultUnits": {}}) is not None
+
+    def add_farm_list_slots(self, slots: List[Dict[str, Any]]) -> bool:
+        return self._game_api("POST", FARM_LIST_SLOT_API_PATH, {"slots": slots}) is not None
+
+    def update_farm_list_slots(self, slots: List[Dict[str, Any]]) -> bool:
+        return self._game_api("PUT", FARM_LIST_SLOT_API_PATH, {"slots": slots}) is not None
+
+    def delete_farm_list_slots(self, slot_ids: List[int]) -> bool:
+        return self._game_api("DELETE", FARM_LIST_SLOT_API_PATH, {"slotIds": slot_ids}) is not None
+
+    def send_farm_lists(self, slots_by_list: Dict[int, List[int]]) -> Optional[Dict[int, bool]]:
+        """
+        Yerleşik yağma listelerindeki seçili hedefleri (liste ID -> slot ID'leri) tek istekte gönderir.
+        Slot ID -> gönderildi mi döner; istek hiç gönderilemediyse None.
+        """
+        body = self._game_api("POST", FARM_LIST_SEND_API_PATH, send_request_body(slots_by_list))
+        if body is None:
+            return None
+        for list_id in slots_by_list:
+            if list_id in self.farm_list_villages:
+                self.page_state.invalidate(self.farm_list_villages[list_id], "dorf1.php") # Köydeki asker sayıları değişti
+        results = parse_send_response(body, slots_by_list)
+        logger.info(f"{len(slots_by_list)} yağma listesinden {sum(results.values())}/{len(results)} hedef tek istekte gönderildi.")
+        return results
+
     def get_nearby_village_info(self, center_village_id: str, radius: int = 7) -> List[Dict[str, Any]]:
         # This function requires navigating to the map and parsing it.
         # Map parsing is complex and highly dependent on the game's JavaScript and HTML.
@@ -1003,7 +1021,6 @@ class TravianClient:
         logger.warning(f"`get_nearby_village_info` köy {center_village_id} (yarıçap: {radius}) için SİMÜLE EDİLMİŞ veri döndürüyor. Gerçek implementasyon gerekiyor.")
         
         # Placeholder implementation - returns dummy data
-        simulated_targets = []
         if not self.page or not self._is_active:
             logger.error("Harita verisi çekilemiyor: Sayfa yok veya aktif oturum yok.")
             return []
@@ -1022,20 +1039,67 @@ class TravianClient:
         # except Exception as e:
         #    logger.error(f"Yakındaki köy bilgileri çekilirken (simülasyon aşamasında hata): {e}")
 
-        # Example simulated data:
-        for i in range(random.randint(3, 8)):
-            sim_type = random.choice(["village", "oasis_wood", "oasis_clay", "oasis_iron", "oasis_crop", "oasis_wood_crop"])
-            sim_pop = random.randint(2, 300) if sim_type == "village" else 0
-            sim_player_status = "inaktif" if sim_pop < 50 and sim_type == "village" else "bilinmiyor"
-            if "oasis" in sim_type : sim_player_status = "vaha"
-
-            simulated_targets.append({
-                "name": f"Simüle Köy/Vaha {i+1}",
-                "coords": {"x": random.randint(-radius, radius), "y": random.randint(-radius, radius)}, # Relative to center
-                "population": sim_pop,
-                "type": sim_type,
-                "player_status": sim_player_status,
-                "defense_hint": "bilinmiyor" if sim_type == "village" else "natar" if "oasis" in sim_type else "zayıf"
-            })
-        logger.info(f"Simülasyon: {len(simulated_targets)} adet yakındaki köy/vaha bilgisi oluşturuldu.")
-        return simulated_targets
+        return simulate_nearby_villages(radius)
+
+
+def send_raid_over_http(http: "TravianHttpSession", source_village_id: str, target_coords: Dict[str, int], troops_to_send: Dict[str, int],
+                        tribe: Optional[str] = None) -> Tuple[Optional[bool], Optional[str]]:
+    """
+    Yağmayı tarayıcısız gönderir: askeri üs formu bir kez okunur (gizli alanlar dahil), gönderme ve onay adımları
+    doğrudan POST edilir; başarı onay yanıtından okunur. (sonuç, formdan öğrenilen kabile) döner. Sonuç None ise
+    asker gönderilmemiştir ve tarayıcı yolu denenebilir; onay adımından sonra belirsizlik False sayılır (çift gönderim olmasın).
+    """
+    form_html = http.fetch_html("build.php", {"newdid": source_village_id, "gid": 16, "tt": 2})
+    send_form = extract_rally_send_form(form_html) if form_html else None
+    if not send_form:
+        return None, tribe
+    tribe = send_form.tribe or tribe
+    units = {}
+    for troop_name, count in troops_to_send.items():
+        field_name = unit_field(troop_name, tribe)
+        if field_name:
+            units[field_name] = count
+        else:
+            logger.warning(f"Asker tipi '{troop_name}' için form alanı bilinmiyor ({tribe or 'kabile bilinmiyor'}). Atlanıyor.")
+    if not units:
+        return False, tribe
+
+    form_url = f"{http.server_url}/build.php?newdid={source_village_id}&gid=16&tt=2"
+    step = http.post_form(send_form.action, fill_raid_form(send_form, target_coords, units), referer=form_url)
+    if step is None:
+        return None, tribe # Gönderme adımı asker yollamaz; tarayıcı ile yeniden denemek güvenli
+    confirm_form = extract_rally_confirm_form(step[0])
+    if not confirm_form:
+        logger.warning(f"Askeri üs onay formu gelmedi ({source_village_id} -> {target_coords}): {extract_rally_error(step[0]) or 'beklenmeyen yanıt'}")
+        return False, tribe
+    result = http.post_form(confirm_form.action, confirm_form.fields, referer=step[1])
+    if result is None:
+        return False, tribe
+    success, error = parse_raid_result(*result)
+    if success:
+        logger.info(f"Yağma {target_coords} hedefine HTTP ile gönderildi ({units}).")
+    else:
+        logger.warning(f"Yağma {target_coords} hedefine gönderilemedi: {error}")
+    return success, tribe
+
+
+def simulate_nearby_villages(radius: int = 7) -> List[Dict[str, Any]]:
+    """Harita ayrıştırması yazılana kadar YZ yağma listesine verilen simüle köy/vaha bilgisi (koordinatlar merkeze göre)."""
+    simulated_targets = []
+    # Example simulated data:
+    for i in range(random.randint(3, 8)):
+        sim_type = random.choice(["village", "oasis_wood", "oasis_clay", "oasis_iron", "oasis_crop", "oasis_wood_crop"])
+        sim_pop = random.randint(2, 300) if sim_type == "village" else 0
+        sim_player_status = "inaktif" if sim_pop < 50 and sim_type == "village" else "bilinmiyor"
+        if "oasis" in sim_type : sim_player_status = "vaha"
+
+        simulated_targets.append({
+            "name": f"Simüle Köy/Vaha {i+1}",
+            "coords": {"x": random.randint(-radius, radius), "y": random.randint(-radius, radius)}, # Relative to center
+            "population": sim_pop,
+            "type": sim_type,
+            "player_status": sim_player_status,
+            "defense_hint": "bilinmiyor" if sim_type == "village" else "natar" if "oasis" in sim_type else "zayıf"
+        })
+    logger.info(f"Simülasyon: {len(simulated_targets)} adet yakındaki köy/vaha bilgisi oluşturuldu.")
+    return simulated_targets
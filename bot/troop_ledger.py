@@ -0,0 +1,102 @@
+# --- travian_bot_project/bot/troop_ledger.py ---
+import time
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .game_state import Village, unit_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Reservation:
+    village_id: str
+    troops: Dict[str, int] # asker anahtarı (unit_key) -> adet
+    sent_at: Optional[float] = None # None: kuyrukta, henüz gönderilmedi
+    return_at: Optional[float] = None
+
+
+class TroopLedger:
+    """
+    Köy başına yağmaya ayrılan askerlerin defteri. Evdeki asker sayısı son okunan `troops_home`dan, bu defterdeki
+    ayırmalar düşülüp dönenler eklenerek hesaplanır; böylece bir turda gönderilen askerler sayfa yeniden okunmadan
+    sonraki seçimlerde hesaba katılır. `reconcile` her asker okumasından sonra çağrılır: okumadan önce yola çıkmış
+    askerler sayfada zaten eksiktir, yalnızca okumadan sonra dönenler geri eklenir.
+    """
+    def __init__(self):
+        self._reservations: List[Reservation] = []
+        self._scraped_at: Dict[str, float] = {} # köy ID -> askerlerin son okunduğu zaman
+
+    def reserve(self, village_id: str, troops: Dict[str, int]) -> Reservation:
+        reservation = Reservation(village_id, {unit_key(name): int(count) for name, count in troops.items()})
+        self._reservations.append(reservation)
+        return reservation
+
+    def confirm(self, reservation: Reservation, sent_at: float, return_at: float):
+        """Askerler yola çıktı; `return_at`'ta yeniden kullanılabilir olurlar."""
+        reservation.sent_at, reservation.return_at = sent_at, return_at
+
+    def release(self, reservation: Optional[Reservation]):
+        """Gönderilemeyen yağmanın ayırması geri alınır."""
+        if reservation is not None and reservation in self._reservations:
+            self._reservations.remove(reservation)
+
+    def reconcile(self, village_id: str, scraped_at: float):
+        """Köyün askerleri `scraped_at` anında okundu; o ana kadar dönmüş ayırmalar artık sayfaya yansımıştır."""
+        self._scraped_at[village_id] = scraped_at
+        self._reservations = [r for r in self._reservations
+                              if r.village_id != village_id or r.return_at is None or r.return_at > scraped_at]
+
+    def _adjustment(self, village_id: str, key: str, now: float) -> int:
+        scraped_at = self._scraped_at.get(village_id, 0.0)
+        adjustment = 0
+        for reservation in self._reservations:
+            count = reservation.troops.get(key, 0)
+            if reservation.village_id != village_id or not count:
+                continue
+            if reservation.sent_at is None or reservation.sent_at >= scraped_at:
+                adjustment -= count if reservation.return_at is None or reservation.return_at > now else 0
+            elif scraped_at < reservation.return_at <= now:
+                adjustment += count # Okumada yoldaydı, o zamandan beri döndü
+        return adjustment
+
+    def available(self, village: Village, troop_name: str, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return max(0, village.troop_count(troop_name) + self._adjustment(village.id, unit_key(troop_name), now))
+
+    def away_at_scrape(self, village_id: str, key: str) -> int:
+        """Son okumada yolda olan (sayfada eksik görünen) `key` askerleri; köyün sahip olduğu toplamı bulmak için."""
+        scraped_at = self._scraped_at.get(village_id, 0.0)
+        return sum(r.troops.get(key, 0) for r in self._reservations
+                   if r.village_id == village_id and r.sent_at is not None and r.sent_at < scraped_at)
+
+    def owned(self, village: Village) -> Dict[str, int]:
+        """Köyün evde ve yolda olan tüm askerleri (asker anahtarı -> adet); iki okuma arasında değişmez."""
+        owned = {unit_key(troop.type_name): troop.count for troop in village.troops_home}
+        for reservation in self._reservations:
+            if reservation.village_id == village.id:
+                for key in reservation.troops:
+                    owned.setdefault(key, 0)
+        return {key: count + self.away_at_scrape(village.id, key) for key, count in owned.items()}
+
+    def next_return_time(self, village_id: Optional[str] = None) -> Optional[float]:
+        """Yoldaki askerlerin en erken dönüş zamanı (köy verilirse yalnızca o köyün)."""
+        now = time.time()
+        returns = [r.return_at for r in self._reservations
+                   if r.return_at is not None and r.return_at > now and (village_id is None or r.village_id == village_id)]
+        return min(returns) if returns else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Yoldaki (gönderilmiş) ayırmalar; durum anlık görüntüsüne yazılır."""
+        return [{"village_id": r.village_id, "troops": r.troops, "sent_at": r.sent_at, "return_at": r.return_at}
+                for r in self._reservations if r.sent_at is not None]
+
+    def load(self, entries: List[Dict[str, Any]]):
+        now = time.time()
+        self._reservations = [Reservation(e["village_id"], e["troops"], e["sent_at"], e["return_at"])
+                              for e in entries if e.get("return_at") and e["return_at"] > now]
+        self._scraped_at.clear()
+
+    def __len__(self) -> int:
+        return len(self._reservations)
@@ -0,0 +1,105 @@
+# --- travian_bot_project/bot/units.py ---
+# Kabile başına birim tabloları. Oyun birimleri sayfada `u<N>` sınıfıyla gösterir (Romalılar u1-u10, Cermenler u11-u20,
+# Galyalılar u21-u30, ...); askeri üs formunda aynı birim kabile içindeki sırasıyla t1..t10 alanına yazılır.
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .game_state import unit_key
+
+# Kabile adı -> 10 birimin bilinen adları (Türkçe sunucu adı ve İngilizce karşılığı); sıra t1..t10 ile aynıdır
+TRIBE_UNITS: Dict[str, Tuple[Tuple[str, ...], ...]] = {
+    "romans": (("Lejyoner", "Legionnaire"), ("Praetorian",), ("Imperian",), ("Equites Legati",), ("Equites Imperatoris",),
+               ("Equites Caesaris",), ("Koçbaşı", "Battering Ram"), ("Ateş Mancınığı", "Fire Catapult"), ("Senatör", "Senator"), ("Göçmen", "Settler")),
+    "teutons": (("Tokmak Sallayan", "Clubswinger"), ("Mızrakçı", "Spearman"), ("Baltacı", "Axeman"), ("Casus", "Scout"), ("Paladin",),
+                ("Toyton Şövalyesi", "Teutonic Knight"), ("Koçbaşı", "Ram"), ("Mancınık", "Catapult"), ("Reis", "Chief"), ("Göçmen", "Settler")),
+    "gauls": (("Falanks", "Phalanx"), ("Kılıçlı", "Swordsman"), ("Casus", "Pathfinder"), ("Toytatın Şimşeği", "Theutates Thunder"), ("Druyid", "Druidrider"),
+              ("Heduan", "Haeduan"), ("Koçbaşı", "Ram"), ("Savaş Mancınığı", "Trebuchet"), ("Kabile Reisi", "Chieftain"), ("Göçmen", "Settler")),
+    "nature": (),
+    "natars": (),
+    "egyptians": (("Slave Militia",), ("Ash Warden",), ("Khopesh Warrior",), ("Sopdu Explorer",), ("Anhur Guard",),
+                  ("Resheph Chariot",), ("Ram",), ("Stone Catapult",), ("Nomarch",), ("Settler",)),
+    "huns": (("Mercenary",), ("Bowman",), ("Spotter",), ("Steppe Rider",), ("Marksman",),
+             ("Marauder",), ("Ram",), ("Catapult",), ("Logades",), ("Settler",)),
+}
+TRIBE_ORDER = tuple(TRIBE_UNITS) # u<N> sınıfındaki sıra: (N - 1) // 10
+
+# Birim hızları (alan/saat, sunucu hızı x1); sıra TRIBE_UNITS ile aynıdır
+UNIT_SPEEDS: Dict[str, Tuple[int, ...]] = {
+    "romans": (6, 5, 7, 16, 14, 10, 4, 3, 4, 5),
+    "teutons": (7, 7, 6, 9, 10, 9, 4, 3, 4, 5),
+    "gauls": (7, 6, 17, 19, 16, 13, 4, 3, 5, 5),
+    "nature": (),
+    "natars": (),
+    "egyptians": (7, 6, 7, 16, 15, 10, 4, 3, 4, 5),
+    "huns": (7, 6, 19, 16, 15, 14, 4, 3, 5, 5),
+}
+# Birim başına taşıma kapasitesi (toplam kaynak)
+UNIT_CARRY: Dict[str, Tuple[int, ...]] = {
+    "romans": (50, 20, 50, 0, 100, 70, 0, 0, 0, 3000),
+    "teutons": (60, 40, 50, 0, 110, 80, 0, 0, 0, 3000),
+    "gauls": (35, 45, 0, 75, 35, 65, 0, 0, 0, 3000),
+    "nature": (),
+    "natars": (),
+    "egyptians": (15, 50, 45, 0, 50, 70, 0, 0, 0, 3000),
+    "huns": (50, 30, 0, 75, 105, 80, 0, 0, 0, 3000),
+}
+
+_UNIT_CLASS_RE = re.compile(r'\bu(\d+)\b')
+_INDEX_BY_TRIBE: Dict[str, Dict[str, int]] = {
+    tribe: {unit_key(name): index for index, names in enumerate(units) for name in names}
+    for tribe, units in TRIBE_UNITS.items()
+}
+
+
+def tribe_from_unit_class(class_attr: str) -> Optional[str]:
+    """'unit u21' -> 'gauls'."""
+    match = _UNIT_CLASS_RE.search(class_attr or "")
+    if not match or int(match.group(1)) < 1:
+        return None
+    index = (int(match.group(1)) - 1) // 10
+    return TRIBE_ORDER[index] if index < len(TRIBE_ORDER) else None
+
+
+def troop_input_fields(tribe: str) -> Dict[str, str]:
+    """Kabilenin birim adı -> form alanı (t1..t10) eşlemesi (TROOP_INPUT_FIELDS biçiminde)."""
+    return {names[0]: f"t{index + 1}" for index, names in enumerate(TRIBE_UNITS.get(tribe, ()))}
+
+
+def _unit_slots(troop_name: str, tribe: Optional[str] = None) -> List[Tuple[str, int]]:
+    """
+    Asker adına karşılık gelen (kabile, sıra) çiftleri. Kabile verilmiş ve ad onun tablosundaysa yalnızca o döner;
+    değilse adın geçtiği tüm kabileler. Ayrıştırıcının sınıftan ürettiği 'Birim u23' adları tam olarak çözülür.
+    """
+    class_match = _UNIT_CLASS_RE.search(troop_name)
+    if class_match and troop_name.startswith("Birim "):
+        number = int(class_match.group(1))
+        tribe_index = (number - 1) // 10
+        return [(TRIBE_ORDER[tribe_index], (number - 1) % 10)] if number >= 1 and tribe_index < len(TRIBE_ORDER) else []
+    key = unit_key(troop_name)
+    if tribe and key in _INDEX_BY_TRIBE.get(tribe, {}):
+        return [(tribe, _INDEX_BY_TRIBE[tribe][key])]
+    return [(other, indexes[key]) for other, indexes in _INDEX_BY_TRIBE.items() if key in indexes]
+
+
+def unit_field(troop_name: str, tribe: Optional[str] = None) -> Optional[str]:
+    """
+    Asker adını askeri üs formundaki alana çevirir. Kabile bilinmiyorsa ad yalnızca tek bir alana
+    karşılık geliyorsa çözülür (örn. 'Casus' Cermenlerde t4, Galyalılarda t3'tür).
+    """
+    fields = {f"t{index + 1}" for _, index in _unit_slots(troop_name, tribe)}
+    return fields.pop() if len(fields) == 1 else None
+
+
+def _lowest_stat(table: Dict[str, Tuple[int, ...]], troop_name: str, tribe: Optional[str]) -> Optional[int]:
+    values = [table[slot_tribe][index] for slot_tribe, index in _unit_slots(troop_name, tribe) if index < len(table[slot_tribe])]
+    return min(values) if values else None
+
+
+def unit_speed(troop_name: str, tribe: Optional[str] = None) -> Optional[int]:
+    """Birimin hızı (alan/saat). Kabile bilinmiyor ve ad birden çok kabilede geçiyorsa en yavaşı alınır."""
+    return _lowest_stat(UNIT_SPEEDS, troop_name, tribe)
+
+
+def unit_carry(troop_name: str, tribe: Optional[str] = None) -> int:
+    """Birimin taşıma kapasitesi; bilinmiyorsa 0. Kabile bilinmiyorsa (unit_speed gibi) en düşüğü alınır."""
+    return _lowest_stat(UNIT_CARRY, troop_name, tribe) or 0
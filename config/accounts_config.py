@@ -0,0 +1,71 @@
+# --- travian_bot_project/config/accounts_config.py ---
+import os
+import json
+import logging
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan hesap listesi dosyası; şifre içerebileceği için git'e eklenmez (örnek: accounts.example.json)
+DEFAULT_ACCOUNTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "accounts.json")
+
+@dataclass
+class AccountConfig:
+    """Tek bir Travian hesabının çalıştırma ayarları."""
+    server_url: str
+    username: str
+    password: str = ""
+    password_env: Optional[str] = None # Şifre dosyada değil bu ortam değişkeninde (.env) tutulur
+    network_profile: Optional[str] = None # "lean" / "full"; boşsa sunucu varsayılanı
+    max_parallel_pages: int = 2
+    min_request_interval: float = 1.5 # Hesap başına iki sunucu isteği arası ortalama en az süre (sn)
+    request_burst: int = 3
+    raid_interval: float = 15.0 # Tek tek gönderilen yağmalar arası ortalama süre (sn); her aralık raid_interval/2 ile 3*raid_interval/2 arasında rastgeledir
+    raid_backlog: int = 50 # Gönderim kuyruğunda bekleyebilecek en fazla yağma
+    server_speed: float = 1.0 # Sunucunun asker hızı çarpanı; yağma dönüş süreleri ve hedef beklemeleri buna göre hesaplanır
+    enabled: bool = True
+    # Köy ID'si veya adı -> {"build_queue": [...], "troop_training": {...}}; "*" anahtarı diğer tüm köyler için geçerlidir
+    village_plans: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.username}@{self.server_url}"
+
+    def resolve_password(self) -> str:
+        if self.password_env:
+            return os.getenv(self.password_env, "")
+        return self.password
+
+
+def load_account_configs(path: Optional[str] = None) -> List[AccountConfig]:
+    """
+    JSON hesap listesini okur: `{"accounts": [{"server_url": ..., "username": ..., "password_env": ...}, ...]}`
+    veya doğrudan bir liste. Bilinmeyen alanlar uyarıyla atlanır; şifresi çözülemeyen ve pasif hesaplar dahil edilmez.
+    """
+    load_dotenv()
+    path = path or DEFAULT_ACCOUNTS_PATH
+    with open(path, encoding="utf-8") as accounts_file:
+        raw = json.load(accounts_file)
+    entries = raw.get("accounts", []) if isinstance(raw, dict) else raw
+    known_fields = {f.name for f in fields(AccountConfig)}
+
+    configs: List[AccountConfig] = []
+    for index, entry in enumerate(entries):
+        unknown = set(entry) - known_fields
+        if unknown:
+            logger.warning(f"Hesap #{index}: bilinmeyen alanlar atlanıyor: {sorted(unknown)}")
+        try:
+            config = AccountConfig(**{k: v for k, v in entry.items() if k in known_fields})
+        except TypeError as e:
+            logger.error(f"Hesap #{index} geçersiz: {e}")
+            continue
+        if not config.enabled:
+            continue
+        if not config.resolve_password():
+            logger.error(f"Hesap {config.key} için şifre bulunamadı (password / password_env). Atlanıyor.")
+            continue
+        configs.append(config)
+    logger.info(f"{path} dosyasından {len(configs)} hesap yüklendi.")
+    return configs
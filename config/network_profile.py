@@ -0,0 +1,79 @@
+# --- travian_bot_project/config/network_profile.py ---
+from dataclasses import dataclass, replace
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """Tarayıcı context'inin hangi istekleri yükleyeceğini ve yavaşlatma (slow_mo) ayarını tanımlar."""
+    name: str
+    blocked_resource_types: FrozenSet[str] = frozenset()
+    blocked_url_patterns: Tuple[str, ...] = ()  # URL içinde geçen alt dizeler (üçüncü taraf hostlar, ödeme sihirbazı vb.)
+    slow_mo: int = 0  # ms; 0 yapay gecikme yok demektir
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.blocked_resource_types:
+            return True
+        url_lc = url.lower()
+        return any(pattern in url_lc for pattern in self.blocked_url_patterns)
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.blocked_resource_types or self.blocked_url_patterns)
+
+
+# Ayrıştırma için sadece belge, betik ve XHR/fetch yanıtları gerekir; görseller, yazı tipleri,
+# sprite'lar ve stil dosyaları atlanır. Oyunun kendi betikleri (cdn.*.travian.com) engellenmez.
+LEAN_PROFILE = NetworkProfile(
+    name="lean",
+    blocked_resource_types=frozenset({"image", "media", "font", "stylesheet"}),
+    blocked_url_patterns=(
+        "payment", "googletagmanager.com", "google-analytics.com", "doubleclick.net",
+        "facebook.net", "hotjar.com", "sentry.io", "discord.gg", "blog.travian.com",
+    ),
+)
+
+# Eski davranış: her şey yüklenir, slow_mo=50
+FULL_PROFILE = NetworkProfile(name="full", slow_mo=50)
+
+NETWORK_PROFILES: Dict[str, NetworkProfile] = {profile.name: profile for profile in (LEAN_PROFILE, FULL_PROFILE)}
+
+# Sunucuya özel ayarlar (host -> profil). Bir sunucu bir kaynağa ihtiyaç duyuyorsa (ör. captcha görselleri)
+# burada ilgili profil türetilerek kaydedilir, örn.:
+#   "ts1.travian.com.tr": replace(LEAN_PROFILE, blocked_resource_types=frozenset({"media", "font"})),
+SERVER_NETWORK_PROFILES: Dict[str, NetworkProfile] = {}
+
+
+def get_network_profile(server_url: str, profile_name: Optional[str] = None) -> NetworkProfile:
+    """
+    Sunucu için kullanılacak ağ profilini döndürür. `profile_name` verilirse ("lean"/"full") o profil,
+    verilmezse sunucuya özel kayıt, o da yoksa yalın (lean) profil kullanılır.
+    """
+    if profile_name:
+        profile = NETWORK_PROFILES.get(profile_name)
+        if profile:
+            return profile
+        logger.warning(f"Bilinmeyen ağ profili '{profile_name}', yalın profil kullanılacak.")
+        return LEAN_PROFILE
+    host = urlparse(server_url).hostname or server_url
+    return SERVER_NETWORK_PROFILES.get(host, LEAN_PROFILE)
+
+
+def register_server_profile(server_url: str, profile: NetworkProfile):
+    """Bir sunucu için özel ağ profili kaydeder (çalışma zamanında, örn. GUI/CLI ayarlarından)."""
+    host = urlparse(server_url).hostname or server_url
+    SERVER_NETWORK_PROFILES[host] = profile
+    logger.info(f"{host} için '{profile.name}' ağ profili kaydedildi.")
+
+
+def extend_profile(profile: NetworkProfile, extra_url_patterns: Tuple[str, ...] = (), allowed_resource_types: Tuple[str, ...] = ()) -> NetworkProfile:
+    """Mevcut bir profile ek engelli URL kalıpları ekleyen veya bazı kaynak türlerine izin veren bir kopya döndürür."""
+    return replace(
+        profile,
+        name=f"{profile.name}+",
+        blocked_resource_types=frozenset(t for t in profile.blocked_resource_types if t not in allowed_resource_types),
+        blocked_url_patterns=profile.blocked_url_patterns + tuple(p.lower() for p in extra_url_patterns),
+    )
@@ -1,8 +1,10 @@
 # --- travian_bot_project/gui/app_window.py ---
 import customtkinter as ctk
 import threading
+import queue
 import logging
 import time
+from concurrent.futures import Future
 from typing import List, Dict, Optional, Any
 
 from bot.travian_client import TravianClient
@@ -25,8 +27,12 @@ class TravianBotApp(ctk.CTk):
 
         self.travian_client: Optional[TravianClient] = None
         self.bot_engine: Optional[BotEngine] = None
-        self.bot_thread: Optional[threading.Thread] = None
+        self.bot_run: Optional[Future] = None # Playwright thread'inde süren BotEngine.run
         self.account_data: Optional[PlayerAccount] = None # BotEngine'e iletilecek
+        # Playwright sync nesneleri başlatıldıkları thread'e bağlıdır: giriş, bot döngüsü ve kapatma aynı thread'de çalışır
+        self._browser_jobs: "queue.Queue[tuple]" = queue.Queue()
+        self._browser_thread = threading.Thread(target=self._browser_worker, name="playwright", daemon=True)
+        self._browser_thread.start()
 
         self._setup_ui()
         # self._load_initial_credentials() # .env'den kimlik bilgisi yükleme kaldırıldı
@@ -292,6 +298,22 @@ class TravianBotApp(ctk.CTk):
         self.farm_targets_textbox.configure(state="disabled")
 
 
+    def _browser_worker(self):
+        while True:
+            future, func, args = self._browser_jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _run_on_browser_thread(self, func, *args) -> Future:
+        """İşi Playwright thread'inin sırasına ekler; bot çalışırken sonraki işler bot durana kadar bekler."""
+        future: Future = Future()
+        self._browser_jobs.put((future, func, args))
+        return future
+
     def handle_login(self): 
         server_url = self.server_url_entry.get().strip()
         username = self.username_entry.get().strip()
@@ -305,9 +327,8 @@ class TravianBotApp(ctk.CTk):
         self.status_label.configure(text="Durum: Giriş Yapılıyor...")
         self.login_button.configure(state="disabled") # Giriş sırasında tekrar tıklanmasın
 
-        # Giriş işlemini ayrı bir thread'de çalıştırarak GUI'nin donmasını engelle
-        login_thread = threading.Thread(target=self._perform_login, args=(server_url, username, password), daemon=True)
-        login_thread.start()
+        # Giriş işlemi Playwright thread'inde çalışır; GUI donmaz
+        self._run_on_browser_thread(self._perform_login, server_url, username, password)
 
     def _perform_login(self, server_url, username, password): 
         try:
@@ -370,7 +391,7 @@ class TravianBotApp(ctk.CTk):
         if not self.account_data or not self.account_data.villages:
             self.log_to_gui("Hata: Köy verileri yüklenemedi. Bot başlatılamıyor. Lütfen tekrar giriş yapmayı deneyin.", level="warning")
             # Tekrar ilk köy verilerini çekmeyi deneyebiliriz.
-            initial_village = self.travian_client.get_initial_village_data()
+            initial_village = self._run_on_browser_thread(self.travian_client.get_initial_village_data).result()
             if initial_village:
                 if not self.account_data: self.account_data = PlayerAccount(username=self.username_entry.get()) # Eğer yoksa oluştur
                 if not self.account_data.villages: self.account_data.villages.append(initial_village)
@@ -397,8 +418,7 @@ class TravianBotApp(ctk.CTk):
             return
 
         self.bot_engine = BotEngine(self.travian_client, self.account_data, self.log_to_gui)
-        self.bot_thread = threading.Thread(target=self.bot_engine.run, daemon=True)
-        self.bot_thread.start()
+        self.bot_run = self._run_on_browser_thread(self.bot_engine.run) # Giriş yapılan thread'de
 
     def stop_bot(self): 
         if self.bot_engine and self.bot_engine.is_running:
@@ -424,16 +444,20 @@ class TravianBotApp(ctk.CTk):
         if self.bot_engine and self.bot_engine.is_running:
             self.log_to_gui("Çalışan bot motoru durduruluyor...")
             self.stop_bot() # Önce bot motorunu durdur
-            if self.bot_thread and self.bot_thread.is_alive():
+            if self.bot_run and not self.bot_run.done():
                 self.log_to_gui("Bot thread'inin sonlanması için bekleniyor (en fazla 5sn)...")
-                self.bot_thread.join(timeout=5) # 5 saniye kadar bekle
-                if self.bot_thread.is_alive():
-                     self.log_to_gui("Bot thread'i zamanında sonlanmadı.", level="warning")
+                try:
+                    self.bot_run.result(timeout=5) # 5 saniye kadar bekle
+                except Exception:
+                    self.log_to_gui("Bot thread'i zamanında sonlanmadı.", level="warning")
 
 
         if self.travian_client:
             self.log_to_gui("Playwright kaynakları kapatılıyor...")
-            self.travian_client.close() # Sonra Playwright'ı kapat [cite: 288]
+            try:
+                self._run_on_browser_thread(self.travian_client.close).result(timeout=10) # Sonra Playwright'ı kapat [cite: 288]
+            except Exception as e:
+                self.log_to_gui(f"Playwright kaynakları zamanında kapatılamadı: {e}", level="warning")
 
         self.destroy() # GUI penceresini kapat
         # logging.shutdown() # Günlükleyicileri kapatmak için (genelde gerekmez)
@@ -0,0 +1,90 @@
+# --- travian_bot_project/headless.py ---
+# Arayüzsüz (daemon) çalıştırma: tek bir hesabı yapılandırma dosyasındaki köy planlarıyla BotEngine üzerinde çalıştırır.
+# customtkinter ve gui/ hiç yüklenmez; sunucu/konteyner ortamı için.
+#   python headless.py --accounts accounts.json --account ornek_oyuncu
+import argparse
+import logging
+import signal
+import sys
+from typing import List, Optional
+
+from config.accounts_config import AccountConfig, load_account_configs, DEFAULT_ACCOUNTS_PATH
+from config.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def select_account(configs: List[AccountConfig], username: Optional[str]) -> Optional[AccountConfig]:
+    """Kullanıcı adı verilmişse o hesabı, verilmemişse listedeki tek hesabı seçer."""
+    if username:
+        return next((c for c in configs if c.username == username or c.key == username), None)
+    if len(configs) > 1:
+        logger.error(f"Dosyada {len(configs)} hesap var; --account ile birini seçin veya hepsi için supervisor.py kullanın.")
+        return None
+    return configs[0] if configs else None
+
+
+def run_headless(config: AccountConfig) -> int:
+    """Hesabın BotEngine'ini bu thread'de çalıştırır; SIGINT/SIGTERM motoru nazikçe durdurur. Çıkış kodunu döndürür."""
+    from bot.travian_client import TravianClient # Playwright yalnızca hesap seçildikten sonra yüklenir
+    from bot.bot_engine import BotEngine
+    from bot.game_state import PlayerAccount
+    from config.network_profile import get_network_profile
+
+    client = TravianClient(config.server_url, config.username, config.resolve_password(),
+                           network_profile=get_network_profile(config.server_url, config.network_profile),
+                           max_parallel_pages=config.max_parallel_pages)
+    engine = BotEngine(client, PlayerAccount(username=config.username))
+    engine.apply_account_config(config)
+
+    stop_requested = False
+
+    def handle_signal(signum, _frame):
+        nonlocal stop_requested
+        stop_requested = True
+        logger.info(f"{signal.Signals(signum).name} alındı, bot durduruluyor...")
+        engine.stop() # Döngü en geç bir saniye içinde uyanır ve istemciyi kapatır
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, handle_signal)
+
+    logger.info(f"Hesap {config.key} arayüzsüz başlatılıyor ({len(config.village_plans)} köy planı).")
+    try:
+        engine.run()
+    finally:
+        if client._is_active: # run() oturum açamadan veya istisnayla biterse
+            client.close()
+    # Motor sinyal gelmeden döndüyse (giriş hatası) süreç yöneticisi (systemd vb.) yeniden başlatabilsin diye hata kodu
+    return 0 if stop_requested else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Travian botunu arayüz olmadan tek hesap için çalıştırır.")
+    parser.add_argument("--accounts", default=DEFAULT_ACCOUNTS_PATH, help="Hesap ve köy planı JSON dosyası")
+    parser.add_argument("--account", help="Çalıştırılacak hesabın kullanıcı adı (dosyada birden çok hesap varsa)")
+    parser.add_argument("--log-file", default="bot-headless.log", help="logs/ altındaki günlük dosyası adı")
+    args = parser.parse_args()
+
+    setup_logging(args.log_file)
+    try:
+        config = select_account(load_account_configs(args.accounts), args.account)
+    except (OSError, ValueError) as e:
+        logger.critical(f"Hesap dosyası okunamadı ({args.accounts}): {e}")
+        return 2
+    if not config:
+        logger.critical("Çalıştırılacak hesap bulunamadı.")
+        return 2
+
+    try:
+        return run_headless(config)
+    except Exception:
+        logger.critical("Arayüzsüz bot kritik bir hatayla durdu!", exc_info=True)
+        return 1
+    finally:
+        logging.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+# --- travian_bot_project/supervisor.py ---
+# Çok hesaplı süreç havuzu: hesapları N işçi sürece dağıtır, çöken veya bellek sızdıran işçiyi yeniden başlatır
+# ve her işçinin durum/metriklerini yerel bir IPC kuyruğundan toplar. GUI (customtkinter) yüklenmez.
+#   python supervisor.py --accounts accounts.json --workers 4 --max-rss-mb 1500
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config.accounts_config import AccountConfig, load_account_configs, DEFAULT_ACCOUNTS_PATH
+from config.logging_config import setup_logging
+
+try:
+    import resource # Yalnızca Unix; Windows'ta işçi tepe bellek raporu atlanır
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+STATUS_FILE = os.path.join("logs", "supervisor_status.json")
+
+
+def _process_tree_rss_mb(pid: int) -> Optional[float]:
+    """İşçi sürecin ve alt süreçlerinin (Chromium dahil) toplam RSS'i (MB). /proc yoksa (Linux dışı) None."""
+    page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+    total_pages, pending, seen = 0, [pid], set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f"/proc/{current}/statm") as statm:
+                total_pages += int(statm.read().split()[1])
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except (OSError, ValueError):
+            if current == pid:
+                return None
+    return total_pages * page_size / (1024 * 1024)
+
+
+def _worker_main(shard_index: int, configs: List[AccountConfig], status_queue, stop_event, report_interval: float, max_workers: int):
+    """İşçi süreç girişi: kendi hesap dilimi için bir AccountManager çalıştırır ve durumunu düzenli olarak raporlar."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN) # Ctrl+C'yi supervisor yönetir; işçiler stop_event ile durur
+    setup_logging(f"bot-worker-{shard_index}.log")
+    from bot.account_manager import AccountManager # Ağır bağımlılıklar yalnızca işçide yüklenir
+
+    manager = AccountManager(configs, max_workers=max_workers)
+
+    async def report_loop():
+        while not stop_event.is_set():
+            status_queue.put({
+                "shard": shard_index, "pid": os.getpid(), "time": time.time(),
+                "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+                "accounts": manager.status(),
+            })
+            for _ in range(int(max(1, report_interval))):
+                if stop_event.is_set():
+                    break
+                await asyncio.sleep(1)
+        manager.stop()
+
+    async def main():
+        reporter = asyncio.create_task(report_loop())
+        try:
+            await manager.run()
+        finally:
+            # manager.run hata verse de rapor görevi döngü kapanmadan sonlanmalı
+            stop_event.set()
+            reporter.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reporter
+
+    asyncio.run(main())
+
+
+@dataclass
+class WorkerHandle:
+    shard_index: int
+    configs: List[AccountConfig]
+    process: Optional[mp.Process] = None
+    stop_event: Any = None
+    started_at: float = 0.0
+    last_report_at: float = 0.0
+    restarts: int = 0 # Art arda hızlı yeniden başlatmalar; kararlı çalışmadan sonra sıfırlanır
+    next_start_at: float = 0.0 # Art arda çökmelerde yeniden başlatma geri çekilmesi
+    last_status: Dict[str, Any] = field(default_factory=dict)
+
+
+class Supervisor:
+    """
+    Hesapları `workers` sürece böler (hesap anahtarına göre sıralı, sabit dağılım) ve süreçleri izler:
+    çıkan süreç yeniden başlatılır, RSS sınırını aşan veya raporu kesilen süreç önce nazikçe durdurulup
+    sonra yeniden başlatılır. İşçi raporları bir multiprocessing kuyruğundan alınır ve STATUS_FILE'a yazılır.
+    """
+    def __init__(self, configs: List[AccountConfig], workers: int = 2, max_rss_mb: float = 1500.0, heartbeat_timeout: float = 180.0,
+                 report_interval: float = 30.0, accounts_per_worker_slots: int = 4):
+        self.ctx = mp.get_context("spawn") # Playwright/asyncio durumunu fork ile kopyalamamak için
+        self.status_queue = self.ctx.Queue()
+        self.max_rss_mb = max_rss_mb
+        self.heartbeat_timeout = heartbeat_timeout
+        self.report_interval = report_interval
+        self.stable_uptime = 600.0 # Bu süreden uzun çalışan işçinin önceki çökmeleri geri çekilmeye sayılmaz
+        self.worker_slots = accounts_per_worker_slots # İşçi başına ortak sayfa işlemi yeri (AccountManager.max_workers)
+        self.is_running = False
+        shards: List[List[AccountConfig]] = [[] for _ in range(max(1, min(workers, len(configs))))]
+        for index, config in enumerate(sorted(configs, key=lambda c: c.key)):
+            shards[index % len(shards)].append(config)
+        self.workers = [WorkerHandle(shard_index=i, configs=shard) for i, shard in enumerate(shards) if shard]
+
+    def _start_worker(self, worker: WorkerHandle):
+        worker.stop_event = self.ctx.Event()
+        worker.process = self.ctx.Process(
+            target=_worker_main, name=f"travian-worker-{worker.shard_index}", daemon=False,
+            args=(worker.shard_index, worker.configs, self.status_queue, worker.stop_event, self.report_interval, self.worker_slots),
+        )
+        worker.process.start()
+        worker.started_at = worker.last_report_at = time.time()
+        logger.info(f"İşçi {worker.shard_index} başlatıldı (pid {worker.process.pid}, {len(worker.configs)} hesap).")
+
+    def _stop_worker(self, worker: WorkerHandle, timeout: float = 30.0):
+        if not worker.process:
+            return
+        worker.stop_event.set()
+        worker.process.join(timeout)
+        if worker.process.is_alive():
+            logger.warning(f"İşçi {worker.shard_index} zamanında durmadı, sonlandırılıyor.")
+            worker.process.terminate()
+            worker.process.join(5)
+            if worker.process.is_alive():
+                worker.process.kill()
+        worker.process = None
+
+    def _restart_worker(self, worker: WorkerHandle, reason: str):
+        logger.warning(f"İşçi {worker.shard_index} yeniden başlatılacak: {reason}")
+        self._stop_worker(worker)
+        # Hızlı art arda çökmelerde bekleme 10 sn'den 5 dk'ya kadar katlanır; uzun süre sağlıklı çalışan işçi sıfırlanır
+        stable = time.time() - worker.started_at > self.stable_uptime
+        worker.restarts = 1 if stable else worker.restarts + 1
+        backoff = 0 if stable else min(300, 10 * 2 ** min(worker.restarts, 5))
+        worker.next_start_at = time.time() + backoff
+
+    def _drain_reports(self):
+        while True:
+            try:
+                report = self.status_queue.get_nowait()
+            except queue.Empty:
+                return
+            worker = next((w for w in self.workers if w.shard_index == report.get("shard")), None)
+            if worker and worker.process and worker.process.pid == report.get("pid"):
+                worker.last_report_at = time.time()
+                worker.last_status = report
+
+    def _check_workers(self):
+        now = time.time()
+        for worker in self.workers:
+            if worker.process is None:
+                if now >= worker.next_start_at:
+                    self._start_worker(worker)
+                continue
+            if not worker.process.is_alive():
+                self._restart_worker(worker, f"süreç çıktı (kod {worker.process.exitcode})")
+                continue
+            rss_mb = _process_tree_rss_mb(worker.process.pid)
+            worker.last_status["rss_mb"] = rss_mb
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                self._restart_worker(worker, f"bellek sınırı aşıldı ({rss_mb:.0f} MB > {self.max_rss_mb:.0f} MB)")
+            elif now - worker.last_report_at > self.heartbeat_timeout:
+                self._restart_worker(worker, f"{int(now - worker.last_report_at)} sn'dir rapor yok")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Tüm işçilerin son durumunu tek bir sözlükte toplar (STATUS_FILE içeriği)."""
+        return {
+            "time": time.time(),
+            "workers": [{
+                "shard": w.shard_index,
+                "pid": w.process.pid if w.process else None,
+                "alive": bool(w.process and w.process.is_alive()),
+                "restarts": w.restarts,
+                "uptime": int(time.time() - w.started_at) if w.process else 0,
+                "rss_mb": w.last_status.get("rss_mb"),
+                "accounts": w.last_status.get("accounts", [{"account": c.key} for c in w.configs]),
+            } for w in self.workers],
+        }
+
+    def _write_status(self):
+        try:
+            os.makedirs(os.path.dirname(STATUS_FILE), exist_ok=True)
+            with open(STATUS_FILE + ".tmp", "w", encoding="utf-8") as status_file:
+                json.dump(self.snapshot(), status_file, ensure_ascii=False, indent=2)
+            os.replace(STATUS_FILE + ".tmp", STATUS_FILE)
+        except OSError as e:
+            logger.warning(f"Durum dosyası yazılamadı: {e}")
+
+    def run(self, poll_interval: float = 5.0):
+        self.is_running = True
+        logger.info(f"Supervisor: {sum(len(w.configs) for w in self.workers)} hesap {len(self.workers)} işçiye dağıtılıyor.")
+        try:
+            while self.is_running:
+                self._drain_reports()
+                self._check_workers()
+                self._write_status()
+                time.sleep(poll_interval)
+        finally:
+            for worker in self.workers:
+                self._stop_worker(worker)
+            self._drain_reports()
+            self._write_status()
+            logger.info("Supervisor durduruldu.")
+
+    def stop(self, *_):
+        self.is_running = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Travian bot hesaplarını birden çok işçi sürece dağıtır.")
+    parser.add_argument("--accounts", default=DEFAULT_ACCOUNTS_PATH, help="Hesap listesi JSON dosyası")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="İşçi süreç sayısı")
+    parser.add_argument("--max-rss-mb", type=float, default=1500.0, help="İşçi (Chromium dahil) bellek sınırı")
+    parser.add_argument("--heartbeat-timeout", type=float, default=180.0, help="Bu kadar saniye rapor gelmezse işçi yeniden başlatılır")
+    args = parser.parse_args()
+
+    setup_logging("supervisor.log")
+    supervisor = Supervisor(load_account_configs(args.accounts), workers=args.workers, max_rss_mb=args.max_rss_mb,
+                            heartbeat_timeout=args.heartbeat_timeout)
+    signal.signal(signal.SIGINT, supervisor.stop)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    supervisor.run()
+    logging.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# --- travian_bot_project/tests/__init__.py ---
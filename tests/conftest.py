@@ -0,0 +1,28 @@
+# --- travian_bot_project/tests/conftest.py ---
+import os
+
+import pytest
+
+TESTS_DIR = os.path.dirname(__file__)
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+HTML_SOURCE_DIR = os.path.join(TESTS_DIR, "..", "HTML kaynak") # Oyundan kaydedilmiş gerçek sayfalar
+
+
+def _reader(directory: str):
+    def read(file_name: str) -> str:
+        with open(os.path.join(directory, file_name), encoding="utf-8") as f:
+            return f.read()
+    return read
+
+
+@pytest.fixture
+def html_source():
+    """Kayıtlı "HTML kaynak" sayfasını okur: html_source("Europe 50.html")."""
+    return _reader(HTML_SOURCE_DIR)
+
+
+
+@pytest.fixture
+def fixture_html():
+    """tests/fixtures altındaki küçük el yapımı sayfaları okur."""
+    return _reader(FIXTURES_DIR)
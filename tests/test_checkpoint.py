@@ -0,0 +1,21 @@
+# --- travian_bot_project/tests/test_checkpoint.py ---
+import os
+
+from bot.checkpoint import account_to_dict, account_from_dict, save_checkpoint, load_checkpoint
+from bot.game_state import PlayerAccount, Village, Building, Troop
+
+
+def test_checkpoint_round_trip(tmp_path):
+    account = PlayerAccount(username="ornek", villages=[Village(name="Köy 1", id="34808", buildings=[Building("Oduncu", 3, "1", "1")],
+                                                                troops_home=[Troop("Lejyoner", 12)])])
+    checkpoint_path = os.path.join(tmp_path, "sub", "ornek.json")
+    save_checkpoint(checkpoint_path, {"account": account_to_dict(account)})
+    assert account_from_dict(load_checkpoint(checkpoint_path)["account"]) == account
+    assert os.listdir(os.path.dirname(checkpoint_path)) == ["ornek.json"] # Geçici dosya kalmaz
+
+
+def test_broken_checkpoint_is_ignored(tmp_path):
+    checkpoint_path = os.path.join(tmp_path, "ornek.json")
+    with open(checkpoint_path, "w") as broken:
+        broken.write("{")
+    assert load_checkpoint(checkpoint_path) is None
@@ -0,0 +1,43 @@
+# --- travian_bot_project/tests/test_farm_lists.py ---
+import pytest
+
+from bot.farm_lists import parse_farm_lists_response, plan_farm_list_sync, slot_index, troops_to_units, parse_send_response
+
+FARM_LISTS_RESPONSE = {"data": {"ownPlayer": {"farmLists": [
+    {"id": 7, "name": "Benim listem", "ownerVillage": {"id": 1}, "slots": [{"id": 70, "target": {"x": 1, "y": 1}, "troop": {"t1": 5}}]},
+    {"id": 8, "name": "Bot", "ownerVillage": {"id": 1}, "slots": [
+        {"id": 80, "target": {"x": 1, "y": 2}, "troop": {"t1": 5, "t2": 0}, "isActive": True},
+        {"id": 81, "target": {"x": 3, "y": 4}, "troop": {"t1": 5}, "isActive": True},
+        {"id": 82, "target": {"x": 9, "y": 9}, "troop": {"t1": 5}, "isActive": True}]},
+]}}}
+
+
+@pytest.fixture
+def lists():
+    return parse_farm_lists_response(FARM_LISTS_RESPONSE)
+
+
+def test_only_bot_lists_are_managed(lists):
+    assert [farm_list.is_bot_list for farm_list in lists] == [False, True]
+
+
+def test_plan_farm_list_sync(lists):
+    desired = {"1": {(1, 2): {"t1": 5}, (3, 4): {"t1": 8}, (5, 6): {"t1": 2}}, "2": {(x, 0): {"t1": 1} for x in range(150)}}
+    plan = plan_farm_list_sync(desired, lists)
+    assert plan.delete == [82] and [u["id"] for u in plan.update] == [81]
+    assert plan.add == {8: [{"listId": 8, "x": 5, "y": 6, "units": {"t1": 2}, "active": True}]}
+    assert plan.lists_to_create == [("2", "Bot"), ("2", "Bot 2")] # 150 hedef tek listeye sığmaz
+
+
+def test_slot_index_skips_user_lists(lists):
+    index = slot_index(lists)
+    assert index[("1", 1, 2)].id == 80 and ("1", 1, 1) not in index
+
+
+def test_troops_to_units_drops_unknown_names():
+    assert troops_to_units({"Lejyoner": 3, "Bilinmeyen": 4}, {"Lejyoner": "t1"}.get) == {"t1": 3}
+
+
+def test_parse_send_response():
+    response = {"lists": [{"id": 8, "targets": [{"id": 81, "error": "noTroops"}]}]}
+    assert parse_send_response(response, {8: [80, 81]}) == {80: True, 81: False}
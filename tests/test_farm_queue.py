@@ -0,0 +1,28 @@
+# --- travian_bot_project/tests/test_farm_queue.py ---
+from bot.farm_queue import FarmTargetQueue
+
+
+def make_targets():
+    return [{"target_coords": {"x": i, "y": 0}, "last_raid_time": t} for i, t in enumerate([0, 500, 0, 100])]
+
+
+def test_pop_due_and_stale_keys():
+    targets = make_targets()
+    queue = FarmTargetQueue()
+    queue.rebuild(targets, lambda target: target["last_raid_time"] + 1000)
+    assert queue.next_time() == 1000 and len(queue) == 4
+    first = queue.pop_due(now=1000)
+    assert sorted(t["target_coords"]["x"] for t in first) == [0, 2] and targets[0] not in queue
+    queue.push(targets[3], 5000) # Eski (1100) kaydı geçersiz
+    assert queue.pop_due(now=1200) == [] and queue.next_time() == 1500
+    assert [t["target_coords"]["x"] for t in queue.pop_due(now=10 ** 6, limit=1)] == [1] and len(queue) == 1
+
+
+def test_equal_times_pop_in_random_order():
+    targets = make_targets()
+    queue = FarmTargetQueue()
+    orders = set()
+    for _ in range(50):
+        queue.rebuild([targets[0], targets[2]], lambda target: 0)
+        orders.add(tuple(t["target_coords"]["x"] for t in queue.pop_due(now=0)))
+    assert orders == {(0, 2), (2, 0)}
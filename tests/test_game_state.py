@@ -0,0 +1,13 @@
+# --- travian_bot_project/tests/test_game_state.py ---
+from bot.game_state import Village, Building, Troop
+
+
+def test_lookup_sees_in_place_replacement_with_new_key():
+    village = Village(name="Köy", id="1", buildings=[Building("Oduncu", 1, "1", "1"), Building("Tuğla Ocağı", 1, "2", "2")],
+                      troops_home=[Troop("Lejyoner", 5)])
+    assert village.get_building_by_location_id("1").name == "Oduncu" and village.troop_count("Lejyoner") == 5
+    village.buildings[0] = Building("Ana Bina", 1, "15", "26") # Aynı liste, aynı boy, yeni anahtar
+    village.troops_home[0] = Troop("Praetorian", 3)
+    assert village.get_building_by_location_id("26").name == "Ana Bina"
+    assert village.get_building_by_location_id("1") is None
+    assert village.troop_count("Praetorian") == 3 and village.troop_count("Lejyoner") == 0
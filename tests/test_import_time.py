@@ -0,0 +1,51 @@
+# --- travian_bot_project/tests/test_import_time.py ---
+# Soğuk başlangıç bütçesi: giriş modüllerinin `python -X importtime` ile ölçülen içe aktarma süresi eşiği aşmamalı
+# ve ağır/isteğe bağlı bir bağımlılık erken yüklenmemeli (supervisor işçileri sık yeniden başlatır).
+# Yavaş makinelerde bütçe çarpanı: IMPORT_TIME_SCALE=1.5 python -m pytest tests/test_import_time.py
+import os
+import subprocess
+import sys
+from typing import Dict, Optional, Tuple
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_SCALE = float(os.environ.get("IMPORT_TIME_SCALE", "1.0"))
+REPEAT = 3 # Her modül için ölçüm sayısı (en iyisi alınır)
+
+# Playwright hata sınıfı (playwright._impl._errors) hafiftir; sürücü API'leri tarayıcı açılırken yüklenir
+PLAYWRIGHT_APIS = ("playwright.sync_api", "playwright.async_api", "greenlet")
+
+# (modül, en fazla ms, yüklenmemesi gereken modül önekleri)
+IMPORT_BUDGETS = [
+    ("headless", 100, ("customtkinter", "gui", "playwright", "google.generativeai", "requests")),
+    ("supervisor", 120, ("customtkinter", "gui", "playwright", "google.generativeai")),
+    ("bot.bot_engine", 250, ("customtkinter", "gui", "google.generativeai", "requests") + PLAYWRIGHT_APIS),
+    ("bot.account_manager", 450, ("customtkinter", "gui", "google.generativeai", "requests")),
+]
+
+
+def measure_import(module: str) -> Tuple[Optional[float], Dict[str, float]]:
+    """Modülü yeni bir yorumlayıcıda içe aktarır; (toplam ms, {yüklenen modül: kümülatif ms}) döndürür."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"{module} içe aktarılamadı"
+    loaded: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit():
+            loaded[name.strip()] = int(cumulative) / 1000
+    return loaded.get(module), loaded
+
+
+@pytest.mark.parametrize("module, budget_ms, forbidden", IMPORT_BUDGETS, ids=[budget[0] for budget in IMPORT_BUDGETS])
+def test_import_budget(module, budget_ms, forbidden):
+    best_ms, loaded = None, {}
+    for _ in range(REPEAT):
+        elapsed_ms, loaded = measure_import(module)
+        best_ms = elapsed_ms if best_ms is None else min(best_ms, elapsed_ms)
+    early = sorted(name for name in loaded if any(name == f or name.startswith(f + ".") for f in forbidden))
+    assert not early, f"{module} erken yüklüyor: {', '.join(early[:5])}"
+    assert best_ms <= budget_ms * BUDGET_SCALE, f"{module}: {best_ms:.1f} ms / {budget_ms * BUDGET_SCALE:.0f} ms"
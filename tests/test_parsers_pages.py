@@ -0,0 +1,42 @@
+# --- travian_bot_project/tests/test_parsers_pages.py ---
+# Kayıtlı "HTML kaynak" sayfalarına karşı altın değer kontrolleri
+import pytest
+
+from bot.game_state import Building, Troop, HeroStatus
+from bot.parsers.pages import parse_village, parse_resources_payload, parse_hero, parse_map_position, parse_village_list
+from bot.parsers.payload import extract_dorf1_payload
+
+
+def test_parse_village(html_source):
+    village = parse_village(html_source("Europe 50.html"), html_source("köy merkez.html"))
+    assert village is not None and village.id == "34808" and village.name == "evillord Köyü"
+    assert village.coordinates == {"x": 111, "y": 23}
+    assert village.resources == {"wood": 142, "clay": 65, "iron": 102, "crop": 84}
+    assert village.storage_capacity == {"warehouse": 800, "granary": 800}
+    assert village.production_rates == {"wood": 590, "clay": 620, "iron": 500, "crop": 482}
+    assert (village.crop_consumption, village.population) == (121, 38)
+    assert len([b for b in village.buildings if int(b.location_id) <= 18]) == 18
+    assert village.get_building_by_location_id("1") == Building(name="Oduncu", level=2, gid="1", location_id="1")
+    assert village.get_building_by_location_id("26") == Building(name="Merkez Binası", level=1, gid="15", location_id="26")
+    assert village.get_building_by_location_id("39") == Building(name="Askeri Üs", level=1, gid="16", location_id="39")
+    assert village.building_queue == [Building(name="Oduncu", level=2, build_time_remaining=51)]
+    assert village.troops_home == [Troop(type_name="Kahraman", count=1)]
+
+
+def test_resources_script_matches_html_fallback(html_source):
+    # JS 'resources' nesnesi ile HTML yedeği aynı sonucu vermeli
+    dorf1_payload = extract_dorf1_payload(html_source("Europe 50.html"))
+    from_script = parse_resources_payload(dorf1_payload, "34808")
+    from_html = parse_resources_payload(dict(dorf1_payload, resources_script=None), "34808")
+    assert {key: from_script[key] for key in from_html} == from_html
+
+
+@pytest.mark.parametrize("hero_page", ["kaharaman 50.html", "kahraman özlellik.html"])
+def test_parse_hero(html_source, hero_page):
+    assert parse_hero(html_source(hero_page)) == HeroStatus(health=51, experience=59, status="Evde", adventure_available=True)
+
+
+def test_parse_map_and_village_list(html_source):
+    map_html = html_source("harita.html")
+    assert parse_map_position(map_html) == {"x": 111, "y": 23}
+    assert parse_village_list(map_html) == [{"id": "34808", "name": "evillord Köyü", "coordinates": {"x": 111, "y": 23}, "active": True}]
@@ -0,0 +1,36 @@
+# --- travian_bot_project/tests/test_raid_dispatcher.py ---
+import time
+
+from bot.game_state import Village
+from bot.raid_dispatcher import RaidDispatcher
+
+TARGETS = [{"target_coords": {"x": i, "y": 0}, "troops": {"Lejyoner": 5}} for i in range(3)]
+
+
+def make_dispatcher() -> RaidDispatcher:
+    dispatcher = RaidDispatcher(min_interval=10, jitter=0, max_backlog=2, max_wait=60)
+    village = Village(name="Köy", id="1")
+    assert [dispatcher.enqueue(t, village, t["troops"]) for t in TARGETS] == [True, True, False] # Kuyruk sınırı
+    return dispatcher
+
+
+def test_enqueue_rejects_duplicates_and_overflow():
+    dispatcher = make_dispatcher()
+    assert not dispatcher.enqueue(TARGETS[0], Village(name="Köy", id="1"), {})
+    assert dispatcher.is_queued(TARGETS[1]) and dispatcher.rejected == 1
+
+
+def test_pacing_expiry_and_stats():
+    dispatcher = make_dispatcher()
+    now = time.time()
+    first = dispatcher.pop_due(now)
+    assert first.key == (0, 0) and dispatcher.pop_due(now + 5) is None and dispatcher.next_send_time() == now + 10
+    dispatcher.record(True, now)
+    assert dispatcher.pop_due(now + 61) is None and dispatcher.expired == 1 and len(dispatcher) == 0
+    assert dispatcher.stats(now + 100)["sent_last_hour"] == 1 and dispatcher.stats(now + 3700)["sent_last_hour"] == 0
+
+
+def test_configure_interval_keeps_minimum():
+    dispatcher = RaidDispatcher(min_interval=10, jitter=0)
+    dispatcher.configure(interval=20)
+    assert (dispatcher.min_interval, dispatcher.min_interval + dispatcher.jitter) == (10, 30)
@@ -0,0 +1,21 @@
+# --- travian_bot_project/tests/test_rally_point.py ---
+from bot.parsers.rally_point import extract_rally_send_form, fill_raid_form, extract_rally_confirm_form, parse_raid_result
+
+
+def test_send_form_is_filled_for_raid(fixture_html):
+    send_html = fixture_html("rally_send.html")
+    form = extract_rally_send_form(send_html)
+    assert form and form.tribe == "gauls" and form.fields["timestamp_checksum"] == "abc"
+    filled = fill_raid_form(form, {"x": -12, "y": 7}, {"t1": 25})
+    assert filled["troop[t1]"] == "25" and filled["troop[t2]"] == "" and filled["x"] == "-12" and filled["eventType"] == "4"
+    assert filled["ok"] == "ok" and extract_rally_confirm_form(send_html) is None
+
+
+def test_confirm_page_error(fixture_html):
+    confirm_html = fixture_html("rally_confirm_error.html")
+    assert extract_rally_confirm_form(confirm_html).fields == {"a": "k9", "t1": "25"}
+    assert parse_raid_result(confirm_html, "https://x/build.php?gid=16&tt=2") == (False, "Yeterli asker yok.")
+
+
+def test_overview_after_send_is_success():
+    assert parse_raid_result("<div id='build'>genel bakış</div>", "https://x/build.php?gid=16&tt=1") == (True, None)
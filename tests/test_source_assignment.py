@@ -0,0 +1,59 @@
+# --- travian_bot_project/tests/test_source_assignment.py ---
+import itertools
+import random
+
+import pytest
+
+from bot.source_assignment import assign_sources, SourceAssigner
+
+
+def test_assign_sources_small_cases():
+    # İki köy, üç hedef: yakın köyün kapasitesi iki hedefe yeter; en az ek süreyle diğer köye giden üçüncü hedeftir (4.5 - 3)
+    costs = [[1.0, 2.0, 3.0], [4.0, 4.0, 4.5]]
+    assert assign_sources([2, 5], [1, 1, 1], costs) == [0, 0, 1]
+    assert assign_sources([10, 10], [1, 1, 1], costs) == [0, 0, 0]
+    assert assign_sources([1, 0], [1, 1, 1], [[1.0, 2.0, None], [3.0, None, None]]) == [0, None, None] # Yer yoksa atanmaz
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_assign_sources_matches_brute_force(seed):
+    # Talepler 1 olduğunda akış bölünmez; tam atama varsa sonuç geçerli ve en ucuz olmalı
+    rng = random.Random(seed)
+    m, n = rng.randint(1, 3), rng.randint(1, 6)
+    supply = [rng.randint(0, 4) for _ in range(m)]
+    costs = [[rng.choice([None, *range(1, 10)]) for _ in range(n)] for _ in range(m)]
+    result = assign_sources(supply, [1] * n, costs)
+    exact = [a for a in itertools.product(range(m), repeat=n)
+             if all(costs[i][j] is not None for j, i in enumerate(a)) and all(a.count(v) <= supply[v] for v in range(m))]
+    assert all(result.count(v) <= supply[v] for v in range(m))
+    if exact:
+        assert None not in result
+        best = min(sum(costs[i][j] for j, i in enumerate(a)) for a in exact)
+        assert sum(costs[i][j] for j, i in enumerate(result)) == best
+
+
+def test_unit_types_are_solved_separately():
+    # Bol falanks 5'ten fazla Toytatın Şimşeği paketini karşılamaz
+    stock = [{"falanks": 1000, "toytatin simsegi": 5}, {"toytatin simsegi": 50}]
+    packages = [{"toytatin simsegi": 5}] * 10 + [{"falanks": 20}] * 3
+    distance = lambda i, j: 1.0 if i == 0 else 10.0
+    assigner = SourceAssigner()
+    result = assigner.assign(stock, packages, distance)
+    assert result[:10].count(0) == 1 and result[:10].count(1) == 9 and result[10:] == [0, 0, 0]
+    assert assigner.assign(stock, packages, distance) == result and assigner.solved_groups == 2 # Değişiklik yok, yeniden çözülmez
+    stock[0]["falanks"] = 40 # Yalnızca falanks grubu yeniden çözülür; üçüncü paket sığmaz
+    assert assigner.assign(stock, packages, distance)[10:].count(None) == 1 and assigner.solved_groups == 3
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_mixed_packages_respect_stock(seed):
+    rng = random.Random(seed)
+    m, n = rng.randint(1, 3), rng.randint(1, 8)
+    stock = [{key: rng.randint(0, 6) for key in "abc"} for _ in range(m)]
+    packages = [{key: rng.randint(1, 3) for key in rng.sample("abc", rng.randint(1, 2))} for _ in range(n)]
+    costs = [[rng.choice([None, *range(1, 10)]) for _ in range(n)] for _ in range(m)]
+    result = SourceAssigner().assign(stock, packages, lambda i, j: costs[i][j])
+    for v in range(m):
+        for key in "abc":
+            assert sum(packages[j].get(key, 0) for j, i in enumerate(result) if i == v) <= stock[v][key]
+    assert all(i is None or costs[i][j] is not None for j, i in enumerate(result))
@@ -0,0 +1,16 @@
+# --- travian_bot_project/tests/test_supervisor.py ---
+import time
+
+from supervisor import Supervisor, WorkerHandle
+
+
+def test_restart_backoff_resets_after_stable_uptime(monkeypatch):
+    supervisor = Supervisor([])
+    monkeypatch.setattr(supervisor, "_stop_worker", lambda worker: None)
+    worker = WorkerHandle(shard_index=0, configs=[])
+    backoffs = []
+    for uptime in (5, 5, 5, supervisor.stable_uptime + 1, 5):
+        worker.started_at = time.time() - uptime
+        supervisor._restart_worker(worker, "test")
+        backoffs.append((worker.restarts, round(worker.next_start_at - time.time())))
+    assert backoffs == [(1, 20), (2, 40), (3, 80), (1, 0), (2, 40)]
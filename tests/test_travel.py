@@ -0,0 +1,23 @@
+# --- travian_bot_project/tests/test_travel.py ---
+from bot.game_state import Village, Building
+from bot.travel import TravelModifiers, map_distance, army_speed, travel_seconds, raid_round_trip_seconds
+
+
+def test_map_distance_wraps_around():
+    assert map_distance({"x": 199, "y": 0}, {"x": -200, "y": 0}) == 2 and map_distance({"x": 0, "y": 0}, {"x": 3, "y": 4}) == 5
+
+
+def test_army_moves_at_slowest_unit():
+    assert army_speed({"Lejyoner": 10, "Equites Imperatoris": 5}) == 6 and army_speed({"Bilinmeyen": 1}) is None
+
+
+def test_travel_seconds():
+    assert travel_seconds(12, 6, TravelModifiers()) == 7200 and travel_seconds(12, 6, TravelModifiers(server_speed=2)) == 3600
+    boosted = travel_seconds(30, 10, TravelModifiers(tournament_square_level=5)) # 20 alan 10/sa, kalan 10 alan 20/sa
+    assert round(boosted) == 2 * 3600 + 1800
+
+
+def test_raid_round_trip_seconds():
+    village = Village(name="Köy", id="1", coordinates={"x": 0, "y": 0}, buildings=[Building("Turnuva Alanı", 5, gid="14")])
+    assert round(raid_round_trip_seconds(village, {"x": 0, "y": 30}, {"Equites Caesaris": 1})) == 2 * (2 * 3600 + 1800)
+    assert raid_round_trip_seconds(Village(name="Köy", id="2"), {"x": 0, "y": 30}, {"Lejyoner": 1}) is None # Konum bilinmiyor
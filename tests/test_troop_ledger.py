@@ -0,0 +1,23 @@
+# --- travian_bot_project/tests/test_troop_ledger.py ---
+from bot.game_state import Village, Troop
+from bot.troop_ledger import TroopLedger
+
+
+def test_reservations_follow_scrapes_and_returns():
+    village = Village(name="Köy", id="1", troops_home=[Troop("Lejyoner", 20)])
+    ledger = TroopLedger()
+    ledger.reconcile("1", 100.0)
+    queued = ledger.reserve("1", {"Lejyoner": 5})
+    assert ledger.available(village, "lejyoner", now=110) == 15
+    sent = ledger.reserve("1", {"Lejyoner": 10})
+    ledger.confirm(sent, sent_at=120, return_at=200)
+    ledger.release(queued)
+    assert ledger.available(village, "Lejyoner", now=150) == 10 and ledger.available(village, "Lejyoner", now=200) == 20
+
+    village.troops_home = [Troop("Lejyoner", 10)] # Okuma: 10 asker yolda
+    ledger.reconcile("1", 130.0)
+    assert ledger.owned(village) == {"lejyoner": 20}
+    assert ledger.available(village, "Lejyoner", now=150) == 10 and ledger.available(village, "Lejyoner", now=210) == 20
+
+    ledger.reconcile("1", 250.0) # Dönüşten sonra okundu; ayırma silinir
+    assert len(ledger) == 0 and ledger.available(village, "Lejyoner", now=260) == 10
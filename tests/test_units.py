@@ -0,0 +1,20 @@
+# --- travian_bot_project/tests/test_units.py ---
+from bot.units import tribe_from_unit_class, unit_field, troop_input_fields, unit_speed, unit_carry
+
+
+def test_tribe_from_unit_class():
+    assert tribe_from_unit_class("unit u21") == "gauls" and tribe_from_unit_class("unit u1") == "romans"
+    assert tribe_from_unit_class("unit u61") == "huns" and tribe_from_unit_class("unit") is None
+
+
+def test_unit_field():
+    assert unit_field("Lejyoner") == "t1" and unit_field("falanks") == "t1" and unit_field("Baltacı") == "t3"
+    assert unit_field("Casus") is None and unit_field("Casus", "gauls") == "t3" and unit_field("Casus", "teutons") == "t4"
+    assert unit_field("Birim u23") == "t3"
+    assert troop_input_fields("romans")["Equites Caesaris"] == "t6"
+
+
+def test_unit_speed_and_carry():
+    assert unit_speed("Equites Legati") == 16 and unit_speed("Casus") == 9 and unit_speed("Casus", "gauls") == 17
+    assert unit_speed("Birim u24") == 19 and unit_speed("Bilinmeyen") is None
+    assert unit_carry("Lejyoner") == 50 and unit_carry("Casus", "teutons") == 0 and unit_carry("Bilinmeyen") == 0